@@ -0,0 +1,316 @@
+"""Compiled analysis plan for the Aquarium AI integration."""
+import hashlib
+import logging
+
+from homeassistant.config_entries import ConfigEntry
+
+from .const import (
+    CONF_TANK_NAME,
+    CONF_AQUARIUM_TYPE,
+    CONF_TEMPERATURE_SENSOR,
+    CONF_PH_SENSOR,
+    CONF_SALINITY_SENSOR,
+    CONF_DISSOLVED_OXYGEN_SENSOR,
+    CONF_WATER_LEVEL_SENSOR,
+    CONF_ORP_SENSOR,
+    CONF_CAMERA,
+    CONF_NOTIFICATION_FORMAT,
+    CONF_TANK_VOLUME,
+    CONF_FILTRATION,
+    CONF_WATER_CHANGE_FREQUENCY,
+    CONF_INHABITANTS,
+    CONF_MISC_INFO,
+    CONF_ANALYZE_TEMPERATURE,
+    CONF_ANALYZE_PH,
+    CONF_ANALYZE_SALINITY,
+    CONF_ANALYZE_DISSOLVED_OXYGEN,
+    CONF_ANALYZE_WATER_LEVEL,
+    CONF_ANALYZE_ORP,
+    CONF_ANALYZE_CAMERA,
+    CONF_ANALYZE_WATER_CHANGE,
+    CONF_ANALYZE_OVERALL,
+    CONF_PROMPT_MAIN_INSTRUCTIONS,
+    CONF_PROMPT_PARAMETER_GUIDELINES,
+    CONF_PROMPT_CAMERA_INSTRUCTIONS,
+    CONF_PROMPT_BRIEF_ANALYSIS,
+    CONF_PROMPT_DETAILED_ANALYSIS,
+    CONF_PROMPT_WATER_CHANGE,
+    CONF_PROMPT_OVERALL_ANALYSIS,
+    DEFAULT_ANALYZE_TEMPERATURE,
+    DEFAULT_ANALYZE_PH,
+    DEFAULT_ANALYZE_SALINITY,
+    DEFAULT_ANALYZE_DISSOLVED_OXYGEN,
+    DEFAULT_ANALYZE_WATER_LEVEL,
+    DEFAULT_ANALYZE_ORP,
+    DEFAULT_ANALYZE_CAMERA,
+    DEFAULT_ANALYZE_WATER_CHANGE,
+    DEFAULT_ANALYZE_OVERALL,
+    DEFAULT_NOTIFICATION_FORMAT,
+    DEFAULT_PROMPT_MAIN_INSTRUCTIONS,
+    DEFAULT_PROMPT_PARAMETER_GUIDELINES,
+    DEFAULT_PROMPT_CAMERA_INSTRUCTIONS,
+    DEFAULT_PROMPT_BRIEF_ANALYSIS,
+    DEFAULT_PROMPT_DETAILED_ANALYSIS,
+    DEFAULT_PROMPT_WATER_CHANGE,
+    DEFAULT_PROMPT_OVERALL_ANALYSIS,
+    PARAMETER_GUIDELINES_RANGES_HEADER,
+    PARAMETER_GUIDELINES_RANGES,
+    PARAMETER_GUIDELINES_UNITS_HEADER,
+    PARAMETER_GUIDELINES_UNITS,
+    NOTIFICATION_FORMAT_DETAILS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Analyzed parameters in prompt order: (sensor config key, parameter name, analyze config key, default analyze value)
+ANALYSIS_PARAMETERS = (
+    (CONF_TEMPERATURE_SENSOR, "Temperature", CONF_ANALYZE_TEMPERATURE, DEFAULT_ANALYZE_TEMPERATURE),
+    (CONF_PH_SENSOR, "pH", CONF_ANALYZE_PH, DEFAULT_ANALYZE_PH),
+    (CONF_SALINITY_SENSOR, "Salinity", CONF_ANALYZE_SALINITY, DEFAULT_ANALYZE_SALINITY),
+    (CONF_DISSOLVED_OXYGEN_SENSOR, "Dissolved Oxygen", CONF_ANALYZE_DISSOLVED_OXYGEN, DEFAULT_ANALYZE_DISSOLVED_OXYGEN),
+    (CONF_WATER_LEVEL_SENSOR, "Water Level", CONF_ANALYZE_WATER_LEVEL, DEFAULT_ANALYZE_WATER_LEVEL),
+    (CONF_ORP_SENSOR, "ORP", CONF_ANALYZE_ORP, DEFAULT_ANALYZE_ORP),
+)
+
+# Structure field descriptions, {parameter} is the lowercase parameter name
+BRIEF_PARAMETER_DESCRIPTION = "Brief 1-2 sentence analysis of the aquarium's {parameter} conditions (under 200 characters)."
+DETAILED_PARAMETER_DESCRIPTION = "Detailed analysis of the aquarium's {parameter} conditions. Provide comprehensive explanation including current status, potential issues, trends, and detailed recommendations if needed."
+BRIEF_OVERALL_DESCRIPTION = "Brief 1-2 sentence overall aquarium health assessment (under 200 characters)."
+DETAILED_OVERALL_DESCRIPTION = "Comprehensive overall aquarium health assessment. Provide detailed summary of all parameters, their relationships, overall tank health, and any recommendations for improvement."
+BRIEF_WATER_CHANGE_DESCRIPTION = "Simple yes or no answer on whether a water change is recommended based on current parameters, bioload, and water change schedule. Answer with 'Yes' or 'No' followed by a brief reason (under 150 characters total)."
+DETAILED_WATER_CHANGE_DESCRIPTION = "Concise water change recommendation. If recommended, state the percentage and timing (e.g., '30% within 2-3 days' or '25% this week'). If not needed, state when next scheduled change is due based on maintenance schedule. Do not include generic benefits or explanations about why water changes are important - focus only on whether it's needed and when."
+BRIEF_CAMERA_DESCRIPTION = "Brief 1-2 sentence visual analysis of the aquarium from the camera image (under 200 characters). Focus on water clarity, fish/plant health, and any maintenance needs visible."
+DETAILED_CAMERA_DESCRIPTION = "Detailed visual analysis of the aquarium from the camera image. Include observations about water clarity, fish identification and behavior, plant health, equipment condition, and any visible maintenance needs. Provide specific observations and recommendations based on what is visible in the image."
+
+
+def get_parameter_keys(sensor_name):
+    """Return the brief and detailed structure keys of a parameter."""
+    key = sensor_name.lower().replace(" ", "_")
+    return f"{key}_analysis", f"{key}_notification_analysis"
+
+
+def build_parameter_guidelines(parameters):
+    """Build the default parameter guidelines for the given parameters only."""
+    lines = [PARAMETER_GUIDELINES_RANGES_HEADER]
+    lines.extend(line for name, line in PARAMETER_GUIDELINES_RANGES.items() if name in parameters)
+    unit_lines = [line for name, line in PARAMETER_GUIDELINES_UNITS.items() if name in parameters]
+    if unit_lines:
+        lines.extend(["", PARAMETER_GUIDELINES_UNITS_HEADER, *unit_lines])
+    return "\n".join(lines)
+
+
+def _text_field(description):
+    """Return a required free text structure field."""
+    return {"description": description, "required": True, "selector": {"text": None}}
+
+
+def _build_camera_attachment(camera):
+    """Return the AI task attachment for a camera entity."""
+    return {
+        "media_content_id": f"media-source://camera/{camera}",
+        "media_content_type": "application/vnd.apple.mpegurl",
+        "metadata": {
+            "title": f"{camera.replace('camera.', '').title()} Camera",
+            "thumbnail": f"/api/camera_proxy/{camera}",
+            "media_class": "video",
+            "children_media_class": None,
+            "navigateIds": [
+                {},
+                {
+                    "media_content_type": "app",
+                    "media_content_id": "media-source://camera"
+                }
+            ]
+        }
+    }
+
+
+class AnalysisPlan:
+    """Everything about an AI analysis request that only depends on the configuration.
+    
+    The plan is compiled once per config entry (an options change reloads the entry
+    and compiles a new one). The structure, prompt prefix and attachment are shared
+    between runs and must not be modified; build_request only fills in the readings.
+    """
+    
+    def __init__(self, entry: ConfigEntry) -> None:
+        """Compile the plan from the config entry."""
+        data = entry.data
+        tank_name = data[CONF_TANK_NAME]
+        aquarium_type = data[CONF_AQUARIUM_TYPE]
+        
+        # Parameters with a configured sensor and analysis enabled, in prompt order
+        parameters = []
+        for sensor_conf, sensor_name, analyze_conf, default_analyze in ANALYSIS_PARAMETERS:
+            if not data.get(sensor_conf):
+                continue
+            if data.get(analyze_conf, default_analyze):
+                parameters.append(sensor_name)
+            else:
+                _LOGGER.debug("Skipping %s analysis for %s (toggle disabled)", sensor_name, tank_name)
+        self.parameters = tuple(parameters)
+        
+        self.include_overall = data.get(CONF_ANALYZE_OVERALL, DEFAULT_ANALYZE_OVERALL)
+        self.include_water_change = data.get(CONF_ANALYZE_WATER_CHANGE, DEFAULT_ANALYZE_WATER_CHANGE)
+        camera = data.get(CONF_CAMERA)
+        self.include_camera = bool(camera and data.get(CONF_ANALYZE_CAMERA, DEFAULT_ANALYZE_CAMERA))
+        if not self.include_overall:
+            _LOGGER.debug("Skipping overall analysis for %s (toggle disabled)", tank_name)
+        if not self.include_water_change:
+            _LOGGER.debug("Skipping water change analysis for %s (toggle disabled)", tank_name)
+        if camera and not self.include_camera:
+            _LOGGER.debug("Skipping camera analysis for %s (toggle disabled)", tank_name)
+        
+        self.attachment = _build_camera_attachment(camera) if self.include_camera else None
+        
+        # Brief fields are shown as sensor states, so their texts are truncated
+        brief_keys = [get_parameter_keys(sensor_name)[0] for sensor_name in self.parameters]
+        if self.include_overall:
+            brief_keys.append("overall_analysis")
+        if self.include_water_change:
+            brief_keys.append("water_change_recommended")
+        if self.include_camera:
+            brief_keys.append("camera_visual_analysis")
+        self.brief_keys = tuple(brief_keys)
+        
+        # Only ask for the detailed fields the notification format shows, and none
+        # when no notification is sent
+        notification_format = data.get(CONF_NOTIFICATION_FORMAT, DEFAULT_NOTIFICATION_FORMAT)
+        self.notification_details = NOTIFICATION_FORMAT_DETAILS.get(
+            notification_format, NOTIFICATION_FORMAT_DETAILS[DEFAULT_NOTIFICATION_FORMAT]
+        )
+        self.structure = self._build_structure(self.parameters, self.notification_details)
+        self.brief_structure = self._build_structure(self.parameters, ())
+        self.detailed_structure = self._build_structure(self.parameters, self.notification_details, brief=False)
+        
+        # Custom guidelines are sent as written, the default ones only for the analyzed parameters
+        parameter_guidelines = data.get(CONF_PROMPT_PARAMETER_GUIDELINES, DEFAULT_PROMPT_PARAMETER_GUIDELINES)
+        self.guidelines_trimmed = parameter_guidelines == DEFAULT_PROMPT_PARAMETER_GUIDELINES
+        if self.guidelines_trimmed:
+            parameter_guidelines = build_parameter_guidelines(self.parameters)
+        self.parameter_guidelines = parameter_guidelines
+        self.prompt_prefix = self._build_prompt_prefix(data, aquarium_type)
+        # Identifies the prefix in cache keys and diagnostics
+        self.prompt_prefix_hash = hashlib.sha256(self.prompt_prefix.encode()).hexdigest()
+    
+    def _build_structure(self, parameters, details, brief=True) -> dict:
+        """Build the AI task structure for the given parameters.
+        
+        Brief fields are the ones shown by the sensors, detailed notification
+        fields are only added for the groups in details. Brief fields come first,
+        then the detailed notification fields, then the camera fields.
+        """
+        brief_fields = {}
+        detailed_fields = {}
+        for sensor_name in parameters:
+            brief_key, detailed_key = get_parameter_keys(sensor_name)
+            if brief:
+                brief_fields[brief_key] = _text_field(
+                    BRIEF_PARAMETER_DESCRIPTION.format(parameter=sensor_name.lower())
+                )
+            if "parameters" in details:
+                detailed_fields[detailed_key] = _text_field(
+                    DETAILED_PARAMETER_DESCRIPTION.format(parameter=sensor_name.lower())
+                )
+        
+        if self.include_overall:
+            if brief:
+                brief_fields["overall_analysis"] = _text_field(BRIEF_OVERALL_DESCRIPTION)
+            if "overall" in details:
+                detailed_fields["overall_notification_analysis"] = _text_field(DETAILED_OVERALL_DESCRIPTION)
+        
+        if self.include_water_change:
+            if brief:
+                brief_fields["water_change_recommended"] = _text_field(BRIEF_WATER_CHANGE_DESCRIPTION)
+            if "water_change" in details:
+                detailed_fields["water_change_recommendation"] = _text_field(DETAILED_WATER_CHANGE_DESCRIPTION)
+        
+        structure = {**brief_fields, **detailed_fields}
+        if self.include_camera:
+            if brief:
+                structure["camera_visual_analysis"] = _text_field(BRIEF_CAMERA_DESCRIPTION)
+            if "camera" in details:
+                structure["camera_visual_notification_analysis"] = _text_field(DETAILED_CAMERA_DESCRIPTION)
+        return structure
+    
+    def _build_prompt_prefix(self, data, aquarium_type) -> str:
+        """Build the static start of the AI instructions.
+        
+        Only configuration goes in here, never readings or times, so the prefix is
+        byte-identical across runs and providers can serve it from their prompt cache.
+        """
+        instructions_parts = [
+            data.get(CONF_PROMPT_MAIN_INSTRUCTIONS, DEFAULT_PROMPT_MAIN_INSTRUCTIONS).format(
+                aquarium_type=aquarium_type.lower()
+            ),
+            "\n\n" + data.get(CONF_PROMPT_BRIEF_ANALYSIS, DEFAULT_PROMPT_BRIEF_ANALYSIS),
+            "\n\n" + data.get(CONF_PROMPT_DETAILED_ANALYSIS, DEFAULT_PROMPT_DETAILED_ANALYSIS),
+            "\n\n" + data.get(CONF_PROMPT_OVERALL_ANALYSIS, DEFAULT_PROMPT_OVERALL_ANALYSIS),
+            "\n\n" + data.get(CONF_PROMPT_WATER_CHANGE, DEFAULT_PROMPT_WATER_CHANGE),
+            "\n\n" + self.parameter_guidelines,
+        ]
+        if self.include_camera:
+            instructions_parts.append(
+                "\n\n" + data.get(CONF_PROMPT_CAMERA_INSTRUCTIONS, DEFAULT_PROMPT_CAMERA_INSTRUCTIONS)
+            )
+        
+        # Tank details only change with the configuration
+        details_list = [f"- Type: {aquarium_type}"]
+        for conf, label in (
+            (CONF_TANK_VOLUME, "Tank Volume"),
+            (CONF_FILTRATION, "Filtration"),
+            (CONF_WATER_CHANGE_FREQUENCY, "Water Change Schedule"),
+            (CONF_INHABITANTS, "Inhabitants"),
+            (CONF_MISC_INFO, "Additional Information"),
+        ):
+            value = data.get(conf, "")
+            if value and value.strip():
+                details_list.append(f"- {label}: {value}")
+        instructions_parts.append("\n\nAquarium details:\n\n" + "\n".join(details_list))
+        
+        return "".join(instructions_parts)
+    
+    def build_request(
+        self, task_name, sensor_data, last_water_change_state=None, brief=True, details=True, parameters=None
+    ) -> dict:
+        """Return the AI task data for the current readings.
+        
+        sensor_data holds the readings (as returned by get_sensor_info) of the
+        planned parameters that currently have a value. brief and details select
+        the brief fields and the detailed fields of the notification format, and
+        parameters (default: all with a reading) the parameters to ask about. The
+        compiled structures are used as is unless some parameters are left out.
+        """
+        conditions_list = []
+        if last_water_change_state:
+            conditions_list.append(f"- Last Water Change: {last_water_change_state}")
+        for info in sensor_data:
+            if info['unit']:
+                conditions_list.append(f"- {info['name']}: {info['raw_value']} {info['unit']}")
+            else:
+                conditions_list.append(f"- {info['name']}: {info['raw_value']} (no units)")
+        
+        if not brief:
+            structure = self.detailed_structure
+        elif details:
+            structure = self.structure
+        else:
+            structure = self.brief_structure
+        requested = [info['name'] for info in sensor_data]
+        if parameters is not None:
+            requested = [sensor_name for sensor_name in requested if sensor_name in parameters]
+        if len(requested) != len(self.parameters):
+            structure = self._build_structure(
+                [sensor_name for sensor_name in self.parameters if sensor_name in requested],
+                self.notification_details if details else (),
+                brief,
+            )
+        
+        ai_task_data = {
+            "task_name": task_name,
+            "instructions": self.prompt_prefix + "\n\nCurrent conditions:\n\n" + "\n".join(conditions_list),
+            "structure": structure,
+        }
+        if self.attachment:
+            ai_task_data["attachments"] = self.attachment
+        return ai_task_data
@@ -3,9 +3,10 @@ import logging
 from typing import Optional
 
 from homeassistant.components.binary_sensor import BinarySensorEntity
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
     DOMAIN,
@@ -18,7 +19,7 @@ from .const import (
     CONF_WATER_LEVEL_SENSOR,
     CONF_ORP_SENSOR,
 )
-from . import get_sensor_info, get_simple_status
+from .coordinator import AquariumAICoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -32,6 +33,7 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up Aquarium AI binary sensors from a config entry."""
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
     tank_name = config_entry.data[CONF_TANK_NAME]
     aquarium_type = config_entry.data[CONF_AQUARIUM_TYPE]
     
@@ -53,7 +55,7 @@ async def async_setup_entry(
     # Create water change needed binary sensor
     entities.append(
         AquariumAIWaterChangeNeeded(
-            hass,
+            coordinator,
             config_entry,
             tank_name,
         )
@@ -63,7 +65,7 @@ async def async_setup_entry(
     for sensor_entity, sensor_name in valid_sensor_mappings:
         entities.append(
             AquariumAIParameterProblem(
-                hass,
+                coordinator,
                 config_entry,
                 tank_name,
                 aquarium_type,
@@ -75,17 +77,17 @@ async def async_setup_entry(
     async_add_entities(entities)
 
 
-class AquariumAIWaterChangeNeeded(BinarySensorEntity):
+class AquariumAIWaterChangeNeeded(CoordinatorEntity, BinarySensorEntity):
     """Binary sensor for water change needed status."""
     
     def __init__(
         self,
-        hass: HomeAssistant,
+        coordinator: AquariumAICoordinator,
         config_entry: ConfigEntry,
         tank_name: str,
     ):
         """Initialize the binary sensor."""
-        self._hass = hass
+        super().__init__(coordinator)
         self._config_entry = config_entry
         self._tank_name = tank_name
         self._attr_name = f"{tank_name} Water Change Needed"
@@ -98,18 +100,23 @@ class AquariumAIWaterChangeNeeded(BinarySensorEntity):
         
     async def async_added_to_hass(self) -> None:
         """When entity is added to hass."""
+        await super().async_added_to_hass()
         # Initial update
-        await self.async_update()
+        self._update_from_coordinator()
+    
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Refresh the entity state after new analysis results."""
+        self._update_from_coordinator()
+        self.async_write_ha_state()
         
     def _get_shared_data(self):
-        """Get shared analysis data from the integration."""
-        if DOMAIN in self._hass.data and self._config_entry.entry_id in self._hass.data[DOMAIN]:
-            entry_data = self._hass.data[DOMAIN][self._config_entry.entry_id]
-            return {
-                "sensor_analysis": entry_data.get("sensor_analysis", {}),
-                "last_update": entry_data.get("last_update")
-            }
-        return {"sensor_analysis": {}, "last_update": None}
+        """Get shared analysis data from the coordinator."""
+        data = self.coordinator.data
+        return {
+            "sensor_analysis": data.sensor_analysis,
+            "last_update": data.last_update,
+        }
     
     @property
     def is_on(self) -> bool:
@@ -137,7 +144,7 @@ class AquariumAIWaterChangeNeeded(BinarySensorEntity):
             "entry_type": "service",
         }
         
-    async def async_update(self) -> None:
+    def _update_from_coordinator(self) -> None:
         """Update the binary sensor."""
         try:
             # Get shared analysis data
@@ -170,12 +177,12 @@ class AquariumAIWaterChangeNeeded(BinarySensorEntity):
             self._attr_extra_state_attributes = {}
 
 
-class AquariumAIParameterProblem(BinarySensorEntity):
+class AquariumAIParameterProblem(CoordinatorEntity, BinarySensorEntity):
     """Binary sensor for individual parameter problem detection."""
     
     def __init__(
         self,
-        hass: HomeAssistant,
+        coordinator: AquariumAICoordinator,
         config_entry: ConfigEntry,
         tank_name: str,
         aquarium_type: str,
@@ -183,7 +190,7 @@ class AquariumAIParameterProblem(BinarySensorEntity):
         sensor_name: str,
     ):
         """Initialize the parameter problem binary sensor."""
-        self._hass = hass
+        super().__init__(coordinator)
         self._config_entry = config_entry
         self._tank_name = tank_name
         self._aquarium_type = aquarium_type
@@ -211,8 +218,15 @@ class AquariumAIParameterProblem(BinarySensorEntity):
     
     async def async_added_to_hass(self) -> None:
         """When entity is added to hass."""
+        await super().async_added_to_hass()
         # Initial update
-        await self.async_update()
+        self._update_from_coordinator()
+    
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Refresh the entity state after new source sensor readings."""
+        self._update_from_coordinator()
+        self.async_write_ha_state()
         
     @property
     def is_on(self) -> bool:
@@ -240,11 +254,11 @@ class AquariumAIParameterProblem(BinarySensorEntity):
             "entry_type": "service",
         }
         
-    async def async_update(self) -> None:
+    def _update_from_coordinator(self) -> None:
         """Update the binary sensor."""
         try:
             # Get sensor info
-            sensor_info = get_sensor_info(self._hass, self._sensor_entity, self._sensor_name)
+            sensor_info = self.coordinator.readings.get(self._sensor_name)
             if not sensor_info:
                 self._state = False
                 self._available = False
@@ -253,13 +267,8 @@ class AquariumAIParameterProblem(BinarySensorEntity):
                 
             self._available = True
             
-            # Get simple status
-            status = get_simple_status(
-                sensor_info['name'], 
-                sensor_info['raw_value'], 
-                sensor_info['unit'], 
-                self._aquarium_type
-            )
+            # Status computed by the coordinator when the source sensor changed
+            status = self.coordinator.reading_statuses[self._sensor_name]
             
             # Set state to True (problem) if status is NOT "Good" or "OK"
             # Problem statuses include: "Check", "Adjust", "Low", "High", "Unavailable", etc.
@@ -65,30 +65,22 @@ class RunAnalysisButton(ButtonEntity):
         """Handle the button press."""
         _LOGGER.info("Running manual AI analysis for %s", self._tank_name)
         
-        # Get the analysis function from hass.data
+        # Run the analysis through the aquarium's coordinator
         if (
             DOMAIN in self._hass.data
             and self._config_entry.entry_id in self._hass.data[DOMAIN]
         ):
-            entry_data = self._hass.data[DOMAIN][self._config_entry.entry_id]
-            analysis_function = entry_data.get("analysis_function")
-            
-            if analysis_function:
-                try:
-                    # Force notification to be sent when button is pressed
-                    # Pass None for timestamp (triggers immediate analysis)
-                    await analysis_function(None, override_notification=True)
-                    _LOGGER.info("Successfully triggered analysis for %s", self._tank_name)
-                except Exception as err:
-                    _LOGGER.error(
-                        "Failed to run analysis for %s: %s",
-                        self._tank_name,
-                        err
-                    )
-            else:
+            coordinator = self._hass.data[DOMAIN][self._config_entry.entry_id]
+            try:
+                # Force notification to be sent when button is pressed
+                # Pass None for timestamp (triggers immediate analysis)
+                await coordinator.async_run_analysis(None, override_notification=True)
+                _LOGGER.info("Successfully triggered analysis for %s", self._tank_name)
+            except Exception as err:
                 _LOGGER.error(
-                    "Analysis function not found for %s",
-                    self._tank_name
+                    "Failed to run analysis for %s: %s",
+                    self._tank_name,
+                    err
                 )
         else:
             _LOGGER.error(
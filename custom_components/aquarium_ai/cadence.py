@@ -0,0 +1,102 @@
+"""Adaptive analysis cadence for the Aquarium AI integration."""
+from .helpers import PROBLEM_STATUSES
+
+# Severity of the simple parameter statuses, higher is worse
+_STATUS_RANKS = {"Good": 0, "OK": 1}
+_PROBLEM_RANK = 2
+
+# Factors applied to the interval after each analysis
+SHORTEN_FACTOR = 0.5
+LENGTHEN_FACTOR = 1.5
+
+
+def get_status_rank(status):
+    """Return the severity of a simple parameter status."""
+    if status in PROBLEM_STATUSES:
+        return _PROBLEM_RANK
+    return _STATUS_RANKS.get(status, _STATUS_RANKS["OK"])
+
+
+class AdaptiveCadence:
+    """Analysis interval that follows the health of the tank.
+    
+    The interval starts at the configured update frequency. It drops to the
+    floor while a parameter has a problem status, halves while a parameter
+    trends towards one (its status gets worse, or it is not Good and moved
+    beyond its tolerance), grows by half while every parameter stays Good and
+    within its tolerance, and otherwise moves back towards the configured
+    frequency.
+    Without adaptive mode it stays at the configured frequency.
+    """
+    
+    def __init__(self, base_interval, min_interval, max_interval, adaptive):
+        """Initialize the cadence, intervals in minutes."""
+        self.adaptive = adaptive
+        self.min_interval = min(min_interval, max_interval)
+        self.max_interval = max(min_interval, max_interval)
+        self.base_interval = base_interval
+        if adaptive:
+            # Stable tanks are never analyzed more often than configured, so a
+            # ceiling below the update frequency is raised to it
+            self.max_interval = max(self.max_interval, base_interval)
+            self.base_interval = max(base_interval, self.min_interval)
+        self.interval = self.base_interval
+        self.reason = "configured update frequency"
+        # Statuses at the previous update, to notice parameters getting worse
+        self._statuses = {}
+    
+    def update(self, statuses, changed_parameters):
+        """Adapt the interval after an analysis and return whether it changed.
+        
+        statuses maps parameter names to their simple status; changed_parameters
+        lists the parameters that moved beyond their tolerance since the previous
+        update.
+        """
+        previous_statuses = self._statuses
+        self._statuses = dict(statuses)
+        if not self.adaptive:
+            return False
+        
+        interval = self.interval
+        problems = [name for name, status in statuses.items() if status in PROBLEM_STATUSES]
+        trending = [
+            name for name, status in statuses.items()
+            if (
+                name in previous_statuses
+                and get_status_rank(status) > get_status_rank(previous_statuses[name])
+            )
+            or (name in changed_parameters and status != "Good")
+        ]
+        if problems:
+            interval = self.min_interval
+            self.reason = f"problem with {', '.join(problems)}"
+        elif trending:
+            interval = max(self.min_interval, interval * SHORTEN_FACTOR)
+            self.reason = f"{', '.join(trending)} trending towards a problem"
+        elif not changed_parameters and all(status == "Good" for status in statuses.values()):
+            interval = min(self.max_interval, interval * LENGTHEN_FACTOR)
+            self.reason = "all parameters stable"
+        elif interval < self.base_interval:
+            interval = min(self.base_interval, interval * LENGTHEN_FACTOR)
+            self.reason = "recovering"
+        elif interval > self.base_interval:
+            interval = max(self.base_interval, interval * SHORTEN_FACTOR)
+            self.reason = f"{', '.join(changed_parameters) or 'parameters'} changing"
+        else:
+            self.reason = "configured update frequency"
+        
+        interval = round(interval)
+        if interval == self.interval:
+            return False
+        self.interval = interval
+        return True
+    
+    def as_dict(self):
+        """Return the cadence state for attributes and diagnostics."""
+        return {
+            "adaptive": self.adaptive,
+            "base_interval": self.base_interval,
+            "min_interval": self.min_interval,
+            "max_interval": self.max_interval,
+            "reason": self.reason,
+        }
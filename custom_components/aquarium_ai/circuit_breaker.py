@@ -0,0 +1,194 @@
+"""Circuit breaker for the AI Task calls of the Aquarium AI integration."""
+import logging
+import time
+from datetime import timedelta
+
+import aiohttp
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError, ServiceNotFound, ServiceValidationError
+from homeassistant.helpers.event import async_call_later
+import homeassistant.util.dt as dt_util
+
+from .const import (
+    DATA_CIRCUIT_BREAKERS,
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+    CIRCUIT_BREAKER_RECOVERY_TIME,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Breaker states: calls pass, calls are refused, one trial call is allowed
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+BREAKER_STATES = (STATE_CLOSED, STATE_OPEN, STATE_HALF_OPEN)
+
+# Errors worth retrying and counted by the breaker. AI Task providers report API
+# outages and rate limits as HomeAssistantError.
+TRANSIENT_ERRORS = (TimeoutError, ConnectionError, aiohttp.ClientError, HomeAssistantError)
+
+# Configuration problems a retry won't fix, checked before TRANSIENT_ERRORS
+CONFIGURATION_ERRORS = (ServiceNotFound, ServiceValidationError, vol.Invalid)
+
+
+class AITaskUnavailableError(HomeAssistantError):
+    """Raised instead of calling an AI Task entity whose breaker is open."""
+
+
+class CircuitBreaker:
+    """Track the failures of one AI Task entity, shared by all aquariums using it.
+    
+    After failure_threshold consecutive failed calls the breaker opens and calls
+    are refused for recovery_time seconds. Then a single trial call is allowed:
+    a success closes the breaker, a failure opens it again.
+    """
+    
+    def __init__(self, hass: HomeAssistant, ai_task, failure_threshold, recovery_time):
+        """Initialize a closed breaker."""
+        self._hass = hass
+        self.ai_task = ai_task
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.consecutive_failures = 0
+        self.total_failures = 0
+        self.last_error = None
+        self.last_failure = None
+        self.opened_at = None
+        self._retry_at = None
+        self._trial_in_flight = False
+        self._listeners = []
+        self._unsub_recovery = None
+    
+    @property
+    def state(self):
+        """Return the current breaker state."""
+        if self._retry_at is None:
+            return STATE_CLOSED
+        if time.monotonic() < self._retry_at:
+            return STATE_OPEN
+        return STATE_HALF_OPEN
+    
+    @property
+    def retry_at(self):
+        """Return when the next trial call is allowed, while the breaker is open."""
+        if self.state != STATE_OPEN:
+            return None
+        return self.opened_at + timedelta(seconds=self.recovery_time)
+    
+    def allow_request(self):
+        """Return whether a call may be made now, reserving the trial call when half open."""
+        state = self.state
+        if state == STATE_CLOSED:
+            return True
+        if state == STATE_HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+    
+    def record_success(self):
+        """Close the breaker after a successful call."""
+        was_open = self._retry_at is not None
+        changed = was_open or self.consecutive_failures
+        self._trial_in_flight = False
+        self.consecutive_failures = 0
+        self._retry_at = None
+        self.opened_at = None
+        self._cancel_recovery()
+        if was_open:
+            _LOGGER.info("AI Task %s is available again", self.ai_task)
+        if changed:
+            self._async_notify()
+    
+    def record_failure(self, err):
+        """Count a failed call, opening the breaker when the threshold is reached."""
+        trial = self._trial_in_flight
+        self._trial_in_flight = False
+        self.consecutive_failures += 1
+        self.total_failures += 1
+        self.last_error = str(err)
+        self.last_failure = dt_util.utcnow()
+        if trial or self.consecutive_failures >= self.failure_threshold:
+            self._open()
+        self._async_notify()
+    
+    def release_request(self):
+        """Give back a trial call that was cancelled before it finished."""
+        self._trial_in_flight = False
+    
+    def _open(self):
+        """Refuse calls for the recovery time."""
+        self.opened_at = dt_util.utcnow()
+        self._retry_at = time.monotonic() + self.recovery_time
+        _LOGGER.warning(
+            "AI Task %s failed %d times in a row, skipping AI calls for %d seconds: %s",
+            self.ai_task, self.consecutive_failures, self.recovery_time, self.last_error
+        )
+        # Update the listeners when the breaker becomes half open
+        self._cancel_recovery()
+        self._unsub_recovery = async_call_later(self._hass, self.recovery_time, self._async_recovery_due)
+    
+    @callback
+    def _async_recovery_due(self, _now):
+        """Notify the listeners that a trial call is allowed."""
+        self._unsub_recovery = None
+        self._async_notify()
+    
+    def async_shutdown(self):
+        """Cancel the pending timer when the integration is unloaded."""
+        self._cancel_recovery()
+    
+    def _cancel_recovery(self):
+        """Cancel the pending half open notification."""
+        if self._unsub_recovery:
+            self._unsub_recovery()
+            self._unsub_recovery = None
+    
+    @callback
+    def async_add_listener(self, update_callback):
+        """Listen for state changes, returning a function that removes the listener."""
+        self._listeners.append(update_callback)
+        
+        @callback
+        def remove_listener():
+            self._listeners.remove(update_callback)
+        
+        return remove_listener
+    
+    @callback
+    def _async_notify(self):
+        """Call the listeners."""
+        for update_callback in list(self._listeners):
+            update_callback()
+    
+    def as_dict(self):
+        """Return the breaker state for attributes and diagnostics."""
+        retry_at = self.retry_at
+        return {
+            "ai_task": self.ai_task,
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "failure_threshold": self.failure_threshold,
+            "total_failures": self.total_failures,
+            "last_error": self.last_error,
+            "last_failure": self.last_failure.isoformat() if self.last_failure else None,
+            "opened_at": self.opened_at.isoformat() if self.opened_at else None,
+            "retry_at": retry_at.isoformat() if retry_at else None,
+        }
+
+
+def get_circuit_breaker(hass: HomeAssistant, ai_task) -> CircuitBreaker:
+    """Return the breaker of an AI Task entity, created on first use."""
+    breakers = hass.data.setdefault(DATA_CIRCUIT_BREAKERS, {})
+    if ai_task not in breakers:
+        breakers[ai_task] = CircuitBreaker(
+            hass, ai_task, CIRCUIT_BREAKER_FAILURE_THRESHOLD, CIRCUIT_BREAKER_RECOVERY_TIME
+        )
+    return breakers[ai_task]
+
+
+def async_remove_circuit_breakers(hass: HomeAssistant):
+    """Drop all breakers and their pending timers."""
+    for breaker in hass.data.pop(DATA_CIRCUIT_BREAKERS, {}).values():
+        breaker.async_shutdown()
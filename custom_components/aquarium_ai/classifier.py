@@ -0,0 +1,141 @@
+"""Parameter status classifier for the Aquarium AI integration."""
+from bisect import bisect_right
+from functools import lru_cache
+import math
+
+from .const import (
+    NON_NUMERIC_STATUSES,
+    PARAMETER_RANGES,
+    PARAMETER_UNITS,
+    SALTWATER_KEYWORDS,
+)
+
+# Status for numeric values of parameters without configured ranges
+DEFAULT_NUMERIC_STATUS = "OK"
+# Status for non-numeric values not listed in NON_NUMERIC_STATUSES
+DEFAULT_NON_NUMERIC_STATUS = "OK"
+
+
+def get_tank_class(aquarium_type):
+    """Return "saltwater" or "freshwater" for an aquarium type."""
+    aquarium_type_lower = str(aquarium_type or "").lower()
+    if any(keyword in aquarium_type_lower for keyword in SALTWATER_KEYWORDS):
+        return "saltwater"
+    return "freshwater"
+
+
+def _compile_bands(bands, fallback):
+    """Turn ordered (status, low, high) bands into sorted boundaries and labels.
+    
+    Inclusive upper bounds become exclusive thresholds at the next float, so the
+    status of a value is labels[bisect_right(boundaries, value)].
+    """
+    boundaries = set()
+    for _, low, high in bands:
+        if low is not None:
+            boundaries.add(float(low))
+        if high is not None:
+            boundaries.add(math.nextafter(float(high), math.inf))
+    boundaries = sorted(boundaries)
+    
+    def _status_at(value):
+        for status, low, high in bands:
+            if (low is None or low <= value) and (high is None or value <= high):
+                return status
+        return fallback
+    
+    # Every interval between two boundaries has a single status, taken at its start
+    merged_boundaries = []
+    labels = [_status_at(-math.inf)]
+    for boundary in boundaries:
+        status = _status_at(boundary)
+        if status != labels[-1]:
+            merged_boundaries.append(boundary)
+            labels.append(status)
+    
+    return tuple(merged_boundaries), tuple(labels), fallback
+
+
+@lru_cache(maxsize=None)
+def _select_ranges(tank_class):
+    """Select the range table entries for one tank class, keyed by (parameter, canonical unit)."""
+    return {
+        (parameter, unit): ranges
+        for (parameter, unit, range_tank_class), ranges in PARAMETER_RANGES.items()
+        if range_tank_class is None or range_tank_class == tank_class
+    }
+
+
+@lru_cache(maxsize=None)
+def _compile_ranges(tank_class):
+    """Compile the range table for one tank class, keyed by (parameter, canonical unit)."""
+    return {
+        key: _compile_bands(bands, fallback)
+        for key, (bands, fallback) in _select_ranges(tank_class).items()
+    }
+
+
+class ParameterClassifier:
+    """Classify sensor readings of one aquarium into simple statuses."""
+    
+    def __init__(self, aquarium_type):
+        """Initialize the classifier with the ranges for the aquarium type."""
+        self.aquarium_type = aquarium_type
+        self.tank_class = get_tank_class(aquarium_type)
+        self._ranges = _compile_ranges(self.tank_class)
+        self._units = {}
+    
+    def _canonical_unit(self, sensor_name, unit):
+        """Return the canonical unit the ranges of a parameter are keyed by."""
+        key = (sensor_name, unit)
+        if key not in self._units:
+            aliases = PARAMETER_UNITS.get(sensor_name)
+            self._units[key] = aliases.get(unit.lower(), aliases[None]) if aliases else None
+        return self._units[key]
+    
+    def get_bands(self, sensor_name, unit=""):
+        """Return the (status, low, high) bands of a parameter, or an empty tuple."""
+        ranges = _select_ranges(self.tank_class).get((sensor_name, self._canonical_unit(sensor_name, unit)))
+        return ranges[0] if ranges else ()
+    
+    def classify(self, sensor_name, value, unit=""):
+        """Return a simple 1-2 word status for a sensor value."""
+        try:
+            numeric_value = float(value)
+        except (ValueError, TypeError):
+            return NON_NUMERIC_STATUSES.get(str(value).lower(), DEFAULT_NON_NUMERIC_STATUS)
+        
+        compiled = self._ranges.get((sensor_name, self._canonical_unit(sensor_name, unit)))
+        if compiled is None:
+            return DEFAULT_NUMERIC_STATUS
+        
+        boundaries, labels, fallback = compiled
+        if math.isnan(numeric_value):
+            # NaN is outside every range
+            return fallback
+        return labels[bisect_right(boundaries, numeric_value)]
+    
+    def classify_all(self, sensor_data):
+        """Classify readings (as returned by get_sensor_info), keyed by parameter name."""
+        return {
+            info['name']: self.classify(info['name'], info['raw_value'], info['unit'])
+            for info in sensor_data
+        }
+
+
+@lru_cache(maxsize=32)
+def get_classifier(aquarium_type):
+    """Return a shared classifier for an aquarium type."""
+    return ParameterClassifier(aquarium_type)
+
+
+def classify_tanks(tanks):
+    """Classify the readings of several aquariums in one pass.
+    
+    tanks maps a key (e.g. a config entry ID) to (aquarium_type, sensor_data).
+    Returns the statuses per key, keyed by parameter name.
+    """
+    return {
+        key: get_classifier(aquarium_type).classify_all(sensor_data)
+        for key, (aquarium_type, sensor_data) in tanks.items()
+    }
@@ -15,6 +15,9 @@ from homeassistant.helpers.selector import (
     SelectSelectorMode,
     BooleanSelector,
     BooleanSelectorConfig,
+    NumberSelector,
+    NumberSelectorConfig,
+    NumberSelectorMode,
 )
 
 from .const import (
@@ -46,6 +49,25 @@ from .const import (
     CONF_PROMPT_DETAILED_ANALYSIS,
     CONF_PROMPT_WATER_CHANGE,
     CONF_PROMPT_OVERALL_ANALYSIS,
+    CONF_SKIP_UNCHANGED_ANALYSIS,
+    CONF_MAX_ANALYSIS_AGE,
+    CONF_ANALYSIS_MODE,
+    CONF_TWO_PHASE_ANALYSIS,
+    CONF_INCREMENTAL_ANALYSIS,
+    CONF_RESPONSE_CACHE_TTL,
+    CONF_SHARE_RESPONSE_CACHE,
+    CONF_ANALYSIS_DEADLINE,
+    CONF_OVERLAP_POLICY,
+    CONF_ADAPTIVE_CADENCE,
+    CONF_MIN_ANALYSIS_INTERVAL,
+    CONF_MAX_ANALYSIS_INTERVAL,
+    CONF_ANALYZE_ON_STATUS_CHANGE,
+    CONF_STATUS_CHANGE_DEBOUNCE,
+    CONF_MIN_ANALYSIS_SPACING,
+    CONF_MAX_TRIGGERED_ANALYSES,
+    CONF_CRITICAL_ALERTS,
+    CONF_HISTORY_SIZE,
+    CONF_HISTORY_MAX_AGE,
     DEFAULT_TANK_NAME,
     DEFAULT_AQUARIUM_TYPE,
     DEFAULT_FREQUENCY,
@@ -64,8 +86,30 @@ from .const import (
     DEFAULT_PROMPT_DETAILED_ANALYSIS,
     DEFAULT_PROMPT_WATER_CHANGE,
     DEFAULT_PROMPT_OVERALL_ANALYSIS,
+    DEFAULT_SKIP_UNCHANGED_ANALYSIS,
+    DEFAULT_MAX_ANALYSIS_AGE,
+    DEFAULT_ANALYSIS_MODE,
+    DEFAULT_TWO_PHASE_ANALYSIS,
+    DEFAULT_INCREMENTAL_ANALYSIS,
+    DEFAULT_RESPONSE_CACHE_TTL,
+    DEFAULT_SHARE_RESPONSE_CACHE,
+    DEFAULT_ANALYSIS_DEADLINE,
+    DEFAULT_OVERLAP_POLICY,
+    DEFAULT_ADAPTIVE_CADENCE,
+    DEFAULT_MIN_ANALYSIS_INTERVAL,
+    DEFAULT_MAX_ANALYSIS_INTERVAL,
+    DEFAULT_ANALYZE_ON_STATUS_CHANGE,
+    DEFAULT_STATUS_CHANGE_DEBOUNCE,
+    DEFAULT_MIN_ANALYSIS_SPACING,
+    DEFAULT_MAX_TRIGGERED_ANALYSES,
+    DEFAULT_CRITICAL_ALERTS,
+    DEFAULT_HISTORY_SIZE,
+    DEFAULT_HISTORY_MAX_AGE,
+    CHANGE_TOLERANCES,
     UPDATE_FREQUENCIES,
     NOTIFICATION_FORMATS,
+    ANALYSIS_MODES,
+    OVERLAP_POLICIES,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -343,7 +387,7 @@ class AquariumAIOptionsFlow(config_entries.OptionsFlow):
         """Manage the options - Main menu."""
         return self.async_show_menu(
             step_id="init",
-            menu_options=["basic_settings", "sensors", "tank_info", "ai_prompts"]
+            menu_options=["basic_settings", "sensors", "tank_info", "ai_prompts", "advanced_settings"]
         )
     
     async def async_step_basic_settings(self, user_input=None):
@@ -444,6 +488,23 @@ class AquariumAIOptionsFlow(config_entries.OptionsFlow):
             last_step=False
         )
     
+    async def async_step_advanced_settings(self, user_input=None):
+        """Handle advanced analysis settings configuration."""
+        if user_input is not None:
+            # Update the config entry data directly
+            self.hass.config_entries.async_update_entry(
+                self.config_entry,
+                data={**self.config_entry.data, **user_input}
+            )
+            return self.async_create_entry(title="", data={})
+
+        return self.async_show_form(
+            step_id="advanced_settings", 
+            data_schema=self._get_advanced_settings_schema(self.config_entry.data),
+            description_placeholders={"step_description": "Tune how often the AI is called"},
+            last_step=False
+        )
+    
     def _get_basic_settings_schema(self, current_data):
         """Get the basic settings schema with current values."""
         schema_dict = {
@@ -733,4 +794,181 @@ class AquariumAIOptionsFlow(config_entries.OptionsFlow):
             default=current_data.get(CONF_PROMPT_OVERALL_ANALYSIS, DEFAULT_PROMPT_OVERALL_ANALYSIS),
         )] = TextSelector(TextSelectorConfig(type=TextSelectorType.TEXT, multiline=True))
         
-        return vol.Schema(schema_dict)
\ No newline at end of file
+        return vol.Schema(schema_dict)
+    
+    def _get_advanced_settings_schema(self, current_data):
+        """Get the advanced analysis settings schema with current values."""
+        schema_dict = {}
+        
+        # Add change detection fields
+        schema_dict[vol.Required(
+            CONF_SKIP_UNCHANGED_ANALYSIS,
+            default=current_data.get(CONF_SKIP_UNCHANGED_ANALYSIS, DEFAULT_SKIP_UNCHANGED_ANALYSIS),
+        )] = BooleanSelector(BooleanSelectorConfig())
+        
+        schema_dict[vol.Required(
+            CONF_MAX_ANALYSIS_AGE,
+            default=current_data.get(CONF_MAX_ANALYSIS_AGE, DEFAULT_MAX_ANALYSIS_AGE),
+        )] = NumberSelector(
+            NumberSelectorConfig(
+                min=60, max=10080, step=30, unit_of_measurement="min", mode=NumberSelectorMode.BOX
+            )
+        )
+        
+        # Add per-parameter change tolerances (percent of the last analyzed value)
+        for tolerance_conf, default_tolerance in CHANGE_TOLERANCES.values():
+            schema_dict[vol.Required(
+                tolerance_conf,
+                default=current_data.get(tolerance_conf, default_tolerance),
+            )] = NumberSelector(
+                NumberSelectorConfig(
+                    min=0, max=50, step=0.1, unit_of_measurement="%", mode=NumberSelectorMode.BOX
+                )
+            )
+        
+        # Add analysis mode
+        schema_dict[vol.Required(
+            CONF_ANALYSIS_MODE,
+            default=current_data.get(CONF_ANALYSIS_MODE, DEFAULT_ANALYSIS_MODE),
+        )] = SelectSelector(
+            SelectSelectorConfig(
+                options=[
+                    {"value": mode, "label": label}
+                    for mode, label in ANALYSIS_MODES.items()
+                ],
+                mode=SelectSelectorMode.DROPDOWN
+            )
+        )
+        
+        schema_dict[vol.Required(
+            CONF_TWO_PHASE_ANALYSIS,
+            default=current_data.get(CONF_TWO_PHASE_ANALYSIS, DEFAULT_TWO_PHASE_ANALYSIS),
+        )] = BooleanSelector(BooleanSelectorConfig())
+        
+        schema_dict[vol.Required(
+            CONF_INCREMENTAL_ANALYSIS,
+            default=current_data.get(CONF_INCREMENTAL_ANALYSIS, DEFAULT_INCREMENTAL_ANALYSIS),
+        )] = BooleanSelector(BooleanSelectorConfig())
+        
+        # Add response cache settings
+        schema_dict[vol.Required(
+            CONF_RESPONSE_CACHE_TTL,
+            default=current_data.get(CONF_RESPONSE_CACHE_TTL, DEFAULT_RESPONSE_CACHE_TTL),
+        )] = NumberSelector(
+            NumberSelectorConfig(
+                min=0, max=1440, step=5, unit_of_measurement="min", mode=NumberSelectorMode.BOX
+            )
+        )
+        
+        schema_dict[vol.Required(
+            CONF_SHARE_RESPONSE_CACHE,
+            default=current_data.get(CONF_SHARE_RESPONSE_CACHE, DEFAULT_SHARE_RESPONSE_CACHE),
+        )] = BooleanSelector(BooleanSelectorConfig())
+        
+        # Add the analysis deadline
+        schema_dict[vol.Required(
+            CONF_ANALYSIS_DEADLINE,
+            default=current_data.get(CONF_ANALYSIS_DEADLINE, DEFAULT_ANALYSIS_DEADLINE),
+        )] = NumberSelector(
+            NumberSelectorConfig(
+                min=30, max=1800, step=10, unit_of_measurement="s", mode=NumberSelectorMode.BOX
+            )
+        )
+        
+        # Add the overlap policy for scheduled analyses
+        schema_dict[vol.Required(
+            CONF_OVERLAP_POLICY,
+            default=current_data.get(CONF_OVERLAP_POLICY, DEFAULT_OVERLAP_POLICY),
+        )] = SelectSelector(
+            SelectSelectorConfig(
+                options=[
+                    {"value": policy, "label": label}
+                    for policy, label in OVERLAP_POLICIES.items()
+                ],
+                mode=SelectSelectorMode.DROPDOWN
+            )
+        )
+        
+        # Add adaptive analysis cadence settings
+        schema_dict[vol.Required(
+            CONF_ADAPTIVE_CADENCE,
+            default=current_data.get(CONF_ADAPTIVE_CADENCE, DEFAULT_ADAPTIVE_CADENCE),
+        )] = BooleanSelector(BooleanSelectorConfig())
+        
+        schema_dict[vol.Required(
+            CONF_MIN_ANALYSIS_INTERVAL,
+            default=current_data.get(CONF_MIN_ANALYSIS_INTERVAL, DEFAULT_MIN_ANALYSIS_INTERVAL),
+        )] = NumberSelector(
+            NumberSelectorConfig(
+                min=15, max=1440, step=5, unit_of_measurement="min", mode=NumberSelectorMode.BOX
+            )
+        )
+        
+        schema_dict[vol.Required(
+            CONF_MAX_ANALYSIS_INTERVAL,
+            default=current_data.get(CONF_MAX_ANALYSIS_INTERVAL, DEFAULT_MAX_ANALYSIS_INTERVAL),
+        )] = NumberSelector(
+            NumberSelectorConfig(
+                min=15, max=2880, step=5, unit_of_measurement="min", mode=NumberSelectorMode.BOX
+            )
+        )
+        
+        # Add status change triggered analysis settings
+        schema_dict[vol.Required(
+            CONF_ANALYZE_ON_STATUS_CHANGE,
+            default=current_data.get(CONF_ANALYZE_ON_STATUS_CHANGE, DEFAULT_ANALYZE_ON_STATUS_CHANGE),
+        )] = BooleanSelector(BooleanSelectorConfig())
+        
+        schema_dict[vol.Required(
+            CONF_STATUS_CHANGE_DEBOUNCE,
+            default=current_data.get(CONF_STATUS_CHANGE_DEBOUNCE, DEFAULT_STATUS_CHANGE_DEBOUNCE),
+        )] = NumberSelector(
+            NumberSelectorConfig(
+                min=0, max=3600, step=10, unit_of_measurement="s", mode=NumberSelectorMode.BOX
+            )
+        )
+        
+        schema_dict[vol.Required(
+            CONF_MIN_ANALYSIS_SPACING,
+            default=current_data.get(CONF_MIN_ANALYSIS_SPACING, DEFAULT_MIN_ANALYSIS_SPACING),
+        )] = NumberSelector(
+            NumberSelectorConfig(
+                min=0, max=720, step=1, unit_of_measurement="min", mode=NumberSelectorMode.BOX
+            )
+        )
+        
+        schema_dict[vol.Required(
+            CONF_MAX_TRIGGERED_ANALYSES,
+            default=current_data.get(CONF_MAX_TRIGGERED_ANALYSES, DEFAULT_MAX_TRIGGERED_ANALYSES),
+        )] = NumberSelector(
+            NumberSelectorConfig(
+                min=1, max=60, step=1, unit_of_measurement="per hour", mode=NumberSelectorMode.BOX
+            )
+        )
+        
+        # Add immediate critical alerts toggle
+        schema_dict[vol.Required(
+            CONF_CRITICAL_ALERTS,
+            default=current_data.get(CONF_CRITICAL_ALERTS, DEFAULT_CRITICAL_ALERTS),
+        )] = BooleanSelector(BooleanSelectorConfig())
+        
+        # Add analysis history limits
+        schema_dict[vol.Required(
+            CONF_HISTORY_SIZE,
+            default=current_data.get(CONF_HISTORY_SIZE, DEFAULT_HISTORY_SIZE),
+        )] = NumberSelector(
+            NumberSelectorConfig(
+                min=10, max=5000, step=10, mode=NumberSelectorMode.BOX
+            )
+        )
+        
+        schema_dict[vol.Required(
+            CONF_HISTORY_MAX_AGE,
+            default=current_data.get(CONF_HISTORY_MAX_AGE, DEFAULT_HISTORY_MAX_AGE),
+        )] = NumberSelector(
+            NumberSelectorConfig(
+                min=1, max=365, step=1, unit_of_measurement="days", mode=NumberSelectorMode.BOX
+            )
+        )
+        
+        return vol.Schema(schema_dict)
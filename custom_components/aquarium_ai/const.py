@@ -3,6 +3,11 @@ from typing import Final
 
 DOMAIN: Final = "aquarium_ai"
 
+# Storage of the latest analysis per config entry (format the key with the config entry ID)
+STORAGE_VERSION: Final = 1
+STORAGE_KEY: Final = f"{DOMAIN}.{{}}"
+STORAGE_SAVE_DELAY: Final = 10  # seconds to batch writes of new results
+
 # Configuration constants
 CONF_TANK_NAME: Final = "tank_name"
 CONF_AQUARIUM_TYPE: Final = "aquarium_type"
@@ -36,6 +41,37 @@ CONF_ANALYZE_CAMERA: Final = "analyze_camera"
 CONF_ANALYZE_WATER_CHANGE: Final = "analyze_water_change"
 CONF_ANALYZE_OVERALL: Final = "analyze_overall"
 
+# Change detection configuration constants
+CONF_SKIP_UNCHANGED_ANALYSIS: Final = "skip_unchanged_analysis"
+CONF_MAX_ANALYSIS_AGE: Final = "max_analysis_age"
+CONF_TEMPERATURE_TOLERANCE: Final = "temperature_tolerance"
+CONF_PH_TOLERANCE: Final = "ph_tolerance"
+CONF_SALINITY_TOLERANCE: Final = "salinity_tolerance"
+CONF_DISSOLVED_OXYGEN_TOLERANCE: Final = "dissolved_oxygen_tolerance"
+CONF_WATER_LEVEL_TOLERANCE: Final = "water_level_tolerance"
+CONF_ORP_TOLERANCE: Final = "orp_tolerance"
+
+# Analysis mode configuration constants
+CONF_ANALYSIS_MODE: Final = "analysis_mode"
+CONF_TWO_PHASE_ANALYSIS: Final = "two_phase_analysis"
+CONF_INCREMENTAL_ANALYSIS: Final = "incremental_analysis"
+CONF_RESPONSE_CACHE_TTL: Final = "response_cache_ttl"
+CONF_SHARE_RESPONSE_CACHE: Final = "share_response_cache"
+CONF_ANALYSIS_DEADLINE: Final = "analysis_deadline"
+CONF_OVERLAP_POLICY: Final = "overlap_policy"
+CONF_ADAPTIVE_CADENCE: Final = "adaptive_cadence"
+CONF_MIN_ANALYSIS_INTERVAL: Final = "min_analysis_interval"
+CONF_MAX_ANALYSIS_INTERVAL: Final = "max_analysis_interval"
+CONF_ANALYZE_ON_STATUS_CHANGE: Final = "analyze_on_status_change"
+CONF_STATUS_CHANGE_DEBOUNCE: Final = "status_change_debounce"
+CONF_MIN_ANALYSIS_SPACING: Final = "min_analysis_spacing"
+CONF_MAX_TRIGGERED_ANALYSES: Final = "max_triggered_analyses"
+CONF_CRITICAL_ALERTS: Final = "critical_alerts"
+
+# Analysis history configuration constants
+CONF_HISTORY_SIZE: Final = "history_size"
+CONF_HISTORY_MAX_AGE: Final = "history_max_age"
+
 # AI Prompt Configuration constants
 CONF_PROMPT_MAIN_INSTRUCTIONS: Final = "prompt_main_instructions"
 CONF_PROMPT_PARAMETER_GUIDELINES: Final = "prompt_parameter_guidelines"
@@ -69,6 +105,73 @@ DEFAULT_ANALYZE_CAMERA: Final = True
 DEFAULT_ANALYZE_WATER_CHANGE: Final = True
 DEFAULT_ANALYZE_OVERALL: Final = True
 
+# Default values for change detection
+DEFAULT_SKIP_UNCHANGED_ANALYSIS: Final = False
+DEFAULT_MAX_ANALYSIS_AGE: Final = 360  # minutes before a reused analysis is considered stale
+
+# Change tolerances per parameter, as a percentage of the last analyzed value.
+# Format: parameter name -> (tolerance config key, default tolerance in %)
+CHANGE_TOLERANCES: Final = {
+    "Temperature": (CONF_TEMPERATURE_TOLERANCE, 1.0),
+    "pH": (CONF_PH_TOLERANCE, 1.0),
+    "Salinity": (CONF_SALINITY_TOLERANCE, 0.2),
+    "Dissolved Oxygen": (CONF_DISSOLVED_OXYGEN_TOLERANCE, 3.0),
+    "Water Level": (CONF_WATER_LEVEL_TOLERANCE, 2.0),
+    "ORP": (CONF_ORP_TOLERANCE, 3.0),
+}
+
+# Default values for the analysis mode
+DEFAULT_ANALYSIS_MODE: Final = "ai"
+DEFAULT_TWO_PHASE_ANALYSIS: Final = False
+DEFAULT_INCREMENTAL_ANALYSIS: Final = False
+DEFAULT_RESPONSE_CACHE_TTL: Final = 0  # minutes, 0 disables the cache
+DEFAULT_SHARE_RESPONSE_CACHE: Final = False
+DEFAULT_ANALYSIS_DEADLINE: Final = 180  # seconds for a whole analysis run
+DEFAULT_OVERLAP_POLICY: Final = "skip"
+DEFAULT_ADAPTIVE_CADENCE: Final = False
+DEFAULT_MIN_ANALYSIS_INTERVAL: Final = 30  # minutes
+DEFAULT_MAX_ANALYSIS_INTERVAL: Final = 720  # minutes
+DEFAULT_ANALYZE_ON_STATUS_CHANGE: Final = False
+DEFAULT_STATUS_CHANGE_DEBOUNCE: Final = 120  # seconds a new status must hold
+DEFAULT_MIN_ANALYSIS_SPACING: Final = 10  # minutes since the previous analysis
+DEFAULT_MAX_TRIGGERED_ANALYSES: Final = 4  # per TRIGGERED_ANALYSES_WINDOW
+
+DEFAULT_CRITICAL_ALERTS: Final = False
+
+# Window of the rate limit of analyses triggered by status changes
+TRIGGERED_ANALYSES_WINDOW: Final = 3600  # seconds
+# Minimum time between two immediate alerts about the same parameter
+CRITICAL_ALERT_COOLDOWN: Final = 600  # seconds
+
+# Maximum number of AI responses kept per response cache
+RESPONSE_CACHE_SIZE: Final = 128
+# hass.data key of the response cache shared between aquariums
+DATA_SHARED_RESPONSE_CACHE: Final = f"{DOMAIN}_shared_response_cache"
+
+# Retry policy and circuit breaker of the AI Task calls
+AI_TASK_MAX_ATTEMPTS: Final = 3
+AI_TASK_RETRY_BASE_DELAY: Final = 2  # seconds, doubled after every failed attempt
+AI_TASK_RETRY_MAX_DELAY: Final = 30  # seconds
+CIRCUIT_BREAKER_FAILURE_THRESHOLD: Final = 5  # consecutive failed calls
+CIRCUIT_BREAKER_RECOVERY_TIME: Final = 300  # seconds before a trial call
+# hass.data key of the circuit breakers, one per AI Task entity
+DATA_CIRCUIT_BREAKERS: Final = f"{DOMAIN}_circuit_breakers"
+
+# Shared scheduling of the analyses of all aquariums
+MAX_CONCURRENT_AI_CALLS: Final = 3  # AI Task calls running at once across all aquariums
+STARTUP_ANALYSIS_DELAY: Final = 60  # seconds after setup
+STARTUP_ANALYSIS_STAGGER: Final = 20  # seconds between the startup analyses of aquariums
+# hass.data key of the shared analysis scheduler
+DATA_SCHEDULER: Final = f"{DOMAIN}_scheduler"
+
+# Default values for the analysis history kept per aquarium
+DEFAULT_HISTORY_SIZE: Final = 500  # records
+DEFAULT_HISTORY_MAX_AGE: Final = 14  # days
+
+# Manual "run_analysis" service defaults for multi-tank execution
+DEFAULT_MAX_CONCURRENT_ANALYSES: Final = 4
+DEFAULT_ANALYSIS_TIMEOUT: Final = 120  # seconds per tank
+
 # Update frequency options (in minutes)
 UPDATE_FREQUENCIES: Final = {
     "1_hour": 60,
@@ -87,6 +190,77 @@ NOTIFICATION_FORMATS: Final = {
     "minimal": "Minimal with parameters and overall analysis only"
 }
 
+# Analysis modes: the AI Task, or the rule based local analysis without AI calls
+ANALYSIS_MODE_LOCAL: Final = "local"
+ANALYSIS_MODES: Final = {
+    "ai": "AI analysis",
+    ANALYSIS_MODE_LOCAL: "Local rule based analysis (no AI calls)",
+}
+
+# Handling of a scheduled analysis that is due while the previous one is still running
+OVERLAP_POLICIES: Final = {
+    "skip": "Skip the new analysis",
+    "queue_one": "Run it once the current analysis finishes",
+    "cancel_previous": "Cancel the current analysis and start the new one",
+}
+
+# Detailed notification fields shown by each notification format: "parameters"
+# (per-parameter detail), "overall", "water_change" and "camera"
+NOTIFICATION_FORMAT_DETAILS: Final = {
+    "detailed": ("parameters", "overall", "water_change", "camera"),
+    "condensed": ("water_change",),
+    "minimal": ("overall", "water_change", "camera"),
+}
+
+# Aquarium type keywords that select the saltwater ranges (anything else is freshwater)
+SALTWATER_KEYWORDS: Final = ("saltwater", "marine", "reef")
+
+# Canonical units per parameter: lowercased unit -> canonical unit, None holds the default.
+# Parameters without an entry here use the same ranges regardless of unit.
+PARAMETER_UNITS: Final = {
+    "Temperature": {"°f": "°F", "f": "°F", "fahrenheit": "°F", None: "°C"},
+    "Salinity": {"sg": "SG", "specific_gravity": "SG", "ms/cm": "mS/cm", None: "ppt"},
+    "Dissolved Oxygen": {
+        "ppm": "ppm", "parts_per_million": "ppm",
+        "%": "%", "percent": "%", "saturation": "%",
+        None: "mg/L",
+    },
+    "Water Level": {"%": "%", "percent": "%", None: "absolute"},
+}
+
+# Healthy ranges used for the simple parameter statuses.
+# Format: (parameter, canonical unit, tank class) -> (bands, fallback status)
+# Bands are (status, low, high) checked in order, bounds are inclusive and None is open-ended.
+# A unit or tank class of None matches any unit or tank class.
+PARAMETER_RANGES: Final = {
+    ("Temperature", "°F", None): ((("Good", 76, 79), ("OK", 72, 82)), "Check"),
+    ("Temperature", "°C", None): ((("Good", 24, 26), ("OK", 22, 28)), "Check"),
+    ("pH", None, "saltwater"): ((("Good", 8.2, 8.4), ("OK", 8.0, 8.6)), "Adjust"),
+    ("pH", None, "freshwater"): ((("Good", 6.5, 8.0), ("OK", 6.0, 8.5)), "Adjust"),
+    ("Salinity", "SG", None): ((("Good", 1.020, 1.025), ("OK", 1.018, 1.027)), "Check"),
+    ("Salinity", "mS/cm", None): ((("Good", 46.25, 53.06), ("OK", 43.48, 55.75)), "Check"),
+    ("Salinity", "ppt", None): ((("Good", 30, 35), ("OK", 28, 37)), "Check"),
+    ("Dissolved Oxygen", "ppm", None): ((("High", 12, None), ("Good", 7, None), ("OK", 4, None)), "Low"),
+    ("Dissolved Oxygen", "%", None): ((("High", 120, None), ("Good", 85, None), ("OK", 60, None)), "Low"),
+    ("Dissolved Oxygen", "mg/L", None): ((("Good", 6, None), ("OK", 4, None)), "Low"),
+    ("Water Level", "%", None): ((("Good", 80, None), ("OK", 60, None)), "Low"),
+    # Absolute levels (cm, inches, ...) can't be judged without the tank specifications
+    ("Water Level", "absolute", None): ((), "OK"),
+    ("ORP", None, "saltwater"): ((("Good", 300, 400), ("OK", 275, 425)), "Check"),
+    ("ORP", None, "freshwater"): ((("Good", 250, 400), ("OK", 150, 500)), "Check"),
+}
+
+# Statuses for non-numeric sensor states (like "Normal" or "High"), anything else is "OK"
+NON_NUMERIC_STATUSES: Final = {
+    "normal": "Good",
+    "good": "Good",
+    "excellent": "Good",
+    "ok": "Good",
+    "high": "Check",
+    "low": "Check",
+    "warning": "Check",
+}
+
 # Default AI Prompts
 DEFAULT_PROMPT_MAIN_INSTRUCTIONS: Final = """Provide analysis for this {aquarium_type} aquarium.
 
@@ -98,20 +272,33 @@ If last water change date is provided, factor in the time elapsed when making wa
 Consider any additional information provided in the context.
 Always correctly write ph as pH."""
 
-DEFAULT_PROMPT_PARAMETER_GUIDELINES: Final = """When considering the parameters, use the following guidelines for healthy ranges:
-- Temperature: 22-28°C (72-82°F) for most fish, 24-28°C (76-82°F) acceptable for tropical fish, 20-24°C (68-75°F) for coldwater fish, 24-26°C (75-79°F) for reef tanks
-- Water Level: 80%+ if percentage, otherwise ensure within acceptable range for tank size
-- pH: 6.5-8.0 for freshwater, 8.0-8.4 for saltwater/marine
-- Salinity: 30-35 ppt/psu for saltwater, 1.020-1.025 SG or 46.25-53.06 mS/cm for saltwater specific gravity/conductivity
-- Dissolved Oxygen: 6+ mg/L, 85%+ saturation, 7+ ppm. But Higher levels (up to 120% saturation or 12+ mg/L) can lead to gas bubble disease
-- ORP: 250-400 mV for freshwater, 300-400 mV for saltwater/marine
-
-IMPORTANT: Pay careful attention to the units provided for each parameter. Use the actual units when evaluating if values are appropriate:
-- Temperature: Consider if values are in Celsius (°C) or Fahrenheit (°F)
-- Salinity: Consider if values are in ppt/psu (parts per thousand) or specific gravity (SG)
-- Dissolved Oxygen: Consider if values are in mg/L, ppm, or percentage saturation
-- Water Level: Consider if values are percentages or absolute measurements
-- pH: Typically has no units (pure number scale 0-14)"""
+# Parameter guideline fragments: only the lines of the analyzed parameters are sent
+# when the default guidelines are used
+PARAMETER_GUIDELINES_RANGES_HEADER: Final = "When considering the parameters, use the following guidelines for healthy ranges:"
+PARAMETER_GUIDELINES_RANGES: Final = {
+    "Temperature": "- Temperature: 22-28°C (72-82°F) for most fish, 24-28°C (76-82°F) acceptable for tropical fish, 20-24°C (68-75°F) for coldwater fish, 24-26°C (75-79°F) for reef tanks",
+    "Water Level": "- Water Level: 80%+ if percentage, otherwise ensure within acceptable range for tank size",
+    "pH": "- pH: 6.5-8.0 for freshwater, 8.0-8.4 for saltwater/marine",
+    "Salinity": "- Salinity: 30-35 ppt/psu for saltwater, 1.020-1.025 SG or 46.25-53.06 mS/cm for saltwater specific gravity/conductivity",
+    "Dissolved Oxygen": "- Dissolved Oxygen: 6+ mg/L, 85%+ saturation, 7+ ppm. But Higher levels (up to 120% saturation or 12+ mg/L) can lead to gas bubble disease",
+    "ORP": "- ORP: 250-400 mV for freshwater, 300-400 mV for saltwater/marine",
+}
+PARAMETER_GUIDELINES_UNITS_HEADER: Final = "IMPORTANT: Pay careful attention to the units provided for each parameter. Use the actual units when evaluating if values are appropriate:"
+PARAMETER_GUIDELINES_UNITS: Final = {
+    "Temperature": "- Temperature: Consider if values are in Celsius (°C) or Fahrenheit (°F)",
+    "Salinity": "- Salinity: Consider if values are in ppt/psu (parts per thousand) or specific gravity (SG)",
+    "Dissolved Oxygen": "- Dissolved Oxygen: Consider if values are in mg/L, ppm, or percentage saturation",
+    "Water Level": "- Water Level: Consider if values are percentages or absolute measurements",
+    "pH": "- pH: Typically has no units (pure number scale 0-14)",
+}
+
+DEFAULT_PROMPT_PARAMETER_GUIDELINES: Final = "\n".join([
+    PARAMETER_GUIDELINES_RANGES_HEADER,
+    *PARAMETER_GUIDELINES_RANGES.values(),
+    "",
+    PARAMETER_GUIDELINES_UNITS_HEADER,
+    *PARAMETER_GUIDELINES_UNITS.values(),
+])
 
 DEFAULT_PROMPT_CAMERA_INSTRUCTIONS: Final = """If an aquarium camera image is provided:
 - Analyze the visual aspects of the aquarium focusing on:
@@ -0,0 +1,1376 @@
+"""Coordinator for the Aquarium AI integration."""
+import asyncio
+from collections import deque
+import logging
+import random
+import time
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta
+from typing import Optional
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_state_change_event,
+)
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+import homeassistant.util.dt as dt_util
+
+from .const import (
+    DOMAIN,
+    STORAGE_VERSION,
+    STORAGE_KEY,
+    STORAGE_SAVE_DELAY,
+    CONF_TANK_NAME,
+    CONF_AQUARIUM_TYPE,
+    CONF_TEMPERATURE_SENSOR,
+    CONF_PH_SENSOR,
+    CONF_SALINITY_SENSOR,
+    CONF_DISSOLVED_OXYGEN_SENSOR,
+    CONF_WATER_LEVEL_SENSOR,
+    CONF_ORP_SENSOR,
+    CONF_CAMERA,
+    CONF_UPDATE_FREQUENCY,
+    CONF_AI_TASK,
+    CONF_AUTO_NOTIFICATIONS,
+    CONF_NOTIFICATION_FORMAT,
+    CONF_LAST_WATER_CHANGE,
+    CONF_WATER_CHANGE_FREQUENCY,
+    CONF_RUN_ANALYSIS_ON_STARTUP,
+    CONF_ANALYZE_TEMPERATURE,
+    CONF_ANALYZE_PH,
+    CONF_ANALYZE_SALINITY,
+    CONF_ANALYZE_DISSOLVED_OXYGEN,
+    CONF_ANALYZE_WATER_LEVEL,
+    CONF_ANALYZE_ORP,
+    CONF_SKIP_UNCHANGED_ANALYSIS,
+    CONF_MAX_ANALYSIS_AGE,
+    CONF_ANALYSIS_MODE,
+    CONF_TWO_PHASE_ANALYSIS,
+    CONF_INCREMENTAL_ANALYSIS,
+    CONF_RESPONSE_CACHE_TTL,
+    CONF_SHARE_RESPONSE_CACHE,
+    CONF_ANALYSIS_DEADLINE,
+    CONF_OVERLAP_POLICY,
+    CONF_ADAPTIVE_CADENCE,
+    CONF_MIN_ANALYSIS_INTERVAL,
+    CONF_MAX_ANALYSIS_INTERVAL,
+    CONF_ANALYZE_ON_STATUS_CHANGE,
+    CONF_STATUS_CHANGE_DEBOUNCE,
+    CONF_MIN_ANALYSIS_SPACING,
+    CONF_MAX_TRIGGERED_ANALYSES,
+    CONF_CRITICAL_ALERTS,
+    CONF_HISTORY_SIZE,
+    CONF_HISTORY_MAX_AGE,
+    DEFAULT_FREQUENCY,
+    DEFAULT_AUTO_NOTIFICATIONS,
+    DEFAULT_NOTIFICATION_FORMAT,
+    DEFAULT_RUN_ANALYSIS_ON_STARTUP,
+    DEFAULT_WATER_CHANGE_FREQUENCY,
+    DEFAULT_ANALYZE_TEMPERATURE,
+    DEFAULT_ANALYZE_PH,
+    DEFAULT_ANALYZE_SALINITY,
+    DEFAULT_ANALYZE_DISSOLVED_OXYGEN,
+    DEFAULT_ANALYZE_WATER_LEVEL,
+    DEFAULT_ANALYZE_ORP,
+    DEFAULT_SKIP_UNCHANGED_ANALYSIS,
+    DEFAULT_MAX_ANALYSIS_AGE,
+    DEFAULT_ANALYSIS_MODE,
+    DEFAULT_TWO_PHASE_ANALYSIS,
+    DEFAULT_INCREMENTAL_ANALYSIS,
+    DEFAULT_RESPONSE_CACHE_TTL,
+    DEFAULT_SHARE_RESPONSE_CACHE,
+    DEFAULT_ANALYSIS_DEADLINE,
+    DEFAULT_OVERLAP_POLICY,
+    DEFAULT_ADAPTIVE_CADENCE,
+    DEFAULT_MIN_ANALYSIS_INTERVAL,
+    DEFAULT_MAX_ANALYSIS_INTERVAL,
+    DEFAULT_ANALYZE_ON_STATUS_CHANGE,
+    DEFAULT_STATUS_CHANGE_DEBOUNCE,
+    DEFAULT_MIN_ANALYSIS_SPACING,
+    DEFAULT_MAX_TRIGGERED_ANALYSES,
+    DEFAULT_CRITICAL_ALERTS,
+    ANALYSIS_MODE_LOCAL,
+    TRIGGERED_ANALYSES_WINDOW,
+    CRITICAL_ALERT_COOLDOWN,
+    RESPONSE_CACHE_SIZE,
+    DATA_SHARED_RESPONSE_CACHE,
+    AI_TASK_MAX_ATTEMPTS,
+    AI_TASK_RETRY_BASE_DELAY,
+    AI_TASK_RETRY_MAX_DELAY,
+    DEFAULT_HISTORY_SIZE,
+    DEFAULT_HISTORY_MAX_AGE,
+    CHANGE_TOLERANCES,
+    UPDATE_FREQUENCIES,
+)
+from .analysis_plan import AnalysisPlan, get_parameter_keys
+from .cadence import AdaptiveCadence
+from .circuit_breaker import (
+    AITaskUnavailableError,
+    STATE_OPEN,
+    CONFIGURATION_ERRORS,
+    TRANSIENT_ERRORS,
+    get_circuit_breaker,
+)
+from .classifier import ParameterClassifier
+from .history import AnalysisHistory
+from .local_analysis import LocalAnalyzer
+from .response_cache import ResponseCache, build_cache_key, quantize_reading
+from .scheduler import get_analysis_scheduler, get_phase_offset
+from .helpers import PROBLEM_STATUSES, StatusSnapshot, build_status_snapshot, get_sensor_icon, get_sensor_info
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class AquariumAnalysisResult:
+    """Latest analysis results for one aquarium."""
+    
+    # Brief analysis texts used as sensor states, keyed by structure key
+    sensor_analysis: dict = field(default_factory=dict)
+    # Sensor readings (as returned by get_sensor_info) the analysis was based on
+    sensor_data: list = field(default_factory=list)
+    last_update: Optional[datetime] = None
+    # Parameter statuses and summary for sensor_data
+    status: StatusSnapshot = field(default_factory=StatusSnapshot)
+    # Full parsed AI response, including the detailed notification fields
+    ai_data: Optional[dict] = None
+    # Readings and statuses used for change detection, see _build_analysis_snapshot
+    snapshot: Optional[dict] = None
+    # Duration in seconds of each AI call of the analysis, keyed by phase
+    timings: dict = field(default_factory=dict)
+    # Parameter analysis keys carried over unchanged from the previous result
+    carried_over: tuple = ()
+
+
+async def _send_notification_if_enabled(hass, auto_notifications, title, message, notification_id, tank_name, log_msg_type="analysis"):
+    """Send notification only if auto-notifications is enabled."""
+    if auto_notifications:
+        await hass.services.async_call(
+            "persistent_notification",
+            "create",
+            {
+                "title": title,
+                "message": message,
+                "notification_id": notification_id,
+            },
+        )
+        _LOGGER.info("Sent %s notification for %s", log_msg_type, tank_name)
+    else:
+        _LOGGER.debug("%s completed for %s (notifications disabled)", log_msg_type.title(), tank_name)
+
+
+def _build_analysis_snapshot(sensor_data, status, last_water_change_state=None):
+    """Capture the readings and statuses an analysis is based on."""
+    return {
+        "readings": {
+            info['name']: {
+                "raw_value": info['raw_value'],
+                "unit": info['unit'],
+                "status": status.statuses[info['name']],
+            }
+            for info in sensor_data
+        },
+        "last_water_change": last_water_change_state,
+    }
+
+
+def _get_snapshot_change(previous, current, tolerances):
+    """Describe the first material change between two analysis snapshots.
+    
+    Tolerances are percentages of the previously analyzed value, keyed by parameter name.
+    Returns None when every parameter kept its status and stayed within its tolerance.
+    """
+    if previous["readings"].keys() != current["readings"].keys():
+        return "monitored parameters changed"
+    if previous["last_water_change"] != current["last_water_change"]:
+        return "last water change updated"
+    
+    for sensor_name, reading in current["readings"].items():
+        change = _get_reading_change(
+            sensor_name, previous["readings"][sensor_name], reading, tolerances.get(sensor_name, 0.0)
+        )
+        if change:
+            return change
+    
+    return None
+
+
+def _get_reading_change(sensor_name, previous_reading, reading, tolerance):
+    """Describe a material change of one snapshot reading, or return None.
+    
+    The tolerance is a percentage of the previously analyzed value.
+    """
+    if reading["status"] != previous_reading["status"]:
+        return f"{sensor_name} status changed from {previous_reading['status']} to {reading['status']}"
+    if reading["unit"] != previous_reading["unit"]:
+        return f"{sensor_name} unit changed"
+    
+    try:
+        value = float(reading["raw_value"])
+        previous_value = float(previous_reading["raw_value"])
+    except (ValueError, TypeError):
+        # Non-numeric states (like "Normal") only count as changed when they differ
+        if reading["raw_value"] != previous_reading["raw_value"]:
+            return f"{sensor_name} changed from {previous_reading['raw_value']} to {reading['raw_value']}"
+        return None
+    
+    if abs(value - previous_value) > abs(previous_value) * tolerance / 100:
+        return f"{sensor_name} moved from {previous_value} to {value}"
+    return None
+
+
+def _build_notification_message(notification_format, sensor_data, status, response):
+    """Build notification message based on the selected format."""
+    message_parts = []
+    
+    # Add overall status at the top for all formats
+    message_parts.append(f"📋 {status.overall_message}")
+    message_parts.append("")  # Add blank line
+    
+    if notification_format == "minimal":
+        # Minimal format: Only parameter values and overall analysis
+        for info in sensor_data:
+            icon = get_sensor_icon(info['name'])
+            message_parts.append(f"{icon} {info['name']}: {info['value']}")
+        
+        # Add water change recommendation before overall analysis
+        if response and "data" in response:
+            ai_data = response["data"]
+            if "water_change_recommendation" in ai_data:
+                message_parts.append(f"\n💧 Water Change:\n{ai_data['water_change_recommendation']}")
+            
+            # Add camera visual analysis if available
+            if "camera_visual_notification_analysis" in ai_data:
+                message_parts.append(f"\n📷 Camera Analysis:\n{ai_data['camera_visual_notification_analysis']}")
+            
+            # Add overall analysis
+            if "overall_notification_analysis" in ai_data:
+                message_parts.append(f"\n🎯 Overall Assessment:\n{ai_data['overall_notification_analysis']}")
+        else:
+            message_parts.append("\nNo analysis available")
+            
+    elif notification_format == "condensed":
+        # Condensed format: Parameter values + brief sensor analysis + overall analysis
+        for info in sensor_data:
+            icon = get_sensor_icon(info['name'])
+            message_parts.append(f"{icon} {info['name']}: {info['value']}")
+        
+        message_parts.append("\n🤖 AI Analysis:")
+        
+        if response and "data" in response:
+            ai_data = response["data"]
+            
+            # Use brief sensor analysis (same as used for sensors)
+            # Only iterate over sensors that were actually analyzed (in sensor_data)
+            for info in sensor_data:
+                sensor_name = info['name']
+                analysis_key = sensor_name.lower().replace(" ", "_") + "_analysis"
+                if analysis_key in ai_data:
+                    icon = get_sensor_icon(sensor_name)
+                    message_parts.append(f"\n{icon} {sensor_name} ({status.statuses[sensor_name]}): {ai_data[analysis_key]}")
+            
+            # Add water change recommendation before overall analysis
+            if "water_change_recommendation" in ai_data:
+                message_parts.append(f"\n💧 Water Change: {ai_data['water_change_recommendation']}")
+            
+            # Add camera visual analysis if available (brief version for condensed)
+            if "camera_visual_analysis" in ai_data:
+                message_parts.append(f"\n📷 Camera Analysis: {ai_data['camera_visual_analysis']}")
+            
+            # Add overall brief analysis (same as used for sensors)
+            if "overall_analysis" in ai_data:
+                message_parts.append(f"\n🎯 Overall Assessment: {ai_data['overall_analysis']}")
+        else:
+            message_parts.append("No analysis available")
+            
+    else:  # "detailed" - current full format
+        # Add sensor readings with icons
+        for info in sensor_data:
+            icon = get_sensor_icon(info['name'])
+            message_parts.append(f"{icon} {info['name']}: {info['value']}")
+        
+        message_parts.append("\n🤖 AI Analysis:")
+        
+        if response and "data" in response:
+            ai_data = response["data"]
+            
+            # Use detailed notification analysis for notifications
+            # Only iterate over sensors that were actually analyzed (in sensor_data)
+            for info in sensor_data:
+                sensor_name = info['name']
+                notification_key = sensor_name.lower().replace(" ", "_") + "_notification_analysis"
+                if notification_key in ai_data:
+                    icon = get_sensor_icon(sensor_name)
+                    message_parts.append(f"\n{icon} {sensor_name} ({status.statuses[sensor_name]}):\n{ai_data[notification_key]}")
+            
+            # Add water change recommendation before overall analysis
+            if "water_change_recommendation" in ai_data:
+                message_parts.append(f"\n💧 Water Change:\n{ai_data['water_change_recommendation']}")
+            
+            # Add camera visual analysis if available (detailed version)
+            if "camera_visual_notification_analysis" in ai_data:
+                message_parts.append(f"\n📷 Camera Analysis:\n{ai_data['camera_visual_notification_analysis']}")
+            
+            # Add overall detailed analysis
+            if "overall_notification_analysis" in ai_data:
+                message_parts.append(f"\n🎯 Overall Assessment:\n{ai_data['overall_notification_analysis']}")
+        else:
+            message_parts.append("No analysis available")
+    
+    return "\n".join(message_parts)
+
+
+class AquariumAICoordinator(DataUpdateCoordinator[AquariumAnalysisResult]):
+    """Own the scheduling, in-flight AI call and latest results for one aquarium."""
+    
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Initialize the coordinator from the config entry."""
+        super().__init__(hass, _LOGGER, name=f"{DOMAIN} {entry.data[CONF_TANK_NAME]}")
+        self.entry = entry
+        self.tank_name = entry.data[CONF_TANK_NAME]
+        self.aquarium_type = entry.data[CONF_AQUARIUM_TYPE]
+        self.camera = entry.data.get(CONF_CAMERA)
+        self.ai_task = entry.data.get(CONF_AI_TASK)
+        self.auto_notifications = entry.data.get(CONF_AUTO_NOTIFICATIONS, DEFAULT_AUTO_NOTIFICATIONS)
+        self.notification_format = entry.data.get(CONF_NOTIFICATION_FORMAT, DEFAULT_NOTIFICATION_FORMAT)
+        self.last_water_change = entry.data.get(CONF_LAST_WATER_CHANGE, "")
+        frequency_key = entry.data.get(CONF_UPDATE_FREQUENCY, DEFAULT_FREQUENCY)
+        self.frequency_minutes = UPDATE_FREQUENCIES.get(frequency_key, 60)
+        
+        # Prompt, structure and enabled parameters, compiled once from the configuration
+        self.plan = AnalysisPlan(entry)
+        
+        # Get run_analysis_on_startup setting, default to False
+        self.run_analysis_on_startup = entry.data.get(CONF_RUN_ANALYSIS_ON_STARTUP, DEFAULT_RUN_ANALYSIS_ON_STARTUP)
+        
+        # Change detection settings for skipping scheduled AI calls when readings are stable
+        self.skip_unchanged_analysis = entry.data.get(CONF_SKIP_UNCHANGED_ANALYSIS, DEFAULT_SKIP_UNCHANGED_ANALYSIS)
+        self.max_analysis_age = entry.data.get(CONF_MAX_ANALYSIS_AGE, DEFAULT_MAX_ANALYSIS_AGE)
+        self.change_tolerances = {
+            sensor_name: entry.data.get(tolerance_conf, default_tolerance)
+            for sensor_name, (tolerance_conf, default_tolerance) in CHANGE_TOLERANCES.items()
+        }
+        
+        # Write the analysis with the AI Task or with the local rule based analysis
+        self.analysis_mode = entry.data.get(CONF_ANALYSIS_MODE, DEFAULT_ANALYSIS_MODE)
+        # Ask for the brief fields first and the detailed fields in a second call
+        self.two_phase_analysis = entry.data.get(CONF_TWO_PHASE_ANALYSIS, DEFAULT_TWO_PHASE_ANALYSIS)
+        # Only ask for the parameters that changed since they were last analyzed
+        self.incremental_analysis = entry.data.get(CONF_INCREMENTAL_ANALYSIS, DEFAULT_INCREMENTAL_ANALYSIS)
+        
+        # Define sensor mappings with their analysis toggle configurations
+        # Format: (sensor_entity, sensor_name, analyze_config_key, default_analyze_value)
+        self.sensor_mappings = [
+            (entry.data.get(CONF_TEMPERATURE_SENSOR), "Temperature", CONF_ANALYZE_TEMPERATURE, DEFAULT_ANALYZE_TEMPERATURE),
+            (entry.data.get(CONF_PH_SENSOR), "pH", CONF_ANALYZE_PH, DEFAULT_ANALYZE_PH),
+            (entry.data.get(CONF_SALINITY_SENSOR), "Salinity", CONF_ANALYZE_SALINITY, DEFAULT_ANALYZE_SALINITY),
+            (entry.data.get(CONF_DISSOLVED_OXYGEN_SENSOR), "Dissolved Oxygen", CONF_ANALYZE_DISSOLVED_OXYGEN, DEFAULT_ANALYZE_DISSOLVED_OXYGEN),
+            (entry.data.get(CONF_WATER_LEVEL_SENSOR), "Water Level", CONF_ANALYZE_WATER_LEVEL, DEFAULT_ANALYZE_WATER_LEVEL),
+            (entry.data.get(CONF_ORP_SENSOR), "ORP", CONF_ANALYZE_ORP, DEFAULT_ANALYZE_ORP),
+        ]
+        
+        # Cache of AI responses by quantized conditions, for this aquarium or shared
+        # by all aquariums using it
+        self.response_cache_ttl = int(entry.data.get(CONF_RESPONSE_CACHE_TTL, DEFAULT_RESPONSE_CACHE_TTL)) * 60
+        self.response_cache = None
+        if self.response_cache_ttl:
+            if entry.data.get(CONF_SHARE_RESPONSE_CACHE, DEFAULT_SHARE_RESPONSE_CACHE):
+                self.response_cache = hass.data.setdefault(
+                    DATA_SHARED_RESPONSE_CACHE, ResponseCache(RESPONSE_CACHE_SIZE)
+                )
+            else:
+                self.response_cache = ResponseCache(RESPONSE_CACHE_SIZE)
+        
+        # Time budget of a whole analysis run (readings, AI calls and notification)
+        self.analysis_deadline = int(entry.data.get(CONF_ANALYSIS_DEADLINE, DEFAULT_ANALYSIS_DEADLINE))
+        self.timed_out_runs = 0
+        self.last_timeout = None
+        
+        # What a scheduled tick does while the previous analysis is still running
+        self.overlap_policy = entry.data.get(CONF_OVERLAP_POLICY, DEFAULT_OVERLAP_POLICY)
+        self.overrun_ticks = 0
+        self.skipped_ticks = 0
+        self.cancelled_runs = 0
+        
+        # Phase offsets, startup stagger and AI call limit shared by all aquariums
+        self.scheduler = get_analysis_scheduler(hass)
+        
+        # Interval of the automatic analyses, adapted to the health of the tank in
+        # adaptive mode (None in manual analysis only mode)
+        self.cadence = None
+        if self.frequency_minutes is not None:
+            self.cadence = AdaptiveCadence(
+                self.frequency_minutes,
+                int(entry.data.get(CONF_MIN_ANALYSIS_INTERVAL, DEFAULT_MIN_ANALYSIS_INTERVAL)),
+                int(entry.data.get(CONF_MAX_ANALYSIS_INTERVAL, DEFAULT_MAX_ANALYSIS_INTERVAL)),
+                entry.data.get(CONF_ADAPTIVE_CADENCE, DEFAULT_ADAPTIVE_CADENCE),
+            )
+        # Readings the cadence last saw change, see _async_update_cadence
+        self._cadence_readings = {}
+        self._unsub_schedule = None
+        
+        # Analyses triggered by a parameter crossing into another status band
+        self.analyze_on_status_change = entry.data.get(CONF_ANALYZE_ON_STATUS_CHANGE, DEFAULT_ANALYZE_ON_STATUS_CHANGE)
+        self.status_change_debounce = int(entry.data.get(CONF_STATUS_CHANGE_DEBOUNCE, DEFAULT_STATUS_CHANGE_DEBOUNCE))
+        self.min_analysis_spacing = int(entry.data.get(CONF_MIN_ANALYSIS_SPACING, DEFAULT_MIN_ANALYSIS_SPACING)) * 60
+        self.max_triggered_analyses = int(entry.data.get(CONF_MAX_TRIGGERED_ANALYSES, DEFAULT_MAX_TRIGGERED_ANALYSES))
+        self.triggered_analyses = 0
+        self.deferred_triggers = 0
+        # Monotonic start times of the recent triggered analyses and of the last analysis
+        self._triggered_times = deque()
+        self._last_analysis_start = None
+        self._unsub_trigger = None
+        
+        # Immediate local alerts when a parameter enters a problem status
+        self.critical_alerts = entry.data.get(CONF_CRITICAL_ALERTS, DEFAULT_CRITICAL_ALERTS)
+        self.sent_critical_alerts = 0
+        # Monotonic time of the last alert per parameter
+        self._critical_alert_times = {}
+        
+        # Failures of the AI Task entity, shared by all aquariums using it
+        self.circuit_breaker = get_circuit_breaker(hass, self.ai_task)
+        
+        # Bounded in-memory history of the published results
+        self.history = AnalysisHistory(
+            int(entry.data.get(CONF_HISTORY_SIZE, DEFAULT_HISTORY_SIZE)),
+            int(entry.data.get(CONF_HISTORY_MAX_AGE, DEFAULT_HISTORY_MAX_AGE)) * 86400,
+        )
+        
+        # Status ranges for this aquarium type, compiled once
+        self.classifier = ParameterClassifier(self.aquarium_type)
+        # Analysis from the same ranges, used in local mode and when the AI is unavailable
+        self.local_analyzer = LocalAnalyzer(
+            self.classifier,
+            entry.data.get(CONF_WATER_CHANGE_FREQUENCY, DEFAULT_WATER_CHANGE_FREQUENCY),
+            self.change_tolerances,
+        )
+        
+        # Live readings of every configured source sensor and their statuses, keyed by
+        # parameter name. Each status is computed once, when its source sensor changes.
+        self.readings = {}
+        self.reading_statuses = {}
+        # Live readings of the parameters enabled for analysis, with their status summary
+        self.live_sensor_data = []
+        self.live_status = build_status_snapshot([], self.aquarium_type)
+        
+        self.data = AquariumAnalysisResult(status=self.live_status)
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY.format(entry.entry_id))
+        self._save_pending = False
+        self._analysis_task = None
+        # AI data the running analysis already published, kept when its deadline expires later
+        self._run_ai_data = None
+        # Deadlines of the running analysis and its callers, paused while waiting for an AI call slot
+        self._run_deadlines = []
+        self._analysis_scheduled = False
+        self._queued_task = None
+        self._unsub_listeners = []
+    
+    async def async_load(self) -> None:
+        """Restore the latest analysis stored before the last restart or reload."""
+        stored = await self._store.async_load()
+        if not stored:
+            return
+        
+        try:
+            sensor_data = stored["sensor_data"]
+            snapshot = stored.get("snapshot")
+            if snapshot:
+                snapshot = {**snapshot, "analyzed_at": dt_util.parse_datetime(snapshot["analyzed_at"])}
+            last_update = stored.get("last_update")
+            self.data = AquariumAnalysisResult(
+                sensor_analysis=stored["sensor_analysis"],
+                sensor_data=sensor_data,
+                status=build_status_snapshot(
+                    sensor_data, self.aquarium_type, self.classifier.classify_all(sensor_data)
+                ),
+                last_update=dt_util.parse_datetime(last_update) if last_update else None,
+                ai_data=stored.get("ai_data"),
+                snapshot=snapshot,
+                carried_over=tuple(stored.get("carried_over", ())),
+            )
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.warning("Ignoring invalid stored analysis for %s: %s", self.tank_name, err)
+            return
+        
+        _LOGGER.debug("Restored stored analysis for %s from %s", self.tank_name, self.data.last_update)
+    
+    @callback
+    def _data_to_store(self) -> dict:
+        """Return the latest analysis in a JSON serializable form."""
+        self._save_pending = False
+        data = self.data
+        snapshot = data.snapshot
+        if snapshot:
+            snapshot = {**snapshot, "analyzed_at": snapshot["analyzed_at"].isoformat()}
+        return {
+            "sensor_analysis": data.sensor_analysis,
+            "sensor_data": data.sensor_data,
+            "last_update": data.last_update.isoformat() if data.last_update else None,
+            "ai_data": data.ai_data,
+            "snapshot": snapshot,
+            "carried_over": list(data.carried_over),
+        }
+    
+    @callback
+    def async_set_updated_data(self, data: AquariumAnalysisResult) -> None:
+        """Publish a new result to the entities, record it and schedule saving it."""
+        self.history.append(dt_util.utcnow(), data.sensor_data, data.status.statuses, data.sensor_analysis)
+        super().async_set_updated_data(data)
+        self._async_schedule_save()
+    
+    @callback
+    def _async_update_result(self, **changes) -> None:
+        """Amend the published result (e.g. with detailed texts) without recording it again."""
+        self.data = replace(self.data, **changes)
+        self.async_update_listeners()
+        self._async_schedule_save()
+    
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Save the latest result after a short delay, batching quick updates."""
+        self._save_pending = True
+        self._store.async_delay_save(self._data_to_store, STORAGE_SAVE_DELAY)
+    
+    def _is_stored_analysis_fresh(self) -> bool:
+        """Return True if the restored AI analysis is newer than one update interval."""
+        snapshot = self.data.snapshot
+        if not self._is_own_snapshot(snapshot) or not self.data.sensor_analysis or self.frequency_minutes is None:
+            return False
+        return dt_util.utcnow() - snapshot["analyzed_at"] < timedelta(minutes=self.frequency_minutes)
+    
+    def _is_own_snapshot(self, snapshot) -> bool:
+        """Return True if an analysis snapshot was written in the current analysis mode.
+        
+        Local analyses are never reused as AI analyses and the other way around.
+        Snapshots stored before the mode was recorded come from the AI.
+        """
+        return bool(snapshot) and snapshot.get("source", DEFAULT_ANALYSIS_MODE) == self.analysis_mode
+    
+    @callback
+    def _async_update_reading(self, sensor_entity, sensor_name) -> None:
+        """Refresh the reading and status of one source sensor."""
+        sensor_info = get_sensor_info(self.hass, sensor_entity, sensor_name)
+        self.readings[sensor_name] = sensor_info
+        if sensor_info:
+            self.reading_statuses[sensor_name] = self.classifier.classify(
+                sensor_info['name'], sensor_info['raw_value'], sensor_info['unit']
+            )
+        else:
+            self.reading_statuses.pop(sensor_name, None)
+    
+    @callback
+    def _async_update_live_status(self) -> None:
+        """Summarize the live readings of the parameters enabled for analysis."""
+        self.live_sensor_data = [
+            self.readings[sensor_name]
+            for sensor_name in self.plan.parameters
+            if self.readings.get(sensor_name)
+        ]
+        self.live_status = build_status_snapshot(
+            self.live_sensor_data, self.aquarium_type, self.reading_statuses
+        )
+    
+    @callback
+    def async_start(self) -> None:
+        """Start tracking source sensors and schedule the automatic analyses."""
+        source_entities = {}
+        for sensor_entity, sensor_name, _, _ in self.sensor_mappings:
+            if sensor_entity:
+                source_entities[sensor_entity] = sensor_name
+                self._async_update_reading(sensor_entity, sensor_name)
+        self._async_update_live_status()
+        
+        if source_entities:
+            @callback
+            def _async_source_changed(event):
+                """Refresh the reading of a changed source sensor and update the entities."""
+                sensor_entity = event.data["entity_id"]
+                sensor_name = source_entities[sensor_entity]
+                previous_status = self.reading_statuses.get(sensor_name)
+                self._async_update_reading(sensor_entity, sensor_name)
+                self._async_update_live_status()
+                self.async_update_listeners()
+                
+                status = self.reading_statuses.get(sensor_name)
+                if status is None or status == previous_status or sensor_name not in self.plan.parameters:
+                    return
+                
+                # Alert right away, the AI analysis replaces the notification later. Only
+                # a reading leaving a good or OK status counts, not a sensor that comes
+                # back from unavailable (like after a restart) already out of range.
+                if (
+                    self.critical_alerts
+                    and status in PROBLEM_STATUSES
+                    and previous_status in ("Good", "OK")
+                ):
+                    self._async_send_critical_alert(sensor_name, status)
+                
+                if self.analyze_on_status_change:
+                    # Wait until the new status holds for the debounce window
+                    _LOGGER.debug(
+                        "%s of %s changed from %s to %s", sensor_name, self.tank_name, previous_status, status
+                    )
+                    self._async_schedule_trigger(self.status_change_debounce)
+            
+            self._unsub_listeners.append(
+                async_track_state_change_event(self.hass, list(source_entities), _async_source_changed)
+            )
+        
+        # Only schedule automatic analysis if frequency is not "never"
+        if self.frequency_minutes is None:
+            _LOGGER.info("Manual analysis only mode enabled for %s", self.tank_name)
+            return
+        
+        # Run initial analysis after 60 seconds only if run_analysis_on_startup is enabled
+        # and the analysis restored from storage is not recent enough to keep
+        if self.run_analysis_on_startup and self._is_stored_analysis_fresh():
+            _LOGGER.info(
+                "Stored analysis for %s is from %s - skipping startup analysis",
+                self.tank_name, self.data.snapshot["analyzed_at"]
+            )
+        elif self.run_analysis_on_startup:
+            # Staggered so aquariums set up together do not call the AI at the same time
+            startup_delay = self.scheduler.startup_delay()
+            self._unsub_listeners.append(
+                async_call_later(self.hass, startup_delay, self._async_startup_analysis)
+            )
+            _LOGGER.info("Startup analysis enabled for %s - will run in %d seconds", self.tank_name, startup_delay)
+        else:
+            _LOGGER.info("Startup analysis disabled for %s - skipping initial analysis", self.tank_name)
+        
+        # Schedule AI analyses based on configured frequency
+        self._async_schedule_analyses()
+    
+    @callback
+    def _async_schedule_analyses(self) -> None:
+        """Schedule the automatic analyses at the current cadence interval.
+        
+        Runs use a stable phase offset per aquarium so aquariums with the same
+        interval do not run together.
+        """
+        if self._unsub_schedule:
+            self._unsub_schedule()
+        interval = timedelta(minutes=self.cadence.interval)
+        self._unsub_schedule = self.scheduler.async_track_interval(
+            self.entry.entry_id, interval, self.async_run_analysis
+        )
+        _LOGGER.info(
+            "Scheduled automatic analysis every %d minutes for %s (phase offset %d seconds)",
+            self.cadence.interval, self.tank_name, get_phase_offset(self.entry.entry_id, interval)
+        )
+    
+    @callback
+    def _async_send_critical_alert(self, sensor_name, status) -> None:
+        """Notify about a parameter that entered a problem status, without waiting for the AI.
+        
+        The alert has its own notification ID, so it never replaces the last analysis
+        notification; a newer alert of this aquarium replaces it.
+        """
+        if not self.auto_notifications:
+            _LOGGER.debug("Critical alert for %s not sent (notifications disabled)", self.tank_name)
+            return
+        
+        current_time = time.monotonic()
+        last_alert = self._critical_alert_times.get(sensor_name)
+        if last_alert is not None and current_time - last_alert < CRITICAL_ALERT_COOLDOWN:
+            return
+        # Hold the cooldown while the alert is sent, it is released again if sending fails
+        self._critical_alert_times[sensor_name] = current_time
+        
+        reading = self.readings[sensor_name]
+        _LOGGER.warning("%s of %s is %s (%s)", sensor_name, self.tank_name, status, reading['value'])
+        message_parts = [
+            f"🚨 {get_sensor_icon(sensor_name)} {sensor_name} is {status}: {reading['value']}",
+            "",
+            f"📋 {self.live_status.overall_message}",
+            "",
+        ]
+        for sensor_info in self.live_sensor_data:
+            message_parts.append(
+                f"{get_sensor_icon(sensor_info['name'])} {sensor_info['name']}: {sensor_info['value']}"
+                f" ({self.reading_statuses.get(sensor_info['name'], 'Unknown')})"
+            )
+        message_parts.append("\n(Immediate alert from the sensor readings, the next analysis notification has the details)")
+        
+        self.hass.async_create_task(
+            self._async_deliver_critical_alert(sensor_name, "\n".join(message_parts), last_alert)
+        )
+    
+    async def _async_deliver_critical_alert(self, sensor_name, message, last_alert) -> None:
+        """Send a critical alert, counting it only once the notification went out."""
+        try:
+            await _send_notification_if_enabled(
+                self.hass,
+                self.auto_notifications,
+                f"🚨 {self.tank_name} Aquarium Alert",
+                message,
+                f"aquarium_ai_{self.entry.entry_id}_alert",
+                self.tank_name,
+                "critical alert"
+            )
+        except Exception as err:
+            _LOGGER.error("Error sending critical alert for %s: %s", self.tank_name, err)
+            if last_alert is None:
+                self._critical_alert_times.pop(sensor_name, None)
+            else:
+                self._critical_alert_times[sensor_name] = last_alert
+            return
+        self.sent_critical_alerts += 1
+    
+    @callback
+    def _async_schedule_trigger(self, delay) -> None:
+        """(Re)schedule the check for a status triggered analysis after delay seconds."""
+        if self._unsub_trigger:
+            self._unsub_trigger()
+        self._unsub_trigger = async_call_later(self.hass, delay, self._async_trigger_analysis)
+    
+    async def _async_trigger_analysis(self, now) -> None:
+        """Analyze when parameters settled in another status band than the last analysis.
+        
+        Triggered analyses keep the minimum spacing after any analysis and are rate
+        limited per tank; a trigger that has to wait is deferred, not dropped.
+        """
+        self._unsub_trigger = None
+        analyzed_statuses = self.data.status.statuses
+        crossed = [
+            sensor_name for sensor_name in self.plan.parameters
+            if sensor_name in self.reading_statuses
+            and self.reading_statuses[sensor_name] != analyzed_statuses.get(sensor_name)
+        ]
+        if not crossed:
+            _LOGGER.debug("Statuses of %s settled back to the analyzed ones", self.tank_name)
+            return
+        
+        current_time = time.monotonic()
+        wait = 0
+        if self._last_analysis_start is not None:
+            wait = self._last_analysis_start + self.min_analysis_spacing - current_time
+        while self._triggered_times and self._triggered_times[0] <= current_time - TRIGGERED_ANALYSES_WINDOW:
+            self._triggered_times.popleft()
+        if len(self._triggered_times) >= self.max_triggered_analyses:
+            wait = max(wait, self._triggered_times[0] + TRIGGERED_ANALYSES_WINDOW - current_time)
+        if wait > 0:
+            self.deferred_triggers += 1
+            _LOGGER.info(
+                "Status change of %s in %s, analysis deferred by %d seconds (spacing and rate limit)",
+                ", ".join(crossed), self.tank_name, wait
+            )
+            self._async_schedule_trigger(wait)
+            return
+        
+        self._triggered_times.append(current_time)
+        self.triggered_analyses += 1
+        _LOGGER.info("Status change of %s in %s, running an analysis", ", ".join(crossed), self.tank_name)
+        await self.async_run_analysis(now)
+    
+    @callback
+    def _async_update_cadence(self) -> None:
+        """Adapt the interval of the automatic analyses to the latest result."""
+        if self.cadence is None:
+            return
+        
+        # A parameter counts as changed when it moved beyond its tolerance (or changed
+        # status) since the cadence last saw it change, so slow drift adds up
+        result = self.data
+        changed_parameters = []
+        for info in result.sensor_data:
+            sensor_name = info['name']
+            reading = {
+                "raw_value": info['raw_value'],
+                "unit": info['unit'],
+                "status": result.status.statuses.get(sensor_name),
+            }
+            previous_reading = self._cadence_readings.get(sensor_name)
+            if previous_reading is None:
+                self._cadence_readings[sensor_name] = reading
+            elif _get_reading_change(
+                sensor_name, previous_reading, reading, self.change_tolerances.get(sensor_name, 0.0)
+            ):
+                changed_parameters.append(sensor_name)
+                self._cadence_readings[sensor_name] = reading
+        
+        if self.cadence.update(result.status.statuses, changed_parameters):
+            _LOGGER.info(
+                "Analysis interval for %s adapted to %d minutes: %s",
+                self.tank_name, self.cadence.interval, self.cadence.reason
+            )
+            if self._unsub_schedule:
+                self._async_schedule_analyses()
+        self.async_update_listeners()
+    
+    async def async_shutdown(self) -> None:
+        """Stop all timers and state listeners of this coordinator."""
+        await super().async_shutdown()
+        while self._unsub_listeners:
+            self._unsub_listeners.pop()()
+        if self._unsub_schedule:
+            self._unsub_schedule()
+            self._unsub_schedule = None
+        if self._unsub_trigger:
+            self._unsub_trigger()
+            self._unsub_trigger = None
+        
+        # Cancel the in-flight and queued analyses, their callers get None
+        tasks = [
+            task for task in (self._queued_task, self._analysis_task)
+            if task is not None and not task.done()
+        ]
+        if tasks:
+            _LOGGER.debug("Cancelling the running analysis for %s", self.tank_name)
+            for task in tasks:
+                task.cancel()
+            await asyncio.wait(tasks)
+        
+        # Write a pending result now so a reload picks it up
+        if self._save_pending:
+            await self._store.async_save(self._data_to_store())
+    
+    
+    async def _async_update_data(self) -> AquariumAnalysisResult:
+        """Return the current result.
+        
+        AI calls are expensive, so a plain refresh (e.g. homeassistant.update_entity)
+        only re-publishes the stored result. Analyses run through async_run_analysis.
+        """
+        return self.data
+    
+    async def _async_startup_analysis(self, now) -> None:
+        """Run initial AI analysis after HA is fully started."""
+        _LOGGER.info("Running delayed startup AI analysis for %s", self.tank_name)
+        await self.async_run_analysis(None)
+    
+    async def async_run_analysis(self, now=None, override_notification=None, deadline=None):
+        """Run the analysis, joining the in-flight run for this aquarium if there is one.
+        
+        Scheduled ticks, the startup run, the Run Analysis button and both services
+        all go through here, so overlapping callers share a single AI call and its
+        result instead of racing each other to publish results. A scheduled tick
+        that finds an analysis still running is handled by the overlap policy.
+        
+        A caller's deadline (an asyncio.Timeout) is paused like the analysis
+        deadline while the analysis waits for a shared AI call slot.
+        """
+        if deadline is not None:
+            self._run_deadlines.append(deadline)
+        try:
+            task = self._analysis_task
+            if task is not None and not task.done():
+                if now is not None:
+                    return await self._async_overlapping_tick(task, now)
+                _LOGGER.debug("Analysis already in progress for %s, joining the running analysis", self.tank_name)
+                # A manual caller now waits for this run, so the overlap policy must not cancel it
+                self._analysis_scheduled = False
+            else:
+                task = self._async_start_analysis(now, override_notification)
+            return await self._async_join(task)
+        finally:
+            if deadline is not None:
+                self._run_deadlines.remove(deadline)
+    
+    def _async_start_analysis(self, now, override_notification=None):
+        """Start an analysis run as the in-flight run of this aquarium."""
+        task = self.hass.async_create_task(self._async_analyze(now, override_notification))
+        self._analysis_task = task
+        self._analysis_scheduled = now is not None
+        self._last_analysis_start = time.monotonic()
+        return task
+    
+    async def _async_join(self, task):
+        """Wait for a run and return its result, or None when the run was cancelled."""
+        # Shield the shared run so a caller giving up (e.g. a service timeout)
+        # does not cancel it for everybody else waiting on the same result
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            # The run itself was cancelled (the entry is unloading), not this caller
+            if task.cancelled() and not asyncio.current_task().cancelling():
+                return None
+            raise
+    
+    async def _async_overlapping_tick(self, task, now):
+        """Apply the overlap policy to a scheduled tick while an analysis is running.
+        
+        skip drops the tick, queue_one runs a single analysis after the current one
+        (later ticks are dropped until it starts) and cancel_previous replaces a
+        running scheduled analysis. Manual analyses, and scheduled analyses a manual
+        caller has joined, are never cancelled.
+        """
+        self.overrun_ticks += 1
+        if self.overlap_policy == "queue_one" and self._queued_task is None:
+            _LOGGER.info("Analysis for %s still running, queueing the scheduled analysis", self.tank_name)
+            self._queued_task = self.hass.async_create_task(self._async_run_queued(task, now))
+            return await self._async_join(self._queued_task)
+        
+        if self.overlap_policy == "cancel_previous" and self._analysis_scheduled:
+            _LOGGER.warning(
+                "Scheduled analysis for %s outlasted its interval, cancelling it and starting a new one",
+                self.tank_name,
+            )
+            self.cancelled_runs += 1
+            task.cancel()
+            await asyncio.wait([task])
+            # Another caller may have started a run while the previous one was cancelled
+            if self._analysis_task is task:
+                self._async_start_analysis(now)
+            return await self._async_join(self._analysis_task)
+        
+        self.skipped_ticks += 1
+        _LOGGER.info("Analysis for %s still running, skipping the scheduled analysis", self.tank_name)
+        return None
+    
+    async def _async_run_queued(self, previous, now):
+        """Start the queued scheduled analysis once the previous run has finished."""
+        await asyncio.wait([previous])
+        self._queued_task = None
+        task = self._analysis_task
+        if task is None or task.done():
+            task = self._async_start_analysis(now)
+        return await asyncio.shield(task)
+    
+    def _get_last_water_change_state(self):
+        """Return the state of the last water change entity, or None if unknown."""
+        if self.last_water_change and self.last_water_change.strip():
+            last_change_state = self.hass.states.get(self.last_water_change)
+            if last_change_state and last_change_state.state not in ["unknown", "unavailable"]:
+                return last_change_state.state
+        return None
+    
+    def _get_sensor_analysis(self, ai_data):
+        """Return the brief texts shown by the sensors (including the overall, water change and camera analyses)."""
+        sensor_analysis_data = {}
+        for structure_key in self.plan.brief_keys:
+            if structure_key in ai_data:
+                analysis_text = ai_data[structure_key]
+                # Ensure we stay under 255 characters for sensors
+                if len(analysis_text) > 255:
+                    analysis_text = analysis_text[:252] + "..."
+                sensor_analysis_data[structure_key] = analysis_text
+        return sensor_analysis_data
+    
+    def _build_local_data(self, sensor_data, status, last_water_change_state, previous_snapshot):
+        """Write every structure field with the local analysis, returning the data and its duration."""
+        start = time.monotonic()
+        local_data = self.local_analyzer.analyze(
+            self.plan.structure,
+            sensor_data,
+            status,
+            previous_snapshot["readings"] if previous_snapshot else None,
+            last_water_change_state,
+        )
+        return local_data, round(time.monotonic() - start, 6)
+    
+    def _build_conditions_key(self, sensor_data, status, last_water_change_state):
+        """Describe the readings for the response cache: status band and quantized value."""
+        return [
+            [
+                info['name'],
+                info['unit'],
+                status.statuses.get(info['name']),
+                quantize_reading(info['raw_value'], self.change_tolerances.get(info['name'], 0.0)),
+            ]
+            for info in sensor_data
+        ] + [last_water_change_state]
+    
+    async def _async_generate_data(self, ai_task_data, conditions_key=None, use_cache=False):
+        """Call the AI task and return its response and duration in seconds.
+        
+        With a conditions_key, successful responses are cached and, with use_cache,
+        a cached response for the same prompt, fields and conditions is returned
+        instead of calling the AI.
+        """
+        start = time.monotonic()
+        cache_key = None
+        if conditions_key is not None:
+            cache_key = build_cache_key(
+                self.ai_task, self.plan.prompt_prefix_hash, list(ai_task_data["structure"]), conditions_key
+            )
+            if use_cache:
+                cached_data = self.response_cache.get(cache_key)
+                if cached_data is not None:
+                    _LOGGER.debug("Using cached AI response for %s", self.tank_name)
+                    return {"data": cached_data}, round(time.monotonic() - start, 6)
+        
+        response = await self._async_call_ai_task(ai_task_data)
+        if cache_key and response and "data" in response:
+            self.response_cache.put(cache_key, response["data"], self.response_cache_ttl)
+        return response, round(time.monotonic() - start, 6)
+    
+    async def _async_call_ai_task(self, ai_task_data):
+        """Call the AI task, retrying transient failures with jittered exponential backoff.
+        
+        Every attempt that succeeds or fails transiently is recorded by the circuit
+        breaker of the AI Task entity; while it is open no call is made and
+        AITaskUnavailableError is raised. Configuration errors and other errors are
+        raised right away.
+        """
+        breaker = self.circuit_breaker
+        for attempt in range(1, AI_TASK_MAX_ATTEMPTS + 1):
+            if not breaker.allow_request():
+                raise AITaskUnavailableError(
+                    f"AI Task {self.ai_task} is unavailable after repeated failures"
+                    + (f", next attempt after {breaker.retry_at.isoformat()}" if breaker.retry_at else "")
+                )
+            _LOGGER.debug("Calling AI Task service with data: %s", ai_task_data)
+            try:
+                async with self.scheduler.async_ai_call_slot(self._run_deadlines):
+                    response = await self.hass.services.async_call(
+                        "ai_task",
+                        "generate_data",
+                        {**ai_task_data, "entity_id": self.ai_task},
+                        blocking=True,
+                        return_response=True,
+                    )
+            except (asyncio.CancelledError, *CONFIGURATION_ERRORS):
+                # Not the provider's fault, so the breaker and the other aquariums are not affected
+                breaker.release_request()
+                raise
+            except TRANSIENT_ERRORS as err:
+                breaker.record_failure(err)
+                if attempt == AI_TASK_MAX_ATTEMPTS or breaker.state == STATE_OPEN:
+                    raise
+                # Full jitter keeps aquariums sharing a provider from retrying in step
+                delay = random.uniform(0, min(AI_TASK_RETRY_MAX_DELAY, AI_TASK_RETRY_BASE_DELAY * 2 ** (attempt - 1)))
+                _LOGGER.warning(
+                    "AI Task call for %s failed (attempt %d of %d), retrying in %.1f seconds: %s",
+                    self.tank_name, attempt, AI_TASK_MAX_ATTEMPTS, delay, err
+                )
+                await asyncio.sleep(delay)
+            except Exception:
+                breaker.release_request()
+                raise
+            else:
+                breaker.record_success()
+                return response
+    
+    async def _async_detailed_phase(
+        self, sensor_data, last_water_change_state, parameters, timings, conditions_key=None, use_cache=False
+    ):
+        """Ask the AI for the detailed notification fields of a two-phase analysis.
+        
+        The brief results are already published, so a failure here only leaves the
+        notification without the detailed texts.
+        """
+        ai_task_data = self.plan.build_request(
+            self.tank_name, sensor_data, last_water_change_state, brief=False, parameters=parameters
+        )
+        if not ai_task_data["structure"]:
+            return None
+        try:
+            response, timings["detailed"] = await self._async_generate_data(
+                ai_task_data, conditions_key, use_cache
+            )
+        except Exception as err:
+            _LOGGER.warning("Detailed analysis failed for %s, using the brief analysis: %s", self.tank_name, err)
+            return None
+        return response.get("data") if response else None
+    
+    def _split_incremental(self, previous_snapshot, snapshot, include_details):
+        """Split the parameters into ones to analyze again and ones to carry over.
+        
+        A parameter is carried over when it kept its status and stayed within its
+        tolerance since its texts were written, those texts are younger than the
+        maximum analysis age and the previous result holds every text this run needs.
+        Carried over parameters keep their analyzed reading in the snapshot, so slow
+        drift still adds up to a change.
+        
+        Returns the parameters to analyze and the carried over AI data.
+        """
+        previous_data = self.data.ai_data
+        include_details = include_details and "parameters" in self.plan.notification_details
+        oldest_analyzed_at = dt_util.utcnow() - timedelta(minutes=self.max_analysis_age)
+        fresh_parameters = []
+        carried_data = {}
+        for sensor_name, reading in snapshot["readings"].items():
+            previous_reading = previous_snapshot["readings"].get(sensor_name)
+            brief_key, detailed_key = get_parameter_keys(sensor_name)
+            needed_keys = (brief_key, detailed_key) if include_details else (brief_key,)
+            analyzed_at = previous_reading and dt_util.parse_datetime(previous_reading.get("analyzed_at") or "")
+            if (
+                not analyzed_at
+                or analyzed_at < oldest_analyzed_at
+                or any(key not in previous_data for key in needed_keys)
+                or _get_reading_change(
+                    sensor_name, previous_reading, reading, self.change_tolerances.get(sensor_name, 0.0)
+                )
+            ):
+                fresh_parameters.append(sensor_name)
+                continue
+            
+            for key in (brief_key, detailed_key):
+                if key in previous_data:
+                    carried_data[key] = previous_data[key]
+            snapshot["readings"][sensor_name] = previous_reading
+        
+        return fresh_parameters, carried_data
+    
+    async def _async_analyze(self, now, override_notification=None):
+        """Run one analysis within the deadline, publishing the fallback when it expires.
+        
+        Time spent waiting for a shared AI call slot does not count against the deadline.
+        When the deadline expires after the AI result was published, that result is
+        kept and returned.
+        
+        Returns:
+            The parsed AI response data, or None if the AI analysis did not succeed.
+        """
+        start = time.monotonic()
+        previous_result = self.data
+        self._run_ai_data = None
+        try:
+            async with asyncio.timeout(self.analysis_deadline) as deadline:
+                self._run_deadlines.append(deadline)
+                try:
+                    ai_data = await self._async_analyze_readings(now, override_notification)
+                finally:
+                    self._run_deadlines.remove(deadline)
+        except asyncio.TimeoutError:
+            self.timed_out_runs += 1
+            self.last_timeout = dt_util.utcnow()
+            if self._run_ai_data is not None:
+                # The AI result was already published (only the detailed phase or the
+                # notification was cut short), so it stays
+                _LOGGER.warning(
+                    "Analysis for %s did not finish within %d seconds, keeping the published analysis",
+                    self.tank_name, self.analysis_deadline
+                )
+                ai_data = self._run_ai_data
+            else:
+                _LOGGER.warning(
+                    "Analysis for %s did not finish within %d seconds and was cancelled, using the fallback analysis",
+                    self.tank_name, self.analysis_deadline
+                )
+                should_send_notification = override_notification if override_notification is not None else self.auto_notifications
+                await self._async_publish_fallback(
+                    now, should_send_notification, {"timeout": round(time.monotonic() - start, 3)}
+                )
+                ai_data = None
+        
+        # Adapt the analysis interval to every new result
+        if self.data is not previous_result:
+            self._async_update_cadence()
+        return ai_data
+    
+    async def _async_analyze_readings(self, now, override_notification=None):
+        """Send an AI analysis notification about all configured sensors.
+        
+        Args:
+            now: Timestamp or None
+            override_notification: Optional bool to override self.auto_notifications setting.
+                                  If True, forces notification. If False, prevents notification.
+                                  If None, uses self.auto_notifications config.
+        
+        Returns:
+            The parsed AI response data, or None if the AI analysis did not succeed.
+        """
+        try:
+            # Determine whether to send notification
+            should_send_notification = override_notification if override_notification is not None else self.auto_notifications
+            
+            # Collect the readings of the parameters planned for analysis
+            sensor_data = [
+                self.readings[sensor_name]
+                for sensor_name in self.plan.parameters
+                if self.readings.get(sensor_name)
+            ]
+            
+            if not sensor_data:
+                _LOGGER.warning("No valid sensor data available for analysis")
+                return
+            
+            # Read the last water change date once - it feeds both the prompt and change detection
+            last_water_change_state = self._get_last_water_change_state()
+            local = self.analysis_mode == ANALYSIS_MODE_LOCAL
+            
+            # Statuses of the live readings were already computed when the sensors changed
+            status = build_status_snapshot(sensor_data, self.aquarium_type, self.reading_statuses)
+            snapshot = _build_analysis_snapshot(sensor_data, status, last_water_change_state)
+            
+            # On scheduled runs, reuse the stored analysis when nothing moved materially
+            previous_snapshot = self.data.snapshot
+            if (
+                now is not None
+                and self.skip_unchanged_analysis
+                and self._is_own_snapshot(previous_snapshot)
+                and self.data.sensor_analysis
+            ):
+                change = _get_snapshot_change(previous_snapshot, snapshot, self.change_tolerances)
+                analysis_age = dt_util.utcnow() - previous_snapshot["analyzed_at"]
+                if change is None and analysis_age < timedelta(minutes=self.max_analysis_age):
+                    _LOGGER.debug(
+                        "Readings unchanged for %s since last analysis (%d minutes ago), reusing stored analysis",
+                        self.tank_name, analysis_age.total_seconds() // 60
+                    )
+                    self.async_set_updated_data(
+                        replace(self.data, sensor_data=sensor_data, status=status, timings={})
+                    )
+                    return self.data.ai_data
+                _LOGGER.debug(
+                    "Running analysis for %s: %s",
+                    self.tank_name, change or "stored analysis is older than the maximum age"
+                )
+            
+            # In incremental mode, carry over the texts of the parameters that did not
+            # move since they were analyzed and only ask for the others
+            fresh_parameters = None
+            carried_data = {}
+            if self.incremental_analysis and not local and self._is_own_snapshot(previous_snapshot) and self.data.ai_data:
+                fresh_parameters, carried_data = self._split_incremental(
+                    previous_snapshot, snapshot, should_send_notification
+                )
+                _LOGGER.debug(
+                    "Incremental analysis for %s: analyzing %s, carrying over %s",
+                    self.tank_name, fresh_parameters or "no parameters", list(carried_data) or "nothing"
+                )
+            
+            timings = {}
+            if local:
+                # Local mode writes every field from the ranges without calling the AI
+                local_data, timings["local"] = self._build_local_data(
+                    sensor_data, status, last_water_change_state, previous_snapshot
+                )
+                response = {"data": local_data}
+            else:
+                # Fill the current readings into the compiled plan. In two-phase mode the
+                # first call only asks for the brief fields shown by the sensors.
+                ai_task_data = self.plan.build_request(
+                    self.tank_name,
+                    sensor_data,
+                    last_water_change_state,
+                    details=should_send_notification and not self.two_phase_analysis,
+                    parameters=fresh_parameters,
+                )
+                
+                # Responses for the same quantized conditions are cached (camera images are
+                # not part of the key, so camera analyses are never cached). Only scheduled
+                # runs use the cache, manual runs always call the AI.
+                conditions_key = None
+                if self.response_cache is not None and not self.plan.include_camera:
+                    conditions_key = self._build_conditions_key(sensor_data, status, last_water_change_state)
+                use_cache = now is not None
+                
+                first_phase = "brief" if self.two_phase_analysis else "analysis"
+                if ai_task_data["structure"]:
+                    response, timings[first_phase] = await self._async_generate_data(
+                        ai_task_data, conditions_key, use_cache
+                    )
+                else:
+                    # Incremental run with nothing to ask: republish the carried over texts
+                    _LOGGER.debug("Nothing changed for %s, republishing the carried over analysis", self.tank_name)
+                    response = {"data": {}}
+            
+            # Store AI analysis data for sensors to use
+            ai_data = None
+            if response and "data" in response:
+                ai_data = {**carried_data, **response["data"]}
+                response = {**response, "data": ai_data}
+                
+                # Publish the new result to all entities, remembering what it was based on
+                # for change detection
+                snapshot["analyzed_at"] = dt_util.utcnow()
+                snapshot["source"] = self.analysis_mode
+                # Carried over readings keep the time their texts were written
+                for reading in snapshot["readings"].values():
+                    reading.setdefault("analyzed_at", snapshot["analyzed_at"].isoformat())
+                self.async_set_updated_data(
+                    AquariumAnalysisResult(
+                        sensor_analysis=self._get_sensor_analysis(ai_data),
+                        sensor_data=sensor_data,
+                        status=status,
+                        last_update=now or snapshot["analyzed_at"],
+                        ai_data=ai_data,
+                        snapshot=snapshot,
+                        timings=dict(timings),
+                        carried_over=tuple(carried_data),
+                    )
+                )
+                self._run_ai_data = ai_data
+                
+                # Second phase: the detailed fields, only when somebody will read them
+                if self.two_phase_analysis and not local and (should_send_notification or status.problems):
+                    detailed_data = await self._async_detailed_phase(
+                        sensor_data, last_water_change_state, fresh_parameters, timings,
+                        conditions_key, use_cache,
+                    )
+                    if detailed_data:
+                        ai_data = {**ai_data, **detailed_data}
+                    response = {**response, "data": ai_data}
+                    self._async_update_result(ai_data=ai_data, timings=dict(timings))
+                    self._run_ai_data = ai_data
+            
+            _LOGGER.debug("AI analysis timings for %s: %s", self.tank_name, timings)
+            
+            # Extract the AI analysis and build message based on format
+            message = _build_notification_message(
+                self.notification_format, sensor_data, status, response
+            )
+            if local:
+                message += "\n\n(Local rule based analysis)"
+            
+            # Send notification using consolidated helper
+            await _send_notification_if_enabled(
+                self.hass, 
+                should_send_notification,
+                f"🐠 {self.tank_name} AI Analysis",
+                message,
+                f"aquarium_ai_{self.entry.entry_id}",
+                self.tank_name,
+                "AI analysis"
+            )
+            return ai_data
+        
+        except Exception as err:
+            _LOGGER.error("Error sending AI aquarium analysis: %s", err)
+            await self._async_publish_fallback(now, should_send_notification)
+        
+        return None
+    
+    async def _async_publish_fallback(self, now, should_send_notification, timings=None):
+        """Publish the local analysis of the readings and send the fallback notification."""
+        try:
+            fallback_sensor_data = [
+                self.readings[sensor_name]
+                for sensor_name in self.plan.parameters
+                if self.readings.get(sensor_name)
+            ]
+            
+            if fallback_sensor_data:
+                fallback_status = build_status_snapshot(
+                    fallback_sensor_data, self.aquarium_type, self.reading_statuses
+                )
+                # The local analysis stands in for the AI texts. The result keeps no
+                # snapshot, so the next run never reuses it as an AI analysis.
+                local_data, local_duration = self._build_local_data(
+                    fallback_sensor_data, fallback_status, self._get_last_water_change_state(), self.data.snapshot
+                )
+                fallback_message = _build_notification_message(
+                    self.notification_format, fallback_sensor_data, fallback_status, {"data": local_data}
+                )
+                fallback_message += "\n\n(AI analysis temporarily unavailable, showing the local analysis)"
+                
+                # Send fallback notification using consolidated helper
+                await _send_notification_if_enabled(
+                    self.hass,
+                    should_send_notification,
+                    f"🐠 {self.tank_name} Aquarium Update",
+                    fallback_message,
+                    f"aquarium_ai_{self.entry.entry_id}",
+                    self.tank_name,
+                    "fallback analysis"
+                )
+                
+                # Publish fallback sensor data for sensors to use
+                self.async_set_updated_data(
+                    AquariumAnalysisResult(
+                        sensor_analysis=self._get_sensor_analysis(local_data),
+                        sensor_data=fallback_sensor_data,
+                        status=fallback_status,
+                        last_update=now or dt_util.utcnow(),
+                        ai_data=local_data,
+                        timings={**(timings or {}), "local": local_duration},
+                    )
+                )
+        except Exception as fallback_err:
+            _LOGGER.error("Error sending fallback notification: %s", fallback_err)
@@ -0,0 +1,102 @@
+"""Diagnostics support for the Aquarium AI integration."""
+from datetime import timedelta
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, DATA_SHARED_RESPONSE_CACHE, DEFAULT_PROMPT_PARAMETER_GUIDELINES
+from .scheduler import get_phase_offset
+
+# Rough average for English prompt text, used to estimate token counts
+CHARS_PER_TOKEN = 4
+
+
+def _estimate_tokens(characters):
+    """Return an estimated token count for a number of characters."""
+    return round(characters / CHARS_PER_TOKEN)
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    plan = coordinator.plan
+    data = coordinator.data
+    
+    # Size of the parameter guidelines sent compared to the full default guidelines
+    guidelines_length = len(plan.parameter_guidelines)
+    full_guidelines_length = (
+        len(DEFAULT_PROMPT_PARAMETER_GUIDELINES) if plan.guidelines_trimmed else guidelines_length
+    )
+    saved_length = full_guidelines_length - guidelines_length
+    
+    return {
+        "config_entry": dict(entry.data),
+        "analysis_plan": {
+            "parameters": list(plan.parameters),
+            "structure_fields": list(plan.structure),
+            "structure_fields_without_notification": list(plan.brief_structure),
+            "prompt_prefix_characters": len(plan.prompt_prefix),
+            "prompt_prefix_estimated_tokens": _estimate_tokens(len(plan.prompt_prefix)),
+            "prompt_prefix_hash": plan.prompt_prefix_hash,
+            "parameter_guidelines": {
+                "trimmed": plan.guidelines_trimmed,
+                "characters": guidelines_length,
+                "full_characters": full_guidelines_length,
+                "saved_characters": saved_length,
+                "saved_estimated_tokens": _estimate_tokens(saved_length),
+                "reduction_percent": round(saved_length / full_guidelines_length * 100, 1) if full_guidelines_length else 0.0,
+            },
+        },
+        "last_analysis": {
+            "last_update": data.last_update.isoformat() if data.last_update else None,
+            "statuses": data.status.statuses,
+            "timings": data.timings,
+            "analysis_fields": list(data.sensor_analysis),
+        },
+        "local_analysis": {
+            "analysis_mode": coordinator.analysis_mode,
+            "water_change_percent": coordinator.local_analyzer.water_change_percent,
+            "water_change_interval_days": coordinator.local_analyzer.water_change_interval,
+        },
+        "response_cache": {
+            "ttl_seconds": coordinator.response_cache_ttl,
+            "shared": coordinator.response_cache is hass.data.get(DATA_SHARED_RESPONSE_CACHE),
+            **coordinator.response_cache.stats(),
+        } if coordinator.response_cache is not None else None,
+        "deadline": {
+            "seconds": coordinator.analysis_deadline,
+            "timed_out_runs": coordinator.timed_out_runs,
+            "last_timeout": coordinator.last_timeout.isoformat() if coordinator.last_timeout else None,
+        },
+        "overlap": {
+            "policy": coordinator.overlap_policy,
+            "overrun_ticks": coordinator.overrun_ticks,
+            "skipped_ticks": coordinator.skipped_ticks,
+            "cancelled_runs": coordinator.cancelled_runs,
+        },
+        "cadence": {
+            "interval": coordinator.cadence.interval,
+            **coordinator.cadence.as_dict(),
+        } if coordinator.cadence is not None else None,
+        "status_triggers": {
+            "enabled": coordinator.analyze_on_status_change,
+            "triggered_analyses": coordinator.triggered_analyses,
+            "deferred_triggers": coordinator.deferred_triggers,
+        },
+        "critical_alerts": {
+            "enabled": coordinator.critical_alerts,
+            "sent": coordinator.sent_critical_alerts,
+        },
+        "scheduler": {
+            "phase_offset": get_phase_offset(
+                entry.entry_id, timedelta(minutes=coordinator.cadence.interval)
+            ) if coordinator.cadence is not None else None,
+            **coordinator.scheduler.as_dict(),
+        },
+        "circuit_breaker": coordinator.circuit_breaker.as_dict(),
+        "history": {
+            "records": len(coordinator.history),
+            "memory_bytes": coordinator.history.memory_usage(),
+        },
+    }
@@ -0,0 +1,157 @@
+"""Helper functions for the Aquarium AI integration."""
+from dataclasses import dataclass, field
+
+from .classifier import get_classifier
+
+# Parameter statuses counted as problems in the status summaries
+PROBLEM_STATUSES = ("Check", "Adjust", "Low", "High")
+
+# Overall status levels (5 = best): (quick status, overall message, emoji)
+STATUS_LEVELS = {
+    5: ("Excellent", "Your {aquarium_type} Aquarium is Excellent! 🌟", "🌟"),
+    4: ("Great", "Your {aquarium_type} Aquarium is Great! 👍", "👍"),
+    3: ("Good", "Your {aquarium_type} Aquarium is Good 👌", "👌"),
+    2: ("OK", "Your {aquarium_type} Aquarium is OK ⚠️", "⚠️"),
+    1: ("Needs Attention", "Your {aquarium_type} Aquarium needs attention! 🚨", "🚨"),
+    0: ("No Data", "Your {aquarium_type} Aquarium needs sensor data!", "❓"),
+}
+
+
+@dataclass(frozen=True)
+class StatusSnapshot:
+    """Parameter statuses and their summary for one set of sensor readings."""
+    
+    # Simple status per parameter name, in sensor order
+    statuses: dict = field(default_factory=dict)
+    good: int = 0
+    ok: int = 0
+    problems: int = 0
+    total: int = 0
+    level: int = 0
+    quick_status: str = "No Data"
+    overall_message: str = ""
+    emoji: str = "❓"
+    
+    @property
+    def counts(self) -> dict:
+        """Return the status distribution."""
+        return {
+            "good": self.good,
+            "ok": self.ok,
+            "problems": self.problems,
+            "total": self.total
+        }
+    
+    @property
+    def percentages(self) -> dict:
+        """Return the status distribution as percentages."""
+        return {
+            "good_percent": round((self.good / self.total) * 100, 1) if self.total > 0 else 0,
+            "ok_percent": round((self.ok / self.total) * 100, 1) if self.total > 0 else 0,
+            "problem_percent": round((self.problems / self.total) * 100, 1) if self.total > 0 else 0
+        }
+
+
+def build_status_snapshot(sensor_data, aquarium_type, known_statuses=None):
+    """Classify every reading once and summarize the result.
+    
+    known_statuses maps parameter names to statuses that were already computed
+    for the same readings (e.g. by the coordinator), so they are not classified again.
+    """
+    statuses = {}
+    for info in sensor_data:
+        status = known_statuses.get(info['name']) if known_statuses else None
+        if status is None:
+            status = get_simple_status(info['name'], info['raw_value'], info['unit'], aquarium_type)
+        statuses[info['name']] = status
+    
+    # Count different status types
+    values = list(statuses.values())
+    good_count = values.count("Good")
+    ok_count = values.count("OK")
+    problem_count = sum(1 for s in values if s in PROBLEM_STATUSES)
+    
+    total_sensors = len(values)
+    
+    # Determine overall status level based on sensor status distribution
+    if not total_sensors:
+        level = 0
+    elif good_count == total_sensors:
+        level = 5
+    elif good_count >= total_sensors * 0.75:  # 75% or more good
+        level = 4
+    elif (good_count + ok_count) >= total_sensors * 0.8:  # 80% or more good/ok
+        level = 3
+    elif problem_count <= total_sensors * 0.4:  # Less than 40% problems
+        level = 2
+    else:
+        level = 1
+    
+    quick_status, overall_message, emoji = STATUS_LEVELS[level]
+    return StatusSnapshot(
+        statuses=statuses,
+        good=good_count,
+        ok=ok_count,
+        problems=problem_count,
+        total=total_sensors,
+        level=level,
+        quick_status=quick_status,
+        overall_message=overall_message.format(aquarium_type=aquarium_type),
+        emoji=emoji,
+    )
+
+
+def get_overall_status(sensor_data, aquarium_type):
+    """Generate an overall status message for the aquarium based on all sensors."""
+    return build_status_snapshot(sensor_data, aquarium_type).overall_message
+
+
+def get_sensor_icon(sensor_name):
+    """Get appropriate icon for sensor type."""
+    sensor_icons = {
+        "Temperature": "🌡️",
+        "pH": "⚗️", 
+        "Salinity": "🧂",
+        "Dissolved Oxygen": "💨",
+        "Water Level": "📏",
+        "ORP": "⚡",
+    }
+    return sensor_icons.get(sensor_name, "📊")
+
+
+def get_simple_status(sensor_name, value, unit="", aquarium_type=""):
+    """Generate a simple 1-2 word status based on sensor value and type."""
+    return get_classifier(aquarium_type).classify(sensor_name, value, unit)
+
+
+def format_sensor_value(value, unit=""):
+    """Format sensor value with proper rounding and unit."""
+    try:
+        # Try to convert to float and round to 1 decimal place
+        float_value = float(value)
+        rounded_value = round(float_value, 1)
+        return f"{rounded_value}{unit}"
+    except (ValueError, TypeError):
+        # If it's not a number, return as string (for status values like "Normal", "High", etc.)
+        return f"{value}{unit}"
+
+
+def get_sensor_info(hass, sensor_entity_id, sensor_name):
+    """Get sensor value and unit, properly formatted."""
+    if not sensor_entity_id:
+        return None
+    
+    sensor_state = hass.states.get(sensor_entity_id)
+    if not sensor_state or sensor_state.state in ["unknown", "unavailable"]:
+        return None
+    
+    unit = sensor_state.attributes.get("unit_of_measurement", "")
+    value = sensor_state.state
+    formatted_value = format_sensor_value(value, unit)
+    
+    return {
+        "name": sensor_name,
+        "value": formatted_value,
+        "raw_value": value,
+        "unit": unit
+    }
@@ -0,0 +1,205 @@
+"""Analysis history for the Aquarium AI integration."""
+from array import array
+from bisect import bisect_left, bisect_right
+import math
+import sys
+
+import homeassistant.util.dt as dt_util
+
+# Parameter statuses stored as small integer codes (index in this tuple)
+STATUS_CODES = ("Good", "OK", "Check", "Adjust", "Low", "High")
+_STATUS_INDEX = {status: code for code, status in enumerate(STATUS_CODES)}
+_NO_STATUS = -1
+_NO_TEXT = -1
+
+
+def _to_float(value):
+    """Return a reading as float, or NaN for non-numeric states."""
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return math.nan
+
+
+class _TimestampView:
+    """Chronological, read-only view of the history timestamps for bisect."""
+    
+    def __init__(self, history):
+        """Initialize the view."""
+        self._history = history
+    
+    def __len__(self):
+        """Return the number of records."""
+        return self._history._size
+    
+    def __getitem__(self, index):
+        """Return the timestamp of the record at a chronological index."""
+        return self._history._timestamps[self._history._slot(index)]
+
+
+class AnalysisHistory:
+    """Bounded ring buffer of analysis results for one aquarium.
+    
+    Readings are kept in preallocated float arrays and statuses as byte codes,
+    one column per parameter. Analysis texts are interned and reference counted,
+    so repeated texts (e.g. reused analyses) are stored only once. Records are
+    evicted when the buffer is full or when they are older than max_age seconds.
+    """
+    
+    def __init__(self, max_records, max_age):
+        """Initialize an empty history."""
+        self._capacity = max_records
+        self._max_age = max_age
+        self._timestamps = array("d", [0.0]) * max_records
+        self._start = 0
+        self._size = 0
+        # Columns created on first use: parameter / analysis key -> array
+        self._values = {}
+        self._statuses = {}
+        self._texts = {}
+        # Latest unit per parameter
+        self._units = {}
+        # Interned analysis texts: id -> text / reference count, text -> id
+        self._text_table = []
+        self._text_refs = array("i")
+        self._text_ids = {}
+        self._free_text_ids = []
+    
+    def __len__(self):
+        """Return the number of records."""
+        return self._size
+    
+    def _slot(self, index):
+        """Return the buffer slot of a chronological index."""
+        return (self._start + index) % self._capacity
+    
+    def _intern(self, text):
+        """Return the id of a text, storing it once."""
+        text_id = self._text_ids.get(text)
+        if text_id is None:
+            if self._free_text_ids:
+                text_id = self._free_text_ids.pop()
+                self._text_table[text_id] = text
+                self._text_refs[text_id] = 0
+            else:
+                text_id = len(self._text_table)
+                self._text_table.append(text)
+                self._text_refs.append(0)
+            self._text_ids[text] = text_id
+        self._text_refs[text_id] += 1
+        return text_id
+    
+    def _release(self, text_id):
+        """Drop one reference to a text, freeing it when unused."""
+        self._text_refs[text_id] -= 1
+        if not self._text_refs[text_id]:
+            del self._text_ids[self._text_table[text_id]]
+            self._text_table[text_id] = None
+            self._free_text_ids.append(text_id)
+    
+    def _evict_oldest(self):
+        """Remove the oldest record."""
+        slot = self._start
+        for column in self._texts.values():
+            if column[slot] != _NO_TEXT:
+                self._release(column[slot])
+                column[slot] = _NO_TEXT
+        self._start = (self._start + 1) % self._capacity
+        self._size -= 1
+    
+    def _evict_expired(self, now):
+        """Remove records older than the maximum age."""
+        cutoff = now - self._max_age
+        while self._size and self._timestamps[self._start] < cutoff:
+            self._evict_oldest()
+    
+    def append(self, timestamp, sensor_data, statuses, sensor_analysis):
+        """Add a record for an analysis result.
+        
+        sensor_data holds the readings (as returned by get_sensor_info), statuses
+        maps parameter names to their simple status and sensor_analysis holds
+        the brief analysis texts.
+        """
+        now = timestamp.timestamp()
+        self._evict_expired(now)
+        if self._size == self._capacity:
+            self._evict_oldest()
+        # Keep timestamps ordered so windows can be found with bisect
+        if self._size:
+            now = max(now, self._timestamps[self._slot(self._size - 1)])
+        
+        slot = self._slot(self._size)
+        self._timestamps[slot] = now
+        
+        readings = {info['name']: info for info in sensor_data}
+        for name in readings:
+            if name not in self._values:
+                self._values[name] = array("d", [math.nan]) * self._capacity
+                self._statuses[name] = array("b", [_NO_STATUS]) * self._capacity
+        for name, column in self._values.items():
+            info = readings.get(name)
+            column[slot] = _to_float(info['raw_value']) if info else math.nan
+            self._statuses[name][slot] = _STATUS_INDEX.get(statuses.get(name), _NO_STATUS)
+            if info:
+                self._units[name] = info['unit']
+        
+        for key in sensor_analysis:
+            if key not in self._texts:
+                self._texts[key] = array("i", [_NO_TEXT]) * self._capacity
+        for key, column in self._texts.items():
+            text = sensor_analysis.get(key)
+            column[slot] = self._intern(text) if text else _NO_TEXT
+        
+        self._size += 1
+    
+    def _record(self, index):
+        """Build the record at a chronological index."""
+        slot = self._slot(index)
+        readings = {}
+        for name, column in self._values.items():
+            status_code = self._statuses[name][slot]
+            value = column[slot]
+            if status_code == _NO_STATUS and math.isnan(value):
+                continue
+            readings[name] = {
+                "value": None if math.isnan(value) else value,
+                "unit": self._units.get(name, ""),
+                "status": STATUS_CODES[status_code] if status_code != _NO_STATUS else None,
+            }
+        analysis = {
+            key: self._text_table[column[slot]]
+            for key, column in self._texts.items()
+            if column[slot] != _NO_TEXT
+        }
+        return {
+            "timestamp": dt_util.utc_from_timestamp(self._timestamps[slot]).isoformat(),
+            "readings": readings,
+            "analysis": analysis,
+        }
+    
+    def query(self, start=None, end=None, limit=None):
+        """Return the records between start and end (inclusive), oldest first.
+        
+        Only the requested window is materialized; with limit, the most recent
+        records of the window are returned.
+        """
+        self._evict_expired(dt_util.utcnow().timestamp())
+        view = _TimestampView(self)
+        low = bisect_left(view, start.timestamp()) if start else 0
+        high = bisect_right(view, end.timestamp()) if end else self._size
+        if limit is not None:
+            low = max(low, high - limit)
+        return [self._record(index) for index in range(low, high)]
+    
+    def memory_usage(self):
+        """Return the approximate memory used by the stored data, in bytes."""
+        columns = [
+            self._timestamps,
+            self._text_refs,
+            *self._values.values(),
+            *self._statuses.values(),
+            *self._texts.values(),
+        ]
+        size = sum(column.buffer_info()[1] * column.itemsize for column in columns)
+        size += sum(sys.getsizeof(text) for text in self._text_table if text is not None)
+        return size
@@ -0,0 +1,295 @@
+"""Rule based local analysis for the Aquarium AI integration."""
+import math
+import re
+
+import homeassistant.util.dt as dt_util
+
+from .analysis_plan import get_parameter_keys
+from .helpers import PROBLEM_STATUSES, format_sensor_value
+
+# Parameters whose problems a water change helps to correct
+WATER_CHANGE_PARAMETERS = ("pH", "ORP")
+# Water change percentage suggested when the schedule does not name one
+DEFAULT_WATER_CHANGE_PERCENT = 20
+
+# Suggested actions for a parameter out of its acceptable range, keyed by
+# (parameter, direction). Parameters without an entry use DEFAULT_ACTION.
+PARAMETER_ACTIONS = {
+    ("Temperature", "high"): "Check the heater setting and room temperature, and add cooling if needed.",
+    ("Temperature", "low"): "Check that the heater works and is set correctly.",
+    ("pH", "high"): "Check KH and lower pH gradually, by no more than 0.2 per day.",
+    ("pH", "low"): "Check KH and raise pH gradually, by no more than 0.2 per day.",
+    ("Salinity", "high"): "Top off with fresh RO/DI water to lower salinity slowly.",
+    ("Salinity", "low"): "Raise salinity slowly with saltwater mix and check the top-off system.",
+    ("Dissolved Oxygen", "high"): "Reduce aeration and check for gas supersaturation.",
+    ("Dissolved Oxygen", "low"): "Increase surface agitation or aeration.",
+    ("Water Level", "low"): "Top off the tank and check for leaks.",
+    ("ORP", "high"): "Reduce ozone or other oxidizer dosing.",
+    ("ORP", "low"): "Remove excess organics and clean the filter.",
+}
+DEFAULT_ACTION = "Check the sensor and correct the parameter gradually."
+
+CAMERA_ANALYSIS = "Not analyzed - camera analysis needs the AI"
+CAMERA_NOTIFICATION_ANALYSIS = "The camera image was not analyzed, visual analysis is only available from the AI."
+
+_PERCENT_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*%")
+_TIMES_PATTERN = re.compile(
+    r"\b(once|twice|\d+(?:\.\d+)?)\s*(?:x|times)?\s+(?:a|per|each|every)\s+(day|week|month)\b"
+)
+_EVERY_PATTERN = re.compile(r"\bevery\s+(other\s+|\d+(?:\.\d+)?\s*)?(day|week|month)s?\b")
+_PERIOD_PATTERN = re.compile(r"\b(daily|weekly|bi-?weekly|fortnightly|monthly)\b")
+_UNIT_DAYS = {"day": 1, "week": 7, "month": 30}
+_PERIOD_DAYS = {"daily": 1, "weekly": 7, "biweekly": 14, "bi-weekly": 14, "fortnightly": 14, "monthly": 30}
+
+
+def parse_water_change_schedule(schedule):
+    """Return (percentage, interval in days) of a free text water change schedule.
+    
+    Understands texts like "25% weekly", "20% every 2 weeks" or "10% twice per
+    week". Either value is None when the text does not state it.
+    """
+    text = str(schedule or "").lower()
+    percent_match = _PERCENT_PATTERN.search(text)
+    percent = float(percent_match.group(1)) if percent_match else None
+    
+    interval = None
+    if match := _TIMES_PATTERN.search(text):
+        count = {"once": 1, "twice": 2}.get(match.group(1)) or float(match.group(1))
+        if count > 0:
+            interval = _UNIT_DAYS[match.group(2)] / count
+    elif match := _EVERY_PATTERN.search(text):
+        count = (match.group(1) or "1").strip()
+        interval = _UNIT_DAYS[match.group(2)] * (2 if count == "other" else float(count))
+    elif match := _PERIOD_PATTERN.search(text):
+        interval = _PERIOD_DAYS[match.group(1)]
+    return percent, interval
+
+
+def get_days_since(date_state, today=None):
+    """Return the whole days since a date or datetime state, or None if it is not one."""
+    try:
+        moment = dt_util.parse_datetime(str(date_state))
+    except ValueError:
+        moment = None
+    if moment is not None:
+        day = (dt_util.as_local(moment) if moment.tzinfo else moment).date()
+    else:
+        day = dt_util.parse_date(str(date_state))
+    if day is None:
+        return None
+    return ((today or dt_util.now().date()) - day).days
+
+
+def _format_days(days):
+    """Return a day count as text."""
+    return "1 day" if days == 1 else f"{days:g} days"
+
+
+def _format_names(names):
+    """Join parameter names for a sentence."""
+    if len(names) < 2:
+        return "".join(names)
+    return f"{', '.join(names[:-1])} and {names[-1]}"
+
+
+def _format_band(band, unit):
+    """Return the value range of a (status, low, high) band as text."""
+    _, low, high = band
+    if low is not None and high is not None:
+        return f"{low:g}-{high:g}{unit}"
+    if low is not None:
+        return f"{low:g}{unit} or more"
+    return f"up to {high:g}{unit}"
+
+
+def _find_band(bands, status):
+    """Return the first band with a status, or None."""
+    return next((band for band in bands if band[0] == status), None)
+
+
+class LocalAnalyzer:
+    """Write the analysis fields of one aquarium from its ranges, trends and water change schedule.
+    
+    Used instead of the AI in local analysis mode and whenever the AI analysis
+    is unavailable. The texts only depend on the readings, the status ranges of
+    the classifier, the readings of the previous analysis and the water change
+    schedule, so the same inputs always give the same texts.
+    """
+    
+    def __init__(self, classifier, water_change_schedule, tolerances):
+        """Initialize the analyzer.
+        
+        tolerances are the change tolerances in % per parameter name, readings
+        that moved less than their tolerance count as stable.
+        """
+        self.classifier = classifier
+        self.water_change_percent, self.water_change_interval = parse_water_change_schedule(water_change_schedule)
+        self.tolerances = tolerances
+    
+    def analyze(self, fields, sensor_data, status, previous_readings=None, last_water_change_state=None, today=None):
+        """Return the texts of the requested structure fields.
+        
+        sensor_data holds readings as returned by get_sensor_info, status is
+        their StatusSnapshot and previous_readings the readings of the previous
+        analysis snapshot, keyed by parameter name.
+        """
+        data = {}
+        trends = {}
+        for info in sensor_data:
+            sensor_name = info['name']
+            brief_key, detailed_key = get_parameter_keys(sensor_name)
+            if brief_key not in fields and detailed_key not in fields and "overall_notification_analysis" not in fields:
+                continue
+            parameter_status = status.statuses[sensor_name]
+            previous = (previous_readings or {}).get(sensor_name)
+            brief, detailed, trends[sensor_name] = self._analyze_reading(info, parameter_status, previous)
+            if brief_key in fields:
+                data[brief_key] = brief
+            if detailed_key in fields:
+                data[detailed_key] = detailed
+        
+        water_change = None
+        if "water_change_recommended" in fields or "water_change_recommendation" in fields:
+            water_change = self._analyze_water_change(status, last_water_change_state, today)
+            if "water_change_recommended" in fields:
+                data["water_change_recommended"] = water_change[0]
+            if "water_change_recommendation" in fields:
+                data["water_change_recommendation"] = water_change[1]
+        
+        if "overall_analysis" in fields or "overall_notification_analysis" in fields:
+            overall = self._analyze_overall(status)
+            if "overall_analysis" in fields:
+                data["overall_analysis"] = overall
+            if "overall_notification_analysis" in fields:
+                parts = [overall]
+                moving = [f"{sensor_name} is {trend}" for sensor_name, trend in trends.items() if trend]
+                if moving:
+                    parts.append(f"Since the last analysis {_format_names(moving)}.")
+                if water_change:
+                    parts.append(f"Water change: {water_change[1]}")
+                data["overall_notification_analysis"] = " ".join(parts)
+        
+        if "camera_visual_analysis" in fields:
+            data["camera_visual_analysis"] = CAMERA_ANALYSIS
+        if "camera_visual_notification_analysis" in fields:
+            data["camera_visual_notification_analysis"] = CAMERA_NOTIFICATION_ANALYSIS
+        return data
+    
+    def _analyze_reading(self, info, status, previous):
+        """Return the brief text, detailed text and trend ("rising", "falling" or None) of a reading."""
+        sensor_name, value, unit = info['name'], info['value'], info['unit']
+        try:
+            numeric_value = float(info['raw_value'])
+        except (ValueError, TypeError):
+            numeric_value = None
+        if numeric_value is None or math.isnan(numeric_value):
+            if status == "Good":
+                text = f"{sensor_name} reports {value}, which is normal."
+            elif status in PROBLEM_STATUSES:
+                text = f"{sensor_name} reports {value} and should be checked."
+            else:
+                text = f"{sensor_name} reports {value}."
+            return text, text, None
+        
+        trend = self._get_trend(sensor_name, numeric_value, unit, previous)
+        trend_text = f" It is {trend} (was {format_sensor_value(previous['raw_value'], unit)})." if trend else ""
+        bands = self.classifier.get_bands(sensor_name, unit)
+        good = _find_band(bands, "Good")
+        if good is None:
+            text = f"{sensor_name} is {value}, there is no reference range for this unit.{trend_text}"
+            return text, text, trend
+        
+        if status == "Good":
+            brief = f"{sensor_name} is {value}, within the ideal range ({_format_band(good, unit)}).{trend_text}"
+            return brief, f"{brief} It is within the optimal range, no action needed.", trend
+        
+        if status == "OK":
+            brief = f"{sensor_name} is {value}, acceptable but outside the ideal range ({_format_band(good, unit)}).{trend_text}"
+            detailed = brief
+            _, low, high = good
+            if (trend == "falling" and low is not None and numeric_value < low) or (
+                trend == "rising" and high is not None and numeric_value > high
+            ):
+                detailed += " It is moving away from the ideal range, keep an eye on it."
+            return brief, detailed, trend
+        
+        # Problem statuses with a band of their own (like "High") name that band,
+        # the others are outside the acceptable range
+        own_band = _find_band(bands, status)
+        reference = _find_band(bands, "OK") or good
+        if own_band:
+            brief = f"{sensor_name} is {value}, in the {status.lower()} range ({_format_band(own_band, unit)}).{trend_text}"
+        else:
+            _, low, _ = reference
+            position = "below" if low is not None and numeric_value < low else "above"
+            brief = f"{sensor_name} is {value}, {position} the acceptable range ({_format_band(reference, unit)}).{trend_text}"
+        direction = self._get_direction(numeric_value, status, reference)
+        action = PARAMETER_ACTIONS.get((sensor_name, direction), DEFAULT_ACTION)
+        return brief, f"{brief} {action}", trend
+    
+    def _get_trend(self, sensor_name, value, unit, previous):
+        """Return "rising" or "falling" when a reading moved beyond its tolerance since the previous analysis."""
+        if not previous or previous.get("unit") != unit:
+            return None
+        try:
+            previous_value = float(previous["raw_value"])
+        except (ValueError, TypeError):
+            return None
+        if abs(value - previous_value) <= abs(previous_value) * self.tolerances.get(sensor_name, 0.0) / 100:
+            return None
+        return "rising" if value > previous_value else "falling"
+    
+    @staticmethod
+    def _get_direction(value, status, reference):
+        """Return whether a problem reading is too "high" or too "low"."""
+        if status in ("High", "Low"):
+            return status.lower()
+        _, low, _ = reference
+        return "low" if low is not None and value < low else "high"
+    
+    def _analyze_overall(self, status):
+        """Return the overall health assessment of the statuses."""
+        problems = [name for name, value in status.statuses.items() if value in PROBLEM_STATUSES]
+        acceptable = [name for name, value in status.statuses.items() if value == "OK"]
+        if problems:
+            verb = "needs" if len(problems) == 1 else "need"
+            return f"{_format_names(problems)} {verb} attention, {status.good} of {status.total} parameters are ideal."
+        if acceptable:
+            verb = "is" if len(acceptable) == 1 else "are"
+            return f"No problems found, {_format_names(acceptable)} {verb} acceptable but not ideal."
+        return "All monitored parameters are within their ideal ranges."
+    
+    def _analyze_water_change(self, status, last_water_change_state, today):
+        """Return the brief and detailed water change recommendation."""
+        percent = f"{self.water_change_percent or DEFAULT_WATER_CHANGE_PERCENT:g}%"
+        days_since = get_days_since(last_water_change_state, today) if last_water_change_state else None
+        due_in = None
+        if days_since is not None and self.water_change_interval:
+            due_in = math.ceil(self.water_change_interval - days_since)
+        problems = [
+            name for name in WATER_CHANGE_PARAMETERS
+            if status.statuses.get(name) in PROBLEM_STATUSES
+        ]
+        
+        if due_in is not None and due_in <= 0:
+            brief = "Yes - the scheduled water change is due today" if due_in == 0 else (
+                f"Yes - the scheduled water change is {_format_days(-due_in)} overdue"
+            )
+            return brief, (
+                f"{percent} within 1-2 days, the last change was {_format_days(days_since)} ago "
+                f"and the schedule is every {_format_days(round(self.water_change_interval, 1))}."
+            )
+        if problems:
+            detailed = f"{percent} within 2-3 days to help correct {_format_names(problems)}."
+            if due_in is not None:
+                detailed += f" The next scheduled change would be due in {_format_days(due_in)}."
+            return f"Yes - to help correct {_format_names(problems)}", detailed
+        if due_in is not None:
+            return (
+                f"No - next change due in {_format_days(due_in)}",
+                f"Not needed now, the next scheduled {percent} change is due in {_format_days(due_in)}.",
+            )
+        detailed = "Not needed now based on the current readings."
+        if days_since is not None:
+            detailed += f" The last change was {_format_days(days_since)} ago."
+        return "No - not indicated by the current readings", detailed
@@ -0,0 +1,85 @@
+"""AI response cache for the Aquarium AI integration."""
+from collections import OrderedDict
+import hashlib
+import json
+import math
+import time
+
+
+def quantize_reading(raw_value, tolerance):
+    """Return a hashable bucket for a reading.
+    
+    Numeric values fall into logarithmic buckets as wide as the change tolerance
+    (a percentage), so readings the change detection treats as unchanged mostly
+    share a bucket. Non-numeric states are their own bucket.
+    """
+    try:
+        value = float(raw_value)
+    except (ValueError, TypeError):
+        return str(raw_value)
+    if math.isnan(value) or math.isinf(value) or value == 0 or tolerance <= 0:
+        return value
+    return value > 0, math.floor(math.log(abs(value)) / math.log1p(tolerance / 100))
+
+
+def build_cache_key(*parts):
+    """Return a stable hash for JSON serializable key parts."""
+    return hashlib.sha256(
+        json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str).encode()
+    ).hexdigest()
+
+
+class ResponseCache:
+    """LRU cache of parsed AI responses with a time to live per entry.
+    
+    Response data maps field names to texts, so shallow copies keep cached
+    entries safe from changes made by callers.
+    """
+    
+    def __init__(self, max_entries):
+        """Initialize an empty cache."""
+        self._max_entries = max_entries
+        # key -> (expiry as monotonic time, response data)
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def __len__(self):
+        """Return the number of cached responses."""
+        return len(self._entries)
+    
+    def get(self, key):
+        """Return a copy of the cached response data for a key, or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires, data = entry
+        if expires <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return dict(data)
+    
+    def put(self, key, data, ttl):
+        """Store response data for ttl seconds, evicting the least recently used entry."""
+        self._entries[key] = (time.monotonic() + ttl, dict(data))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def stats(self):
+        """Return the cache counters."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self._max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups * 100, 1) if lookups else 0.0,
+        }
@@ -0,0 +1,136 @@
+"""Shared analysis scheduler for the Aquarium AI integration."""
+import asyncio
+from contextlib import asynccontextmanager
+from functools import partial
+import hashlib
+import logging
+import time
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+import homeassistant.util.dt as dt_util
+
+from .const import (
+    DATA_SCHEDULER,
+    MAX_CONCURRENT_AI_CALLS,
+    STARTUP_ANALYSIS_DELAY,
+    STARTUP_ANALYSIS_STAGGER,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def get_phase_offset(key, interval):
+    """Return a stable offset in seconds within the interval, derived from a key."""
+    seconds = int(interval.total_seconds())
+    if seconds <= 0:
+        return 0
+    return int.from_bytes(hashlib.sha256(key.encode()).digest()[:8], "big") % seconds
+
+
+class AnalysisScheduler:
+    """Spread the analyses of all aquariums over time.
+    
+    Every aquarium runs at its own phase offset within its interval instead of
+    on the interval since it was set up, startup analyses are staggered and all
+    AI calls share one concurrency limit.
+    """
+    
+    def __init__(self, hass: HomeAssistant, max_ai_calls):
+        """Initialize the scheduler."""
+        self._hass = hass
+        self._ai_calls = asyncio.Semaphore(max_ai_calls)
+        self.max_ai_calls = max_ai_calls
+        self.active_ai_calls = 0
+        self.waiting_ai_calls = 0
+        # Monotonic time of the last startup analysis handed out
+        self._last_startup = None
+    
+    def startup_delay(self):
+        """Return the delay in seconds of the next startup analysis."""
+        now = time.monotonic()
+        due = now + STARTUP_ANALYSIS_DELAY
+        if self._last_startup is not None:
+            due = max(due, self._last_startup + STARTUP_ANALYSIS_STAGGER)
+        self._last_startup = due
+        return round(due - now)
+    
+    @callback
+    def async_track_interval(self, key, interval, action):
+        """Call action every interval at the phase offset of key, returning an unsubscribe function.
+        
+        Runs are aligned to the interval counted from the Unix epoch plus the
+        offset, so the schedule of an aquarium survives restarts and reloads.
+        """
+        offset = get_phase_offset(key, interval)
+        seconds = interval.total_seconds()
+        unsub = None
+        
+        @callback
+        def _async_schedule_next(previous_run=None):
+            nonlocal unsub
+            now = dt_util.utcnow().timestamp()
+            if previous_run is not None and previous_run + seconds > now:
+                next_run = previous_run + seconds
+            else:
+                next_run = now - (now - offset) % seconds + seconds
+            unsub = async_track_point_in_utc_time(
+                self._hass, partial(_async_run, next_run), dt_util.utc_from_timestamp(next_run)
+            )
+        
+        @callback
+        def _async_run(scheduled_run, now):
+            _async_schedule_next(scheduled_run)
+            self._hass.async_create_task(action(now))
+        
+        @callback
+        def _async_unsub():
+            unsub()
+        
+        _async_schedule_next()
+        _LOGGER.debug("Scheduled %s every %s with a phase offset of %d seconds", key, interval, offset)
+        return _async_unsub
+    
+    @asynccontextmanager
+    async def async_ai_call_slot(self, deadlines=()):
+        """Wait for one of the shared AI call slots.
+        
+        The deadlines (asyncio.Timeout) are paused while waiting, so time spent
+        queued behind the AI calls of other aquariums does not count against them.
+        """
+        loop = asyncio.get_running_loop()
+        paused = []
+        if self._ai_calls.locked():
+            for deadline in deadlines:
+                when = deadline.when()
+                if when is not None and not deadline.expired():
+                    paused.append((deadline, when - loop.time()))
+                    deadline.reschedule(None)
+        self.waiting_ai_calls += 1
+        try:
+            await self._ai_calls.acquire()
+        finally:
+            self.waiting_ai_calls -= 1
+            for deadline, remaining in paused:
+                deadline.reschedule(loop.time() + remaining)
+        self.active_ai_calls += 1
+        try:
+            yield
+        finally:
+            self.active_ai_calls -= 1
+            self._ai_calls.release()
+    
+    def as_dict(self):
+        """Return the scheduler state for diagnostics."""
+        return {
+            "max_ai_calls": self.max_ai_calls,
+            "active_ai_calls": self.active_ai_calls,
+            "waiting_ai_calls": self.waiting_ai_calls,
+        }
+
+
+def get_analysis_scheduler(hass: HomeAssistant) -> AnalysisScheduler:
+    """Return the scheduler shared by all aquariums, created on first use."""
+    if DATA_SCHEDULER not in hass.data:
+        hass.data[DATA_SCHEDULER] = AnalysisScheduler(hass, MAX_CONCURRENT_AI_CALLS)
+    return hass.data[DATA_SCHEDULER]
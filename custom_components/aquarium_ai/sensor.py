@@ -3,11 +3,12 @@ import logging
 from datetime import timedelta
 from typing import Optional
 
-from homeassistant.components.sensor import SensorEntity
-from homeassistant.core import HomeAssistant
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
     DOMAIN,
@@ -22,35 +23,13 @@ from .const import (
     CONF_CAMERA,
     CONF_UPDATE_FREQUENCY,
     CONF_AI_TASK,
-    CONF_ANALYZE_TEMPERATURE,
-    CONF_ANALYZE_PH,
-    CONF_ANALYZE_SALINITY,
-    CONF_ANALYZE_DISSOLVED_OXYGEN,
-    CONF_ANALYZE_WATER_LEVEL,
-    CONF_ANALYZE_ORP,
-    DEFAULT_ANALYZE_TEMPERATURE,
-    DEFAULT_ANALYZE_PH,
-    DEFAULT_ANALYZE_SALINITY,
-    DEFAULT_ANALYZE_DISSOLVED_OXYGEN,
-    DEFAULT_ANALYZE_WATER_LEVEL,
-    DEFAULT_ANALYZE_ORP,
     UPDATE_FREQUENCIES,
 )
-from . import get_sensor_info, get_simple_status, get_overall_status
+from .circuit_breaker import BREAKER_STATES, STATE_CLOSED
+from .coordinator import AquariumAICoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
-# Mapping between sensor names and their analyze configuration keys
-# Used to determine if a parameter should be included in overall analysis
-PARAMETER_ANALYZE_CONFIG_MAP = {
-    "Temperature": (CONF_ANALYZE_TEMPERATURE, DEFAULT_ANALYZE_TEMPERATURE),
-    "pH": (CONF_ANALYZE_PH, DEFAULT_ANALYZE_PH),
-    "Salinity": (CONF_ANALYZE_SALINITY, DEFAULT_ANALYZE_SALINITY),
-    "Dissolved Oxygen": (CONF_ANALYZE_DISSOLVED_OXYGEN, DEFAULT_ANALYZE_DISSOLVED_OXYGEN),
-    "Water Level": (CONF_ANALYZE_WATER_LEVEL, DEFAULT_ANALYZE_WATER_LEVEL),
-    "ORP": (CONF_ANALYZE_ORP, DEFAULT_ANALYZE_ORP),
-}
-
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -58,6 +37,7 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up Aquarium AI sensors from a config entry."""
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
     tank_name = config_entry.data[CONF_TANK_NAME]
     aquarium_type = config_entry.data[CONF_AQUARIUM_TYPE]
     ai_task = config_entry.data.get(CONF_AI_TASK)
@@ -83,7 +63,7 @@ async def async_setup_entry(
     for sensor_entity, sensor_name in valid_sensor_mappings:
         entities.append(
             AquariumAISensorAnalysis(
-                hass,
+                coordinator,
                 config_entry,
                 tank_name,
                 aquarium_type,
@@ -98,7 +78,7 @@ async def async_setup_entry(
     # Create overall analysis sensor
     entities.append(
         AquariumAIOverallAnalysis(
-            hass,
+            coordinator,
             config_entry,
             tank_name,
             aquarium_type,
@@ -111,7 +91,7 @@ async def async_setup_entry(
     # Create simple status sensor
     entities.append(
         AquariumAISimpleStatus(
-            hass,
+            coordinator,
             config_entry,
             tank_name,
             aquarium_type,
@@ -123,7 +103,7 @@ async def async_setup_entry(
     # Create status emoji sensor (extracts emoji from simple status)
     entities.append(
         AquariumAIStatusEmoji(
-            hass,
+            coordinator,
             config_entry,
             tank_name,
             aquarium_type,
@@ -135,7 +115,7 @@ async def async_setup_entry(
     # Create quick status sensor (short version of overall status)
     entities.append(
         AquariumAIQuickStatus(
-            hass,
+            coordinator,
             config_entry,
             tank_name,
             aquarium_type,
@@ -147,7 +127,7 @@ async def async_setup_entry(
     # Create water change recommendation sensor
     entities.append(
         AquariumAIWaterChangeRecommendation(
-            hass,
+            coordinator,
             config_entry,
             tank_name,
             aquarium_type,
@@ -162,7 +142,7 @@ async def async_setup_entry(
     if camera:
         entities.append(
             AquariumAICameraAnalysis(
-                hass,
+                coordinator,
                 config_entry,
                 tank_name,
                 aquarium_type,
@@ -173,15 +153,39 @@ async def async_setup_entry(
             )
         )
     
+    # Create the diagnostic analysis interval sensor (adaptive cadence)
+    entities.append(
+        AquariumAIAnalysisInterval(
+            coordinator,
+            config_entry,
+            tank_name,
+            aquarium_type,
+            frequency_minutes,
+            valid_sensor_mappings,
+        )
+    )
+    
+    # Create the diagnostic AI service status sensor (circuit breaker of the AI Task)
+    entities.append(
+        AquariumAIServiceStatus(
+            coordinator,
+            config_entry,
+            tank_name,
+            aquarium_type,
+            frequency_minutes,
+            valid_sensor_mappings,
+        )
+    )
+    
     async_add_entities(entities)
 
 
-class AquariumAIBaseSensor(SensorEntity):
+class AquariumAIBaseSensor(CoordinatorEntity, SensorEntity):
     """Base class for Aquarium AI sensors."""
     
     def __init__(
         self,
-        hass: HomeAssistant,
+        coordinator: AquariumAICoordinator,
         config_entry: ConfigEntry,
         tank_name: str,
         aquarium_type: str,
@@ -189,7 +193,7 @@ class AquariumAIBaseSensor(SensorEntity):
         sensor_mappings: list,
     ):
         """Initialize the base sensor."""
-        self._hass = hass
+        super().__init__(coordinator)
         self._config_entry = config_entry
         self._tank_name = tank_name
         self._aquarium_type = aquarium_type
@@ -200,19 +204,29 @@ class AquariumAIBaseSensor(SensorEntity):
         
     async def async_added_to_hass(self) -> None:
         """When entity is added to hass."""
+        await super().async_added_to_hass()
         # Initial update
-        await self.async_update()
+        self._update_from_coordinator()
+    
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Refresh the entity state after new analysis results or source readings."""
+        self._update_from_coordinator()
+        self.async_write_ha_state()
+    
+    def _update_from_coordinator(self) -> None:
+        """Update the entity state from the coordinator data."""
         
     def _get_shared_data(self):
-        """Get shared analysis data from the integration."""
-        if DOMAIN in self._hass.data and self._config_entry.entry_id in self._hass.data[DOMAIN]:
-            entry_data = self._hass.data[DOMAIN][self._config_entry.entry_id]
-            return {
-                "sensor_analysis": entry_data.get("sensor_analysis", {}),
-                "sensor_data": entry_data.get("sensor_data", []),
-                "last_update": entry_data.get("last_update")
-            }
-        return {"sensor_analysis": {}, "sensor_data": [], "last_update": None}
+        """Get shared analysis data from the coordinator."""
+        data = self.coordinator.data
+        return {
+            "sensor_analysis": data.sensor_analysis,
+            "sensor_data": data.sensor_data,
+            "status": data.status,
+            "last_update": data.last_update,
+            "carried_over": data.carried_over,
+        }
         
     @property
     def available(self) -> bool:
@@ -241,7 +255,7 @@ class AquariumAISensorAnalysis(AquariumAIBaseSensor):
     
     def __init__(
         self,
-        hass: HomeAssistant,
+        coordinator: AquariumAICoordinator,
         config_entry: ConfigEntry,
         tank_name: str,
         aquarium_type: str,
@@ -252,7 +266,7 @@ class AquariumAISensorAnalysis(AquariumAIBaseSensor):
         sensor_mappings: list,
     ):
         """Initialize the sensor analysis."""
-        super().__init__(hass, config_entry, tank_name, aquarium_type, frequency_minutes, sensor_mappings)
+        super().__init__(coordinator, config_entry, tank_name, aquarium_type, frequency_minutes, sensor_mappings)
         self._sensor_entity = sensor_entity
         self._sensor_name = sensor_name
         self._ai_task = ai_task
@@ -278,11 +292,11 @@ class AquariumAISensorAnalysis(AquariumAIBaseSensor):
         """Return the state attributes."""
         return self._attr_extra_state_attributes
         
-    async def async_update(self) -> None:
+    def _update_from_coordinator(self) -> None:
         """Update the sensor."""
         try:
             # Get sensor info to check availability
-            sensor_info = get_sensor_info(self._hass, self._sensor_entity, self._sensor_name)
+            sensor_info = self.coordinator.readings.get(self._sensor_name)
             if not sensor_info:
                 self._state = "Sensor unavailable"
                 self._available = False
@@ -302,11 +316,14 @@ class AquariumAISensorAnalysis(AquariumAIBaseSensor):
                 # Use the AI analysis from the shared update
                 self._state = sensor_analysis[analysis_key]
                 analysis_source = "AI"
+                # Incremental analyses keep the text of parameters that did not change
+                analysis_freshness = "carried_over" if analysis_key in shared_data["carried_over"] else "fresh"
             else:
                 # Fallback to simple status if no AI analysis available
-                status = get_simple_status(sensor_info['name'], sensor_info['raw_value'], sensor_info['unit'], self._aquarium_type)
+                status = self.coordinator.reading_statuses[self._sensor_name]
                 self._state = f"{sensor_info['name']} is {status} at {sensor_info['value']}"
                 analysis_source = "Fallback"
+                analysis_freshness = None
             
             # Add attributes with sensor info and analysis metadata
             self._attr_extra_state_attributes = {
@@ -316,6 +333,7 @@ class AquariumAISensorAnalysis(AquariumAIBaseSensor):
                 "unit": sensor_info['unit'],
                 "source_entity": self._sensor_entity,
                 "analysis_source": analysis_source,
+                "analysis_freshness": analysis_freshness,
                 "aquarium_type": self._aquarium_type,
                 "last_updated": shared_data.get("last_update"),
             }
@@ -332,7 +350,7 @@ class AquariumAIOverallAnalysis(AquariumAIBaseSensor):
     
     def __init__(
         self,
-        hass: HomeAssistant,
+        coordinator: AquariumAICoordinator,
         config_entry: ConfigEntry,
         tank_name: str,
         aquarium_type: str,
@@ -341,7 +359,7 @@ class AquariumAIOverallAnalysis(AquariumAIBaseSensor):
         sensor_mappings: list,
     ):
         """Initialize the overall analysis sensor."""
-        super().__init__(hass, config_entry, tank_name, aquarium_type, frequency_minutes, sensor_mappings)
+        super().__init__(coordinator, config_entry, tank_name, aquarium_type, frequency_minutes, sensor_mappings)
         self._ai_task = ai_task
         self._attr_name = f"{tank_name} Overall Analysis"
         self._attr_unique_id = f"{config_entry.entry_id}_overall_analysis"
@@ -353,29 +371,12 @@ class AquariumAIOverallAnalysis(AquariumAIBaseSensor):
         """Return the state attributes."""
         return self._attr_extra_state_attributes
         
-    async def async_update(self) -> None:
+    def _update_from_coordinator(self) -> None:
         """Update the sensor."""
         try:
-            # Get all sensor data to check availability, respecting parameter switches
-            sensor_data = []
-            for sensor_entity, sensor_name in self._sensor_mappings:
-                # Check if this parameter's analysis switch is enabled
-                # Only sensors with analyze config switches are checked; 
-                # other sensors (if any) are included by default
-                if sensor_name in PARAMETER_ANALYZE_CONFIG_MAP:
-                    analyze_conf, default_analyze = PARAMETER_ANALYZE_CONFIG_MAP[sensor_name]
-                    analyze_enabled = self._config_entry.data.get(analyze_conf, default_analyze)
-                    
-                    if not analyze_enabled:
-                        _LOGGER.debug(
-                            "Skipping %s in overall analysis (toggle disabled)", 
-                            sensor_name
-                        )
-                        continue
-                
-                sensor_info = get_sensor_info(self._hass, sensor_entity, sensor_name)
-                if sensor_info:
-                    sensor_data.append(sensor_info)
+            # Live readings of the parameters enabled for analysis, with their statuses
+            sensor_data = self.coordinator.live_sensor_data
+            live_status = self.coordinator.live_status
             
             if not sensor_data:
                 self._state = "No sensor data available"
@@ -395,7 +396,7 @@ class AquariumAIOverallAnalysis(AquariumAIBaseSensor):
                 analysis_source = "AI"
             else:
                 # Fallback to simple overall status
-                self._state = get_overall_status(sensor_data, self._aquarium_type)
+                self._state = live_status.overall_message
                 analysis_source = "Fallback"
             
             # Add attributes with all sensor information
@@ -405,7 +406,7 @@ class AquariumAIOverallAnalysis(AquariumAIBaseSensor):
                     "value": info['value'],
                     "raw_value": info['raw_value'],
                     "unit": info['unit'],
-                    "status": get_simple_status(info['name'], info['raw_value'], info['unit'], self._aquarium_type)
+                    "status": live_status.statuses[info['name']]
                 }
             
             self._attr_extra_state_attributes = {
@@ -413,6 +414,7 @@ class AquariumAIOverallAnalysis(AquariumAIBaseSensor):
                 "total_sensors": len(sensor_data),
                 "aquarium_type": self._aquarium_type,
                 "analysis_source": analysis_source,
+                "carried_over_analyses": list(shared_data["carried_over"]),
                 "last_updated": shared_data.get("last_update"),
                 "ai_task": self._ai_task,
             }
@@ -429,7 +431,7 @@ class AquariumAISimpleStatus(AquariumAIBaseSensor):
     
     def __init__(
         self,
-        hass: HomeAssistant,
+        coordinator: AquariumAICoordinator,
         config_entry: ConfigEntry,
         tank_name: str,
         aquarium_type: str,
@@ -437,7 +439,7 @@ class AquariumAISimpleStatus(AquariumAIBaseSensor):
         sensor_mappings: list,
     ):
         """Initialize the simple status sensor."""
-        super().__init__(hass, config_entry, tank_name, aquarium_type, frequency_minutes, sensor_mappings)
+        super().__init__(coordinator, config_entry, tank_name, aquarium_type, frequency_minutes, sensor_mappings)
         self._attr_name = f"{tank_name} Simple Status"
         self._attr_unique_id = f"{config_entry.entry_id}_simple_status"
         self._attr_icon = "mdi:check-circle"
@@ -448,7 +450,7 @@ class AquariumAISimpleStatus(AquariumAIBaseSensor):
         """Return the state attributes."""
         return self._attr_extra_state_attributes
         
-    async def async_update(self) -> None:
+    def _update_from_coordinator(self) -> None:
         """Update the sensor."""
         try:
             # Get shared sensor data (already filtered by parameter toggles)
@@ -465,34 +467,22 @@ class AquariumAISimpleStatus(AquariumAIBaseSensor):
                 
             self._available = True
             
-            # Use existing simple status logic
-            self._state = get_overall_status(sensor_data, self._aquarium_type)
+            # Statuses were computed once when the analyzed readings were stored
+            status = shared_data["status"]
+            self._state = status.overall_message
             
             # Collect individual sensor statuses for attributes
             individual_statuses = {}
-            statuses = []
             for info in sensor_data:
-                status = get_simple_status(info['name'], info['raw_value'], info['unit'], self._aquarium_type)
                 individual_statuses[info['name']] = {
-                    "status": status,
+                    "status": status.statuses[info['name']],
                     "value": info['value'],
                     "unit": info['unit']
                 }
-                statuses.append(status)
-            
-            # Calculate status distribution
-            good_count = statuses.count("Good")
-            ok_count = statuses.count("OK")
-            problem_count = len([s for s in statuses if s in ["Check", "Adjust", "Low", "High"]])
             
             self._attr_extra_state_attributes = {
                 "individual_statuses": individual_statuses,
-                "status_summary": {
-                    "good": good_count,
-                    "ok": ok_count,
-                    "problems": problem_count,
-                    "total": len(statuses)
-                },
+                "status_summary": status.counts,
                 "aquarium_type": self._aquarium_type,
                 "last_updated": shared_data.get("last_update"),
             }
@@ -509,7 +499,7 @@ class AquariumAIStatusEmoji(AquariumAIBaseSensor):
     
     def __init__(
         self,
-        hass: HomeAssistant,
+        coordinator: AquariumAICoordinator,
         config_entry: ConfigEntry,
         tank_name: str,
         aquarium_type: str,
@@ -517,7 +507,7 @@ class AquariumAIStatusEmoji(AquariumAIBaseSensor):
         sensor_mappings: list,
     ):
         """Initialize the status emoji sensor."""
-        super().__init__(hass, config_entry, tank_name, aquarium_type, frequency_minutes, sensor_mappings)
+        super().__init__(coordinator, config_entry, tank_name, aquarium_type, frequency_minutes, sensor_mappings)
         self._attr_name = f"{tank_name} Status Emoji"
         self._attr_unique_id = f"{config_entry.entry_id}_status_emoji"
         self._attr_icon = "mdi:emoticon-happy-outline"
@@ -528,7 +518,7 @@ class AquariumAIStatusEmoji(AquariumAIBaseSensor):
         """Return the state attributes."""
         return self._attr_extra_state_attributes
         
-    async def async_update(self) -> None:
+    def _update_from_coordinator(self) -> None:
         """Update the sensor."""
         try:
             # Get shared sensor data (already filtered by parameter toggles)
@@ -545,40 +535,13 @@ class AquariumAIStatusEmoji(AquariumAIBaseSensor):
                 
             self._available = True
             
-            # Use existing simple status logic to get the full status message
-            full_status = get_overall_status(sensor_data, self._aquarium_type)
-            
-            # Extract emoji from the status message
-            # Possible emojis based on aquarium status levels
-            possible_emojis = ["🌟", "👍", "👌", "⚠️", "🚨"]
-            
-            # Extract the emoji by finding it in the message
-            extracted_emoji = "❓"  # Default if no emoji found
-            for emoji in possible_emojis:
-                if emoji in full_status:
-                    extracted_emoji = emoji
-                    break
-            
-            self._state = extracted_emoji
-            
-            # Calculate status distribution for context
-            statuses = []
-            for info in sensor_data:
-                status = get_simple_status(info['name'], info['raw_value'], info['unit'], self._aquarium_type)
-                statuses.append(status)
-            
-            good_count = statuses.count("Good")
-            ok_count = statuses.count("OK")
-            problem_count = len([s for s in statuses if s in ["Check", "Adjust", "Low", "High"]])
+            # Statuses were computed once when the analyzed readings were stored
+            status = shared_data["status"]
+            self._state = status.emoji
             
             self._attr_extra_state_attributes = {
-                "full_status_message": full_status,
-                "status_summary": {
-                    "good": good_count,
-                    "ok": ok_count,
-                    "problems": problem_count,
-                    "total": len(statuses)
-                },
+                "full_status_message": status.overall_message,
+                "status_summary": status.counts,
                 "aquarium_type": self._aquarium_type,
                 "last_updated": shared_data.get("last_update"),
             }
@@ -595,7 +558,7 @@ class AquariumAIQuickStatus(AquariumAIBaseSensor):
     
     def __init__(
         self,
-        hass: HomeAssistant,
+        coordinator: AquariumAICoordinator,
         config_entry: ConfigEntry,
         tank_name: str,
         aquarium_type: str,
@@ -603,7 +566,7 @@ class AquariumAIQuickStatus(AquariumAIBaseSensor):
         sensor_mappings: list,
     ):
         """Initialize the quick status sensor."""
-        super().__init__(hass, config_entry, tank_name, aquarium_type, frequency_minutes, sensor_mappings)
+        super().__init__(coordinator, config_entry, tank_name, aquarium_type, frequency_minutes, sensor_mappings)
         self._attr_name = f"{tank_name} Quick Status"
         self._attr_unique_id = f"{config_entry.entry_id}_quick_status"
         self._attr_icon = "mdi:speedometer"
@@ -614,7 +577,7 @@ class AquariumAIQuickStatus(AquariumAIBaseSensor):
         """Return the state attributes."""
         return self._attr_extra_state_attributes
         
-    async def async_update(self) -> None:
+    def _update_from_coordinator(self) -> None:
         """Update the sensor."""
         try:
             # Get shared sensor data (already filtered by parameter toggles)
@@ -631,58 +594,25 @@ class AquariumAIQuickStatus(AquariumAIBaseSensor):
                 
             self._available = True
             
-            # Collect all individual sensor statuses
-            statuses = []
+            # Statuses were computed once when the analyzed readings were stored
+            status = shared_data["status"]
             sensor_details = {}
             for info in sensor_data:
-                status = get_simple_status(info['name'], info['raw_value'], info['unit'], self._aquarium_type)
-                statuses.append(status)
                 sensor_details[info['name']] = {
-                    "status": status,
+                    "status": status.statuses[info['name']],
                     "value": info['value'],
                     "raw_value": info['raw_value'],
                     "unit": info['unit']
                 }
             
-            # Count different status types
-            good_count = statuses.count("Good")
-            ok_count = statuses.count("OK") 
-            problem_count = len([s for s in statuses if s in ["Check", "Adjust", "Low", "High"]])
-            
-            total_sensors = len(statuses)
-            
-            # Determine quick status based on sensor status distribution
-            if good_count == total_sensors:
-                self._state = "Excellent"
-                status_level = 5
-            elif good_count >= total_sensors * 0.75:  # 75% or more good
-                self._state = "Great"
-                status_level = 4
-            elif (good_count + ok_count) >= total_sensors * 0.8:  # 80% or more good/ok
-                self._state = "Good"
-                status_level = 3
-            elif problem_count <= total_sensors * 0.4:  # Less than 40% problems
-                self._state = "OK"
-                status_level = 2
-            else:
-                self._state = "Needs Attention"
-                status_level = 1
+            self._state = status.quick_status
             
             # Add comprehensive attributes
             self._attr_extra_state_attributes = {
                 "sensor_details": sensor_details,
-                "status_counts": {
-                    "good": good_count,
-                    "ok": ok_count,
-                    "problems": problem_count,
-                    "total": total_sensors
-                },
-                "status_percentages": {
-                    "good_percent": round((good_count / total_sensors) * 100, 1) if total_sensors > 0 else 0,
-                    "ok_percent": round((ok_count / total_sensors) * 100, 1) if total_sensors > 0 else 0,
-                    "problem_percent": round((problem_count / total_sensors) * 100, 1) if total_sensors > 0 else 0
-                },
-                "status_level": status_level,
+                "status_counts": status.counts,
+                "status_percentages": status.percentages,
+                "status_level": status.level,
                 "aquarium_type": self._aquarium_type,
                 "last_updated": shared_data.get("last_update"),
             }
@@ -699,7 +629,7 @@ class AquariumAIWaterChangeRecommendation(AquariumAIBaseSensor):
     
     def __init__(
         self,
-        hass: HomeAssistant,
+        coordinator: AquariumAICoordinator,
         config_entry: ConfigEntry,
         tank_name: str,
         aquarium_type: str,
@@ -708,7 +638,7 @@ class AquariumAIWaterChangeRecommendation(AquariumAIBaseSensor):
         sensor_mappings: list,
     ):
         """Initialize the water change recommendation sensor."""
-        super().__init__(hass, config_entry, tank_name, aquarium_type, frequency_minutes, sensor_mappings)
+        super().__init__(coordinator, config_entry, tank_name, aquarium_type, frequency_minutes, sensor_mappings)
         self._ai_task = ai_task
         self._attr_name = f"{tank_name} Water Change Recommendation"
         self._attr_unique_id = f"{config_entry.entry_id}_water_change_recommendation"
@@ -720,7 +650,7 @@ class AquariumAIWaterChangeRecommendation(AquariumAIBaseSensor):
         """Return the state attributes."""
         return self._attr_extra_state_attributes
         
-    async def async_update(self) -> None:
+    def _update_from_coordinator(self) -> None:
         """Update the sensor."""
         try:
             # Get shared analysis data
@@ -756,7 +686,7 @@ class AquariumAICameraAnalysis(AquariumAIBaseSensor):
     
     def __init__(
         self,
-        hass: HomeAssistant,
+        coordinator: AquariumAICoordinator,
         config_entry: ConfigEntry,
         tank_name: str,
         aquarium_type: str,
@@ -766,7 +696,7 @@ class AquariumAICameraAnalysis(AquariumAIBaseSensor):
         sensor_mappings: list,
     ):
         """Initialize the camera analysis sensor."""
-        super().__init__(hass, config_entry, tank_name, aquarium_type, frequency_minutes, sensor_mappings)
+        super().__init__(coordinator, config_entry, tank_name, aquarium_type, frequency_minutes, sensor_mappings)
         self._camera = camera
         self._ai_task = ai_task
         self._attr_name = f"{tank_name} Camera Analysis"
@@ -779,7 +709,7 @@ class AquariumAICameraAnalysis(AquariumAIBaseSensor):
         """Return the state attributes."""
         return self._attr_extra_state_attributes
         
-    async def async_update(self) -> None:
+    def _update_from_coordinator(self) -> None:
         """Update the sensor."""
         try:
             # Get shared analysis data
@@ -810,4 +740,91 @@ class AquariumAICameraAnalysis(AquariumAIBaseSensor):
             _LOGGER.error("Error updating camera analysis sensor: %s", err)
             self._state = "Analysis unavailable"
             self._available = False
-            self._attr_extra_state_attributes = {}
\ No newline at end of file
+            self._attr_extra_state_attributes = {}
+
+
+class AquariumAIServiceStatus(AquariumAIBaseSensor):
+    """Diagnostic sensor for the circuit breaker of the AI Task entity."""
+    
+    def __init__(
+        self,
+        coordinator: AquariumAICoordinator,
+        config_entry: ConfigEntry,
+        tank_name: str,
+        aquarium_type: str,
+        frequency_minutes: Optional[int],
+        sensor_mappings: list,
+    ):
+        """Initialize the AI service status sensor."""
+        super().__init__(coordinator, config_entry, tank_name, aquarium_type, frequency_minutes, sensor_mappings)
+        self._attr_name = f"{tank_name} AI Service Status"
+        self._attr_unique_id = f"{config_entry.entry_id}_ai_service_status"
+        self._attr_device_class = SensorDeviceClass.ENUM
+        self._attr_options = list(BREAKER_STATES)
+        self._attr_extra_state_attributes = {}
+    
+    @property
+    def entity_category(self):
+        """Return the entity category."""
+        return EntityCategory.DIAGNOSTIC
+    
+    @property
+    def extra_state_attributes(self):
+        """Return the state attributes."""
+        return self._attr_extra_state_attributes
+    
+    async def async_added_to_hass(self) -> None:
+        """Follow the circuit breaker, which changes without new analysis results."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.circuit_breaker.async_add_listener(self._handle_coordinator_update)
+        )
+    
+    def _update_from_coordinator(self) -> None:
+        """Update the sensor."""
+        breaker_state = self.coordinator.circuit_breaker.as_dict()
+        self._state = breaker_state.pop("state")
+        self._attr_icon = "mdi:robot" if self._state == STATE_CLOSED else "mdi:robot-off"
+        self._attr_extra_state_attributes = breaker_state
+
+
+class AquariumAIAnalysisInterval(AquariumAIBaseSensor):
+    """Diagnostic sensor for the effective interval of the automatic analyses."""
+    
+    def __init__(
+        self,
+        coordinator: AquariumAICoordinator,
+        config_entry: ConfigEntry,
+        tank_name: str,
+        aquarium_type: str,
+        frequency_minutes: Optional[int],
+        sensor_mappings: list,
+    ):
+        """Initialize the analysis interval sensor."""
+        super().__init__(coordinator, config_entry, tank_name, aquarium_type, frequency_minutes, sensor_mappings)
+        self._attr_name = f"{tank_name} Analysis Interval"
+        self._attr_unique_id = f"{config_entry.entry_id}_analysis_interval"
+        self._attr_icon = "mdi:timer-outline"
+        self._attr_native_unit_of_measurement = "min"
+        self._attr_extra_state_attributes = {}
+    
+    @property
+    def entity_category(self):
+        """Return the entity category."""
+        return EntityCategory.DIAGNOSTIC
+    
+    @property
+    def extra_state_attributes(self):
+        """Return the state attributes."""
+        return self._attr_extra_state_attributes
+    
+    def _update_from_coordinator(self) -> None:
+        """Update the sensor."""
+        cadence = self.coordinator.cadence
+        if cadence is None:
+            # Manual analysis only
+            self._state = None
+            self._attr_extra_state_attributes = {"adaptive": False}
+            return
+        self._state = cadence.interval
+        self._attr_extra_state_attributes = cadence.as_dict()
@@ -0,0 +1,36 @@
+"""Tests for the Aquarium AI integration."""
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from custom_components.aquarium_ai.const import DOMAIN
+
+CONFIG_DATA = {
+    "tank_name": "Reef",
+    "aquarium_type": "Marine",
+    "ai_task": "ai_task.fake",
+    "temperature_sensor": "sensor.temperature",
+    "ph_sensor": "sensor.ph",
+    "update_frequency": "1_hour",
+    "auto_notifications": False,
+}
+
+
+async def async_setup_aquarium(hass: HomeAssistant, entry_id=None, **data):
+    """Set up an aquarium reading a temperature and a pH sensor, returning its coordinator."""
+    if hass.states.get("sensor.temperature") is None:
+        hass.states.async_set("sensor.temperature", "25.1", {"unit_of_measurement": "°C"})
+        hass.states.async_set("sensor.ph", "8.3", {})
+    await async_setup_component(hass, "persistent_notification", {})
+    config_data = {**CONFIG_DATA, **data}
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data=config_data,
+        title=config_data["tank_name"],
+        **({"entry_id": entry_id} if entry_id else {}),
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return hass.data[DOMAIN][entry.entry_id]
@@ -0,0 +1,53 @@
+"""Fixtures for the Aquarium AI tests."""
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockModule, mock_integration
+
+from homeassistant.core import HomeAssistant, SupportsResponse
+
+pytest_plugins = "pytest_homeassistant_custom_component"
+
+
+class FakeAITask:
+    """Stand-in for the ai_task.generate_data service, recording every call."""
+    
+    def __init__(self):
+        """Answer every call after delay seconds, or raise error when it is set."""
+        self.calls = []
+        self.delay = 0
+        self.error = None
+        self.active = 0
+        self.peak = 0
+    
+    async def async_generate_data(self, call):
+        """Return a text for every requested field."""
+        self.calls.append(dict(call.data))
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        if self.error is not None:
+            raise self.error
+        return {"data": {key: f"AI text for {key}" for key in call.data["structure"]}}
+
+
+@pytest.fixture(autouse=True)
+def no_retry_delay():
+    """Retry failed AI calls right away."""
+    with patch("custom_components.aquarium_ai.coordinator.AI_TASK_RETRY_BASE_DELAY", 0):
+        yield
+
+
+@pytest.fixture
+async def ai_task(hass: HomeAssistant, enable_custom_integrations):
+    """Provide the ai_task integration with a fake generate_data service."""
+    mock_integration(hass, MockModule("ai_task"))
+    fake = FakeAITask()
+    hass.services.async_register(
+        "ai_task", "generate_data", fake.async_generate_data, supports_response=SupportsResponse.ONLY
+    )
+    return fake
@@ -0,0 +1,88 @@
+"""Tests for the compiled AI analysis plan."""
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.aquarium_ai.analysis_plan import AnalysisPlan
+from custom_components.aquarium_ai.const import DOMAIN
+
+from . import CONFIG_DATA, async_setup_aquarium
+
+PLAN_DATA = {
+    **CONFIG_DATA,
+    "salinity_sensor": "sensor.salinity",
+    "camera": "camera.reef",
+    "analyze_camera": True,
+    "tank_volume": "300 L",
+    "filtration": "Sump with protein skimmer",
+    "water_change_frequency": "10% weekly",
+    "inhabitants": "Clownfish, soft corals",
+    "misc_info": "Dosing two part",
+}
+
+
+def _sensor_data(temperature, ph, salinity):
+    """Return readings in the format of get_sensor_info."""
+    return [
+        {"name": "Temperature", "value": f"{temperature}°C", "raw_value": temperature, "unit": "°C"},
+        {"name": "pH", "value": ph, "raw_value": ph, "unit": ""},
+        {"name": "Salinity", "value": f"{salinity} ppt", "raw_value": salinity, "unit": "ppt"},
+    ]
+
+
+def test_prompt_prefix_is_stable() -> None:
+    """Readings and times only ever follow the static prompt prefix."""
+    plan = AnalysisPlan(MockConfigEntry(domain=DOMAIN, data=PLAN_DATA))
+    prefix, prefix_hash = plan.prompt_prefix, plan.prompt_prefix_hash
+    
+    first = plan.build_request("Reef", _sensor_data("25.1", "8.3", "35.0"), "2026-10-01 09:15:00")
+    second = plan.build_request("Reef", _sensor_data("27.9", "7.6", "31.2"), "2026-10-16 18:42:07")
+    brief = plan.build_request("Reef", _sensor_data("25.1", "8.3", "35.0")[:1], details=False)
+    detailed = plan.build_request("Reef", _sensor_data("25.1", "8.3", "35.0"), brief=False)
+    
+    for request in (first, second, brief, detailed):
+        head, _, conditions = request["instructions"].partition("\n\nCurrent conditions:\n\n")
+        assert head == prefix
+        assert conditions
+    for volatile in ("25.1", "27.9", "8.3", "7.6", "35.0", "31.2", "2026-10-"):
+        assert volatile not in prefix
+    assert plan.prompt_prefix == prefix
+    assert plan.prompt_prefix_hash == prefix_hash
+    assert "Clownfish, soft corals" in prefix
+    
+    # Compiling the same configuration again (a reload or restart) gives the same prefix
+    recompiled = AnalysisPlan(MockConfigEntry(domain=DOMAIN, data=PLAN_DATA))
+    assert recompiled.prompt_prefix == prefix
+    assert recompiled.prompt_prefix_hash == prefix_hash
+
+
+def test_prompt_prefix_follows_configuration() -> None:
+    """A configuration change gives a new prefix and hash."""
+    plan = AnalysisPlan(MockConfigEntry(domain=DOMAIN, data=PLAN_DATA))
+    changed = AnalysisPlan(MockConfigEntry(domain=DOMAIN, data={**PLAN_DATA, "inhabitants": "Tangs"}))
+    
+    assert changed.prompt_prefix != plan.prompt_prefix
+    assert changed.prompt_prefix_hash != plan.prompt_prefix_hash
+
+
+async def test_prompt_prefix_stable_across_runs(hass: HomeAssistant, ai_task, freezer) -> None:
+    """Analyses at different times with different readings send the same prefix."""
+    hass.states.async_set("input_datetime.last_water_change", "2026-10-01 09:15:00", {})
+    coordinator = await async_setup_aquarium(hass, last_water_change="input_datetime.last_water_change")
+    prefix_hash = coordinator.plan.prompt_prefix_hash
+    
+    await coordinator.async_run_analysis(None)
+    freezer.tick(3600)
+    hass.states.async_set("sensor.ph", "7.9", {})
+    hass.states.async_set("input_datetime.last_water_change", "2026-10-16 18:42:07", {})
+    await hass.async_block_till_done()
+    await coordinator.async_run_analysis(None)
+    
+    assert len(ai_task.calls) == 2
+    first, second = (call["instructions"] for call in ai_task.calls)
+    assert first != second
+    assert first.startswith(coordinator.plan.prompt_prefix)
+    assert second.startswith(coordinator.plan.prompt_prefix)
+    assert "- pH: 7.9 (no units)" in second[len(coordinator.plan.prompt_prefix):]
+    assert "2026-10-16" in second[len(coordinator.plan.prompt_prefix):]
+    assert coordinator.plan.prompt_prefix_hash == prefix_hash
@@ -0,0 +1,141 @@
+"""Tests for the retries and the circuit breaker of the AI Task calls."""
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+import voluptuous as vol
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError, ServiceNotFound, ServiceValidationError
+import homeassistant.util.dt as dt_util
+
+from custom_components.aquarium_ai.const import (
+    AI_TASK_MAX_ATTEMPTS,
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+    CIRCUIT_BREAKER_RECOVERY_TIME,
+)
+
+from . import async_setup_aquarium
+
+STATUS_SENSOR = "sensor.reef_ai_service_status"
+
+
+def _after_recovery_time(breaker):
+    """Patch the breaker clock to just after the recovery time of the open breaker."""
+    mock_time = patch("custom_components.aquarium_ai.circuit_breaker.time").start()
+    mock_time.monotonic.return_value = breaker._retry_at + 1
+
+
+async def test_provider_errors_are_retried(hass: HomeAssistant, ai_task) -> None:
+    """An error reported by the AI provider is retried and counted by the breaker."""
+    coordinator = await async_setup_aquarium(hass)
+    ai_task.error = HomeAssistantError("Error talking to OpenAI API")
+    
+    assert await coordinator.async_run_analysis(None) is None
+    
+    breaker = coordinator.circuit_breaker
+    assert len(ai_task.calls) == AI_TASK_MAX_ATTEMPTS
+    assert breaker.consecutive_failures == AI_TASK_MAX_ATTEMPTS
+    assert breaker.last_error == "Error talking to OpenAI API"
+    assert breaker.state == "closed"
+    # The local analysis is published in place of the AI analysis
+    assert "local" in coordinator.data.timings
+    
+    ai_task.error = None
+    assert await coordinator.async_run_analysis(None)
+    assert len(ai_task.calls) == AI_TASK_MAX_ATTEMPTS + 1
+    assert breaker.consecutive_failures == 0
+    assert breaker.total_failures == AI_TASK_MAX_ATTEMPTS
+
+
+async def test_breaker_opens_and_recovers(hass: HomeAssistant, ai_task) -> None:
+    """The breaker opens after repeated failures, allows one trial call and closes on success."""
+    coordinator = await async_setup_aquarium(hass)
+    breaker = coordinator.circuit_breaker
+    assert hass.states.get(STATUS_SENSOR).state == "closed"
+    ai_task.error = HomeAssistantError("Rate limit exceeded")
+    
+    await coordinator.async_run_analysis(None)
+    await coordinator.async_run_analysis(None)
+    await hass.async_block_till_done()
+    
+    assert len(ai_task.calls) == CIRCUIT_BREAKER_FAILURE_THRESHOLD
+    assert breaker.state == "open"
+    state = hass.states.get(STATUS_SENSOR)
+    assert state.state == "open"
+    assert state.attributes["total_failures"] == CIRCUIT_BREAKER_FAILURE_THRESHOLD
+    assert state.attributes["retry_at"]
+    
+    # No call is made while the breaker is open
+    await coordinator.async_run_analysis(None)
+    assert len(ai_task.calls) == CIRCUIT_BREAKER_FAILURE_THRESHOLD
+    assert "local" in coordinator.data.timings
+    
+    try:
+        _after_recovery_time(breaker)
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=CIRCUIT_BREAKER_RECOVERY_TIME))
+        await hass.async_block_till_done()
+        assert breaker.state == "half_open"
+        assert hass.states.get(STATUS_SENSOR).state == "half_open"
+        
+        # A failed trial call opens the breaker again without retrying
+        await coordinator.async_run_analysis(None)
+        assert len(ai_task.calls) == CIRCUIT_BREAKER_FAILURE_THRESHOLD + 1
+        assert breaker.state == "open"
+    finally:
+        patch.stopall()
+    
+    try:
+        _after_recovery_time(breaker)
+        assert breaker.state == "half_open"
+        ai_task.error = None
+        assert await coordinator.async_run_analysis(None)
+        await hass.async_block_till_done()
+    finally:
+        patch.stopall()
+    
+    assert len(ai_task.calls) == CIRCUIT_BREAKER_FAILURE_THRESHOLD + 2
+    assert breaker.state == "closed"
+    assert breaker.consecutive_failures == 0
+    assert hass.states.get(STATUS_SENSOR).state == "closed"
+
+
+async def test_half_open_allows_one_trial(hass: HomeAssistant, ai_task) -> None:
+    """Only one trial call is allowed while the breaker is half open."""
+    coordinator = await async_setup_aquarium(hass)
+    breaker = coordinator.circuit_breaker
+    for _ in range(CIRCUIT_BREAKER_FAILURE_THRESHOLD):
+        breaker.record_failure(HomeAssistantError("Service unavailable"))
+    assert not breaker.allow_request()
+    
+    try:
+        _after_recovery_time(breaker)
+        assert breaker.allow_request()
+        assert not breaker.allow_request()
+        # A trial call that was cancelled gives back its slot
+        breaker.release_request()
+        assert breaker.allow_request()
+    finally:
+        patch.stopall()
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        ServiceNotFound("ai_task", "generate_data"),
+        ServiceValidationError("Entity ai_task.fake not found"),
+        vol.Invalid("extra keys not allowed"),
+    ],
+)
+async def test_configuration_errors_are_not_retried(hass: HomeAssistant, ai_task, error) -> None:
+    """A configuration error is raised right away and not counted by the breaker."""
+    coordinator = await async_setup_aquarium(hass)
+    ai_task.error = error
+    
+    assert await coordinator.async_run_analysis(None) is None
+    
+    breaker = coordinator.circuit_breaker
+    assert len(ai_task.calls) == 1
+    assert breaker.total_failures == 0
+    assert breaker.state == "closed"
@@ -0,0 +1,283 @@
+"""Tests for the parameter status classifier."""
+import math
+
+import pytest
+
+from custom_components.aquarium_ai.classifier import (
+    ParameterClassifier,
+    classify_tanks,
+    get_classifier,
+    get_tank_class,
+)
+from custom_components.aquarium_ai.const import PARAMETER_RANGES
+from custom_components.aquarium_ai.helpers import get_simple_status
+
+PARAMETERS = ["Temperature", "pH", "Salinity", "Dissolved Oxygen", "Water Level", "ORP", "Nitrate"]
+AQUARIUM_TYPES = ["Freshwater", "Marine", "Reef", "Saltwater", "Brackish", "Marine Reef", "Tropical", ""]
+UNITS = [
+    "", "°C", "C", "celsius", "°F", "°f", "F", "fahrenheit", "Fahrenheit",
+    "SG", "sg", "specific_gravity", "mS/cm", "ms/cm", "MS/CM", "ppt", "psu",
+    "ppm", "PPM", "parts_per_million", "%", "percent", "saturation", "mg/L",
+    "cm", "in", "mV",
+]
+NON_NUMERIC_VALUES = [
+    None, "", "Normal", "normal", "GOOD", "excellent", "ok", "High", "LOW",
+    "warning", "unknown", "unavailable", "bogus", "25,5", [], {},
+]
+
+
+def _baseline_get_simple_status(sensor_name, value, unit="", aquarium_type=""):
+    """Frozen copy of the if/elif get_simple_status the classifier replaced."""
+    try:
+        numeric_value = float(value)
+        
+        if sensor_name == "Temperature":
+            if unit.lower() in ["°f", "f", "fahrenheit"]:
+                if 76 <= numeric_value <= 79:
+                    return "Good"
+                elif 72 <= numeric_value <= 82:
+                    return "OK"
+                else:
+                    return "Check"
+            else:
+                if 24 <= numeric_value <= 26:
+                    return "Good"
+                elif 22 <= numeric_value <= 28:
+                    return "OK"
+                else:
+                    return "Check"
+        
+        elif sensor_name == "pH":
+            aquarium_type_lower = aquarium_type.lower()
+            if "saltwater" in aquarium_type_lower or "marine" in aquarium_type_lower or "reef" in aquarium_type_lower:
+                if 8.2 <= numeric_value <= 8.4:
+                    return "Good"
+                elif 8.0 <= numeric_value <= 8.6:
+                    return "OK"
+                else:
+                    return "Adjust"
+            else:
+                if 6.5 <= numeric_value <= 8.0:
+                    return "Good"
+                elif 6.0 <= numeric_value <= 8.5:
+                    return "OK"
+                else:
+                    return "Adjust"
+        
+        elif sensor_name == "Salinity":
+            if unit.lower() in ["sg", "specific_gravity"]:
+                if 1.020 <= numeric_value <= 1.025:
+                    return "Good"
+                elif 1.018 <= numeric_value <= 1.027:
+                    return "OK"
+                else:
+                    return "Check"
+            if unit.lower() in ["mS/cm", "ms/cm"]:
+                if 46.25 <= numeric_value <= 53.06:
+                    return "Good"
+                elif 43.48 <= numeric_value <= 55.75:
+                    return "OK"
+                else:
+                    return "Check"
+            else:
+                if 30 <= numeric_value <= 35:
+                    return "Good"
+                elif 28 <= numeric_value <= 37:
+                    return "OK"
+                else:
+                    return "Check"
+        
+        elif sensor_name == "Dissolved Oxygen":
+            if unit.lower() in ["ppm", "parts_per_million"]:
+                if numeric_value >= 12:
+                    return "High"
+                elif numeric_value >= 7:
+                    return "Good"
+                elif numeric_value >= 4:
+                    return "OK"
+                else:
+                    return "Low"
+            elif unit.lower() in ["%", "percent", "saturation"]:
+                if numeric_value >= 120:
+                    return "High"
+                elif numeric_value >= 85:
+                    return "Good"
+                elif numeric_value >= 60:
+                    return "OK"
+                else:
+                    return "Low"
+            else:
+                if numeric_value >= 6:
+                    return "Good"
+                elif numeric_value >= 4:
+                    return "OK"
+                else:
+                    return "Low"
+        
+        elif sensor_name == "Water Level":
+            if unit.lower() in ["%", "percent"] or "%" in str(value):
+                if numeric_value >= 80:
+                    return "Good"
+                elif numeric_value >= 60:
+                    return "OK"
+                else:
+                    return "Low"
+            else:
+                return "OK"
+        
+        elif sensor_name == "ORP":
+            aquarium_type_lower = aquarium_type.lower()
+            if "saltwater" in aquarium_type_lower or "marine" in aquarium_type_lower or "reef" in aquarium_type_lower:
+                if 300 <= numeric_value <= 400:
+                    return "Good"
+                elif 275 <= numeric_value <= 425:
+                    return "OK"
+                else:
+                    return "Check"
+            else:
+                if 250 <= numeric_value <= 400:
+                    return "Good"
+                elif 150 <= numeric_value <= 500:
+                    return "OK"
+                else:
+                    return "Check"
+        
+        return "OK"
+    except (ValueError, TypeError):
+        value_str = str(value).lower()
+        if value_str in ["normal", "good", "excellent", "ok"]:
+            return "Good"
+        elif value_str in ["high", "low", "warning"]:
+            return "Check"
+        else:
+            return "OK"
+
+
+def _numeric_values():
+    """Return every band edge with its neighbouring floats, plus values far outside all ranges."""
+    values = {0.0, -0.0, -1.0, 1e9, -1e9, math.inf, -math.inf, math.nan}
+    for bands, _ in PARAMETER_RANGES.values():
+        for _, low, high in bands:
+            for bound in (low, high):
+                if bound is None:
+                    continue
+                bound = float(bound)
+                values.update({bound, math.nextafter(bound, -math.inf), math.nextafter(bound, math.inf)})
+                values.update({bound - 0.05, bound + 0.05, round(bound, 1)})
+    return sorted(values, key=lambda value: (math.isnan(value), value))
+
+
+NUMERIC_VALUES = _numeric_values()
+
+
+@pytest.mark.parametrize("aquarium_type", AQUARIUM_TYPES)
+@pytest.mark.parametrize("sensor_name", PARAMETERS)
+def test_numeric_values_match_baseline(sensor_name, aquarium_type):
+    """Every band edge, its neighbours and out of range values classify as before."""
+    classifier = ParameterClassifier(aquarium_type)
+    for unit in UNITS:
+        for value in NUMERIC_VALUES:
+            # Sensor states are strings, the classifier also accepts numbers
+            for state in (value, repr(value), str(value)):
+                expected = _baseline_get_simple_status(sensor_name, state, unit, aquarium_type)
+                assert classifier.classify(sensor_name, state, unit) == expected, (state, unit)
+                assert get_simple_status(sensor_name, state, unit, aquarium_type) == expected, (state, unit)
+
+
+@pytest.mark.parametrize("aquarium_type", AQUARIUM_TYPES)
+@pytest.mark.parametrize("sensor_name", PARAMETERS)
+def test_non_numeric_values_match_baseline(sensor_name, aquarium_type):
+    """None and non-numeric states classify as before."""
+    classifier = ParameterClassifier(aquarium_type)
+    for unit in UNITS:
+        for value in NON_NUMERIC_VALUES:
+            expected = _baseline_get_simple_status(sensor_name, value, unit, aquarium_type)
+            assert classifier.classify(sensor_name, value, unit) == expected, (value, unit)
+
+
+@pytest.mark.parametrize(
+    ("sensor_name", "value", "unit", "aquarium_type", "expected"),
+    [
+        ("Temperature", "24", "°C", "Freshwater", "Good"),
+        ("Temperature", "26", "°C", "Freshwater", "Good"),
+        ("Temperature", "26.01", "°C", "Freshwater", "OK"),
+        ("Temperature", "28.01", "°C", "Freshwater", "Check"),
+        ("Temperature", "79", "°F", "Reef", "Good"),
+        ("pH", "8.0", "", "Freshwater", "Good"),
+        ("pH", "8.0", "", "Marine", "OK"),
+        ("pH", "8.61", "", "Reef", "Adjust"),
+        ("Salinity", "1.025", "SG", "Reef", "Good"),
+        ("Salinity", "55.75", "mS/cm", "Reef", "OK"),
+        ("Dissolved Oxygen", "12", "ppm", "Freshwater", "High"),
+        ("Dissolved Oxygen", "11.99", "ppm", "Freshwater", "Good"),
+        ("Dissolved Oxygen", "3.99", "mg/L", "Freshwater", "Low"),
+        ("Water Level", "59.9", "%", "Freshwater", "Low"),
+        ("Water Level", "10", "cm", "Freshwater", "OK"),
+        ("ORP", "275", "mV", "Marine", "OK"),
+        ("ORP", "275", "mV", "Freshwater", "Good"),
+        ("Nitrate", "500", "ppm", "Freshwater", "OK"),
+        ("pH", "nan", "", "Freshwater", "Adjust"),
+        ("pH", None, "", "Freshwater", "OK"),
+        ("pH", "Normal", "", "Freshwater", "Good"),
+        ("pH", "warning", "", "Freshwater", "Check"),
+    ],
+)
+def test_known_statuses(sensor_name, value, unit, aquarium_type, expected):
+    """Spot check band edges, units, tank classes and special values."""
+    assert get_classifier(aquarium_type).classify(sensor_name, value, unit) == expected
+
+
+def test_aquarium_type_none_is_freshwater():
+    """A missing aquarium type uses the freshwater ranges instead of raising."""
+    assert get_tank_class(None) == "freshwater"
+    assert ParameterClassifier(None).classify("pH", "7.0") == "Good"
+
+
+def test_classify_all():
+    """classify_all returns the status of every reading, keyed by parameter name."""
+    sensor_data = [
+        {"name": "Temperature", "raw_value": "25.0", "unit": "°C"},
+        {"name": "pH", "raw_value": "7.0", "unit": ""},
+        {"name": "Water Level", "raw_value": "unknown", "unit": "%"},
+    ]
+    assert ParameterClassifier("Reef").classify_all(sensor_data) == {
+        "Temperature": "Good",
+        "pH": "Adjust",
+        "Water Level": "OK",
+    }
+
+
+def test_classify_tanks_matches_baseline():
+    """The batch API classifies every reading of many aquariums as before."""
+    tanks = {}
+    for aquarium_type in AQUARIUM_TYPES:
+        for unit in UNITS:
+            for index, value in enumerate(NUMERIC_VALUES + NON_NUMERIC_VALUES):
+                sensor_data = [
+                    {"name": sensor_name, "raw_value": value, "unit": unit}
+                    for sensor_name in PARAMETERS
+                ]
+                tanks[(aquarium_type, unit, index)] = (aquarium_type, sensor_data)
+    
+    results = classify_tanks(tanks)
+    
+    assert results.keys() == tanks.keys()
+    for key, (aquarium_type, sensor_data) in tanks.items():
+        assert results[key] == {
+            info["name"]: _baseline_get_simple_status(info["name"], info["raw_value"], info["unit"], aquarium_type)
+            for info in sensor_data
+        }, key
+
+
+def test_classify_tanks_mixed_types():
+    """Each aquarium is classified with the ranges of its own type."""
+    sensor_data = [{"name": "pH", "raw_value": "7.0", "unit": ""}]
+    assert classify_tanks({
+        "freshwater": ("Freshwater", sensor_data),
+        "reef": ("Reef", sensor_data),
+        "empty": ("Marine", []),
+    }) == {
+        "freshwater": {"pH": "Good"},
+        "reef": {"pH": "Adjust"},
+        "empty": {},
+    }
@@ -0,0 +1,146 @@
+"""Tests for running analyses through the Aquarium AI coordinator."""
+import asyncio
+
+from homeassistant.core import HomeAssistant
+import homeassistant.util.dt as dt_util
+
+from custom_components.aquarium_ai.const import DOMAIN
+
+from . import async_setup_aquarium
+
+
+async def test_concurrent_callers_share_one_run(hass: HomeAssistant, ai_task) -> None:
+    """The button, the services and direct callers join the analysis in flight."""
+    coordinator = await async_setup_aquarium(hass)
+    entry_id = coordinator.entry.entry_id
+    ai_task.delay = 0.1
+    
+    first = hass.async_create_task(coordinator.async_run_analysis(None))
+    await asyncio.sleep(0)
+    second = hass.async_create_task(coordinator.async_run_analysis(None))
+    button = hass.async_create_task(
+        hass.services.async_call("button", "press", {"entity_id": "button.reef_run_analysis"}, blocking=True)
+    )
+    service = hass.async_create_task(
+        hass.services.async_call(
+            DOMAIN, "run_analysis_for_aquarium", {"config_entry": entry_id}, blocking=True, return_response=True
+        )
+    )
+    results = await asyncio.gather(first, second, button, service)
+    
+    assert len(ai_task.calls) == 1
+    assert results[0] is not None
+    assert results[1] is results[0]
+    assert results[3]["status"] == "success"
+    assert results[3]["analysis"] == results[0]
+    
+    # A caller arriving after the run finished starts a new one
+    assert await coordinator.async_run_analysis(None)
+    assert len(ai_task.calls) == 2
+
+
+async def test_cancelled_caller_does_not_cancel_run(hass: HomeAssistant, ai_task) -> None:
+    """A caller giving up leaves the shared run to the other callers."""
+    coordinator = await async_setup_aquarium(hass)
+    ai_task.delay = 0.1
+    
+    first = hass.async_create_task(coordinator.async_run_analysis(None))
+    await asyncio.sleep(0)
+    impatient = hass.async_create_task(coordinator.async_run_analysis(None))
+    await asyncio.sleep(0.01)
+    impatient.cancel()
+    await asyncio.wait([impatient])
+    
+    assert impatient.cancelled()
+    assert await first
+    assert len(ai_task.calls) == 1
+    assert coordinator.data.ai_data["temperature_analysis"] == "AI text for temperature_analysis"
+
+
+async def test_unload_cancels_run_in_flight(hass: HomeAssistant, ai_task) -> None:
+    """Unloading the entry cancels its analysis, the callers get no result."""
+    coordinator = await async_setup_aquarium(hass)
+    ai_task.delay = 5
+    
+    waiter = hass.async_create_task(coordinator.async_run_analysis(None))
+    await asyncio.sleep(0.05)
+    assert await hass.config_entries.async_unload(coordinator.entry.entry_id)
+    
+    assert await waiter is None
+    assert len(ai_task.calls) == 1
+
+
+async def _async_overlapping_ticks(hass: HomeAssistant, coordinator, ai_task):
+    """Fire three scheduled ticks while the first analysis is still running."""
+    ai_task.delay = 0.3
+    first = hass.async_create_task(coordinator.async_run_analysis(dt_util.utcnow()))
+    await asyncio.sleep(0.05)
+    second = hass.async_create_task(coordinator.async_run_analysis(dt_util.utcnow()))
+    await asyncio.sleep(0.01)
+    third = hass.async_create_task(coordinator.async_run_analysis(dt_util.utcnow()))
+    return [await first, await second, await third]
+
+
+async def test_overlap_skip(hass: HomeAssistant, ai_task) -> None:
+    """skip drops the ticks that find an analysis running."""
+    coordinator = await async_setup_aquarium(hass, overlap_policy="skip")
+    
+    results = await _async_overlapping_ticks(hass, coordinator, ai_task)
+    
+    assert results[0] is not None
+    assert results[1:] == [None, None]
+    assert len(ai_task.calls) == 1
+    assert (coordinator.overrun_ticks, coordinator.skipped_ticks, coordinator.cancelled_runs) == (2, 2, 0)
+
+
+async def test_overlap_queue_one(hass: HomeAssistant, ai_task) -> None:
+    """queue_one runs one analysis after the current one and drops later ticks."""
+    coordinator = await async_setup_aquarium(hass, overlap_policy="queue_one")
+    
+    results = await _async_overlapping_ticks(hass, coordinator, ai_task)
+    
+    assert results[0] is not None
+    assert results[1] is not None
+    assert results[1] is not results[0]
+    assert results[2] is None
+    assert len(ai_task.calls) == 2
+    assert (coordinator.overrun_ticks, coordinator.skipped_ticks, coordinator.cancelled_runs) == (2, 1, 0)
+
+
+async def test_overlap_cancel_previous(hass: HomeAssistant, ai_task) -> None:
+    """cancel_previous replaces a running scheduled analysis with a new one."""
+    coordinator = await async_setup_aquarium(hass, overlap_policy="cancel_previous")
+    
+    results = await _async_overlapping_ticks(hass, coordinator, ai_task)
+    
+    assert results[:2] == [None, None]
+    assert results[2] is not None
+    assert len(ai_task.calls) == 3
+    assert (coordinator.overrun_ticks, coordinator.skipped_ticks, coordinator.cancelled_runs) == (2, 0, 2)
+    # The cancelled AI calls gave back their breaker and scheduler slots
+    assert coordinator.circuit_breaker.total_failures == 0
+    assert coordinator.scheduler.active_ai_calls == 0
+
+
+async def test_cancel_previous_spares_manual_runs(hass: HomeAssistant, ai_task) -> None:
+    """Manual analyses, and scheduled analyses a manual caller joined, are never cancelled."""
+    coordinator = await async_setup_aquarium(hass, overlap_policy="cancel_previous")
+    ai_task.delay = 0.3
+    
+    manual = hass.async_create_task(coordinator.async_run_analysis(None))
+    await asyncio.sleep(0.05)
+    tick = hass.async_create_task(coordinator.async_run_analysis(dt_util.utcnow()))
+    assert await manual is not None
+    assert await tick is None
+    
+    scheduled = hass.async_create_task(coordinator.async_run_analysis(dt_util.utcnow()))
+    await asyncio.sleep(0.05)
+    joined = hass.async_create_task(coordinator.async_run_analysis(None))
+    await asyncio.sleep(0.01)
+    tick = hass.async_create_task(coordinator.async_run_analysis(dt_util.utcnow()))
+    assert await scheduled is not None
+    assert await joined is not None
+    assert await tick is None
+    
+    assert len(ai_task.calls) == 2
+    assert (coordinator.cancelled_runs, coordinator.skipped_ticks) == (0, 2)
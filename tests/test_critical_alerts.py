@@ -0,0 +1,38 @@
+"""Tests for the immediate critical alerts."""
+from homeassistant.components import persistent_notification
+from homeassistant.core import HomeAssistant
+
+from . import async_setup_aquarium
+
+
+def _notifications(hass: HomeAssistant) -> dict:
+    """Return the persistent notifications by notification ID."""
+    return persistent_notification._async_get_or_create_notifications(hass)
+
+
+async def test_critical_alerts_disabled_by_default(hass: HomeAssistant, ai_task) -> None:
+    """Existing installations only get critical alerts after opting in."""
+    coordinator = await async_setup_aquarium(hass, auto_notifications=True)
+    
+    hass.states.async_set("sensor.ph", "7.0", {})
+    await hass.async_block_till_done()
+    
+    assert coordinator.sent_critical_alerts == 0
+    assert not _notifications(hass)
+
+
+async def test_critical_alert_keeps_analysis_notification(hass: HomeAssistant, ai_task) -> None:
+    """The alert is a separate notification next to the last analysis notification."""
+    coordinator = await async_setup_aquarium(hass, auto_notifications=True, critical_alerts=True)
+    entry_id = coordinator.entry.entry_id
+    await coordinator.async_run_analysis(None)
+    analysis = _notifications(hass)[f"aquarium_ai_{entry_id}"]
+    
+    hass.states.async_set("sensor.ph", "7.0", {})
+    await hass.async_block_till_done()
+    
+    notifications = _notifications(hass)
+    assert coordinator.sent_critical_alerts == 1
+    assert "pH is Adjust" in notifications[f"aquarium_ai_{entry_id}_alert"]["message"]
+    assert notifications[f"aquarium_ai_{entry_id}"] == analysis
+    assert len(ai_task.calls) == 1
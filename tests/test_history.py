@@ -0,0 +1,157 @@
+"""Tests for the analysis history."""
+from datetime import timedelta
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+import homeassistant.util.dt as dt_util
+
+from custom_components.aquarium_ai.const import DOMAIN
+from custom_components.aquarium_ai.history import AnalysisHistory
+
+from . import async_setup_aquarium
+
+DAY = 86400
+
+
+def _append(history, timestamp, ph, ph_status, analysis=None):
+    """Add a record with a temperature and a pH reading."""
+    history.append(
+        timestamp,
+        [
+            {"name": "Temperature", "raw_value": "25.0", "unit": "°C"},
+            {"name": "pH", "raw_value": ph, "unit": ""},
+        ],
+        {"Temperature": "Good", "pH": ph_status},
+        analysis or {},
+    )
+
+
+def test_ring_buffer_evicts_oldest() -> None:
+    """A full history drops its oldest record for every new one."""
+    history = AnalysisHistory(3, DAY)
+    start = dt_util.utcnow() - timedelta(hours=5)
+    for index, ph in enumerate(("8.0", "8.1", "8.2", "8.3", "8.4")):
+        _append(history, start + timedelta(hours=index), ph, "Good")
+    
+    records = history.query()
+    
+    assert len(history) == 3
+    assert [record["readings"]["pH"]["value"] for record in records] == [8.2, 8.3, 8.4]
+    assert records[0]["timestamp"] == (start + timedelta(hours=2)).isoformat()
+    assert records[0]["readings"]["Temperature"] == {"value": 25.0, "unit": "°C", "status": "Good"}
+
+
+def test_records_expire(freezer) -> None:
+    """Records older than the maximum age are dropped."""
+    history = AnalysisHistory(10, DAY)
+    start = dt_util.utcnow()
+    _append(history, start, "8.0", "OK")
+    _append(history, start + timedelta(hours=12), "8.3", "Good")
+    
+    freezer.move_to(start + timedelta(hours=30))
+    records = history.query()
+    
+    assert len(records) == 1
+    assert len(history) == 1
+    assert records[0]["readings"]["pH"]["status"] == "Good"
+
+
+def test_query_window_and_limit() -> None:
+    """Queries return the records in the window, the most recent ones with a limit."""
+    history = AnalysisHistory(10, DAY)
+    start = dt_util.utcnow() - timedelta(hours=6)
+    for index in range(6):
+        _append(history, start + timedelta(hours=index), f"8.{index}", "Good")
+    
+    def values(records):
+        return [record["readings"]["pH"]["value"] for record in records]
+    
+    assert values(history.query(start + timedelta(hours=1), start + timedelta(hours=3))) == [8.1, 8.2, 8.3]
+    assert values(history.query(start=start + timedelta(hours=4))) == [8.4, 8.5]
+    assert values(history.query(end=start + timedelta(minutes=90))) == [8.0, 8.1]
+    assert values(history.query(limit=2)) == [8.4, 8.5]
+    assert values(history.query(end=start + timedelta(hours=3), limit=1)) == [8.3]
+    assert history.query(start + timedelta(minutes=10), start + timedelta(minutes=20)) == []
+
+
+def test_out_of_order_timestamps_are_kept_ordered() -> None:
+    """A record older than the latest one is stored at the latest time."""
+    history = AnalysisHistory(10, DAY)
+    now = dt_util.utcnow()
+    _append(history, now, "8.0", "Good")
+    _append(history, now - timedelta(hours=1), "8.1", "Good")
+    
+    records = history.query()
+    
+    assert [record["timestamp"] for record in records] == [now.isoformat(), now.isoformat()]
+
+
+def test_missing_and_non_numeric_readings() -> None:
+    """Non-numeric readings have no value and missing parameters are left out."""
+    history = AnalysisHistory(10, DAY)
+    now = dt_util.utcnow()
+    _append(history, now, "unavailable", None)
+    history.append(now, [{"name": "Temperature", "raw_value": "24.0", "unit": "°C"}], {"Temperature": "Good"}, {})
+    
+    first, second = history.query()
+    
+    assert "pH" not in first["readings"]
+    assert "pH" not in second["readings"]
+    assert second["readings"]["Temperature"]["value"] == 24.0
+    
+    _append(history, now, "unavailable", "Check")
+    assert history.query()[-1]["readings"]["pH"] == {"value": None, "unit": "", "status": "Check"}
+
+
+def test_analysis_texts_are_interned() -> None:
+    """Repeated texts are stored once and freed with the last record using them."""
+    history = AnalysisHistory(2, DAY)
+    now = dt_util.utcnow()
+    _append(history, now, "8.0", "Good", {"ph_analysis": "Stable", "overall_analysis": "All good"})
+    _append(history, now, "8.1", "Good", {"ph_analysis": "Stable", "overall_analysis": "Still good"})
+    
+    assert sorted(text for text in history._text_table if text) == ["All good", "Stable", "Still good"]
+    assert [record["analysis"]["ph_analysis"] for record in history.query()] == ["Stable", "Stable"]
+    
+    # Evicting the first record frees "All good" and reuses its slot
+    _append(history, now, "8.2", "Good", {"ph_analysis": "Rising"})
+    
+    assert sorted(text for text in history._text_table if text) == ["Rising", "Stable", "Still good"]
+    assert len(history._text_table) == 3
+    assert [record["analysis"] for record in history.query()] == [
+        {"ph_analysis": "Stable", "overall_analysis": "Still good"},
+        {"ph_analysis": "Rising"},
+    ]
+    assert history.memory_usage() > 0
+
+
+async def test_get_history_service(hass: HomeAssistant, ai_task) -> None:
+    """Every published result is recorded and returned by the get_history service."""
+    coordinator = await async_setup_aquarium(hass, history_size=3)
+    entry_id = coordinator.entry.entry_id
+    for ph in ("8.3", "8.1", "7.0", "8.3"):
+        hass.states.async_set("sensor.ph", ph, {})
+        await hass.async_block_till_done()
+        await coordinator.async_run_analysis(None)
+    
+    response = await hass.services.async_call(
+        DOMAIN, "get_history", {"config_entry": entry_id}, blocking=True, return_response=True
+    )
+    
+    assert response["tank_name"] == "Reef"
+    assert response["total_records"] == 3
+    assert response["memory_bytes"] > 0
+    assert [record["readings"]["pH"]["status"] for record in response["records"]] == ["OK", "Adjust", "Good"]
+    assert response["records"][0]["analysis"]["temperature_analysis"] == "AI text for temperature_analysis"
+    
+    response = await hass.services.async_call(
+        DOMAIN, "get_history", {"config_entry": entry_id, "limit": 1}, blocking=True, return_response=True
+    )
+    assert [record["readings"]["pH"]["value"] for record in response["records"]] == [8.3]
+    
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN, "get_history", {"config_entry": "unknown"}, blocking=True, return_response=True
+        )
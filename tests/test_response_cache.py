@@ -0,0 +1,158 @@
+"""Tests for the AI response cache."""
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+import homeassistant.util.dt as dt_util
+
+from custom_components.aquarium_ai.const import DATA_SHARED_RESPONSE_CACHE
+from custom_components.aquarium_ai.response_cache import ResponseCache, build_cache_key, quantize_reading
+
+from . import async_setup_aquarium
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    """A full cache drops the entry that was used least recently."""
+    cache = ResponseCache(2)
+    cache.put("a", {"text": "A"}, 60)
+    cache.put("b", {"text": "B"}, 60)
+    assert cache.get("a") == {"text": "A"}
+    cache.put("c", {"text": "C"}, 60)
+    
+    assert cache.get("b") is None
+    assert cache.get("a") == {"text": "A"}
+    assert cache.get("c") == {"text": "C"}
+    assert len(cache) == 2
+    assert cache.stats() == {
+        "entries": 2,
+        "max_entries": 2,
+        "hits": 3,
+        "misses": 1,
+        "evictions": 1,
+        "hit_rate": 75.0,
+    }
+
+
+def test_cache_entries_expire() -> None:
+    """An entry is dropped once its time to live has passed."""
+    cache = ResponseCache(4)
+    with patch("custom_components.aquarium_ai.response_cache.time") as mock_time:
+        mock_time.monotonic.return_value = 1000
+        cache.put("a", {"text": "A"}, 60)
+        mock_time.monotonic.return_value = 1059
+        assert cache.get("a") == {"text": "A"}
+        mock_time.monotonic.return_value = 1060
+        assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_cache_returns_copies() -> None:
+    """Changing stored or returned data does not change the cached entry."""
+    cache = ResponseCache(4)
+    data = {"text": "A"}
+    cache.put("a", data, 60)
+    data["text"] = "changed"
+    cache.get("a")["text"] = "changed"
+    
+    assert cache.get("a") == {"text": "A"}
+
+
+def test_quantize_reading() -> None:
+    """Readings within the tolerance mostly share a bucket, others don't."""
+    assert quantize_reading("25.1", 2.0) == quantize_reading("25.2", 2.0)
+    assert quantize_reading("25.1", 2.0) != quantize_reading("27.0", 2.0)
+    assert quantize_reading("-5", 2.0) != quantize_reading("5", 2.0)
+    # Without a tolerance every value is its own bucket
+    assert quantize_reading("25.1", 0) == 25.1
+    assert quantize_reading("0", 2.0) == 0
+    assert quantize_reading("unavailable", 2.0) == "unavailable"
+
+
+def test_cache_key_is_stable() -> None:
+    """Equal key parts give the same key, whatever the order of their dict keys."""
+    assert build_cache_key("ai_task.a", {"x": 1, "y": 2}) == build_cache_key("ai_task.a", {"y": 2, "x": 1})
+    assert build_cache_key("ai_task.a", ["pH"]) != build_cache_key("ai_task.b", ["pH"])
+
+
+async def test_scheduled_runs_use_cache(hass: HomeAssistant, ai_task) -> None:
+    """Scheduled runs reuse a cached response until the conditions change."""
+    coordinator = await async_setup_aquarium(hass, response_cache_ttl=30)
+    
+    await coordinator.async_run_analysis(dt_util.utcnow())
+    await coordinator.async_run_analysis(dt_util.utcnow())
+    
+    assert len(ai_task.calls) == 1
+    assert coordinator.response_cache.hits == 1
+    assert coordinator.data.ai_data["temperature_analysis"] == "AI text for temperature_analysis"
+    
+    # Manual runs always ask the AI, and refresh the cached response
+    await coordinator.async_run_analysis(None)
+    assert len(ai_task.calls) == 2
+    await coordinator.async_run_analysis(dt_util.utcnow())
+    assert len(ai_task.calls) == 2
+    
+    # A reading in another status band is a cache miss
+    hass.states.async_set("sensor.ph", "7.0", {})
+    await hass.async_block_till_done()
+    await coordinator.async_run_analysis(dt_util.utcnow())
+    assert len(ai_task.calls) == 3
+    
+    # Failed calls are not cached
+    hass.states.async_set("sensor.ph", "8.9", {})
+    await hass.async_block_till_done()
+    ai_task.error = ConnectionError("provider down")
+    await coordinator.async_run_analysis(dt_util.utcnow())
+    ai_task.error = None
+    await coordinator.async_run_analysis(dt_util.utcnow())
+    assert coordinator.data.ai_data["ph_analysis"] == "AI text for ph_analysis"
+    assert coordinator.response_cache.hits == 2
+
+
+async def test_cache_expires(hass: HomeAssistant, ai_task) -> None:
+    """A cached response is not used after its time to live."""
+    coordinator = await async_setup_aquarium(hass, response_cache_ttl=30)
+    
+    with patch("custom_components.aquarium_ai.response_cache.time") as mock_time:
+        mock_time.monotonic.return_value = 1000
+        await coordinator.async_run_analysis(dt_util.utcnow())
+        mock_time.monotonic.return_value = 1000 + 30 * 60
+        await coordinator.async_run_analysis(dt_util.utcnow())
+    
+    assert len(ai_task.calls) == 2
+
+
+async def test_cache_disabled_by_default(hass: HomeAssistant, ai_task) -> None:
+    """Without a time to live every run asks the AI."""
+    coordinator = await async_setup_aquarium(hass)
+    
+    await coordinator.async_run_analysis(dt_util.utcnow())
+    await coordinator.async_run_analysis(dt_util.utcnow())
+    
+    assert coordinator.response_cache is None
+    assert len(ai_task.calls) == 2
+
+
+async def test_shared_cache(hass: HomeAssistant, ai_task) -> None:
+    """Aquariums sharing the cache reuse responses for the same prompt and conditions only."""
+    first = await async_setup_aquarium(hass, response_cache_ttl=30, share_response_cache=True)
+    same = await async_setup_aquarium(hass, response_cache_ttl=30, share_response_cache=True)
+    other = await async_setup_aquarium(
+        hass, response_cache_ttl=30, share_response_cache=True, inhabitants="Clownfish"
+    )
+    private = await async_setup_aquarium(hass, response_cache_ttl=30)
+    assert same.response_cache is first.response_cache
+    assert other.response_cache is first.response_cache
+    assert private.response_cache is not first.response_cache
+    
+    await first.async_run_analysis(dt_util.utcnow())
+    await same.async_run_analysis(dt_util.utcnow())
+    assert len(ai_task.calls) == 1
+    
+    # Another prompt prefix is another key
+    await other.async_run_analysis(dt_util.utcnow())
+    assert len(ai_task.calls) == 2
+    await private.async_run_analysis(dt_util.utcnow())
+    assert len(ai_task.calls) == 3
+    
+    for coordinator in (first, same, other, private):
+        assert await hass.config_entries.async_unload(coordinator.entry.entry_id)
+    assert DATA_SHARED_RESPONSE_CACHE not in hass.data
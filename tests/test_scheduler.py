@@ -0,0 +1,38 @@
+"""Tests for the shared analysis scheduler."""
+from homeassistant.core import HomeAssistant
+
+from custom_components.aquarium_ai import _async_run_analysis_for_entries
+from custom_components.aquarium_ai.const import MAX_CONCURRENT_AI_CALLS
+
+from . import async_setup_aquarium
+
+
+async def test_queued_ai_calls_do_not_time_out(hass: HomeAssistant, ai_task) -> None:
+    """Aquariums waiting for a shared AI call slot are not charged for the wait."""
+    coordinators = {}
+    for index in range(10):
+        coordinator = await async_setup_aquarium(hass, tank_name=f"Tank {index}", analysis_deadline=1)
+        coordinators[coordinator.entry.entry_id] = coordinator
+    # Four rounds of AI calls take longer than both the deadline and the service timeout
+    ai_task.delay = 0.4
+    
+    results = await _async_run_analysis_for_entries(coordinators, False, len(coordinators), 1)
+    
+    assert [result["status"] for result in results.values()] == ["success"] * len(coordinators)
+    assert len(ai_task.calls) == len(coordinators)
+    assert ai_task.peak == MAX_CONCURRENT_AI_CALLS
+    assert all(coordinator.timed_out_runs == 0 for coordinator in coordinators.values())
+    scheduler = next(iter(coordinators.values())).scheduler
+    assert scheduler.active_ai_calls == 0
+    assert scheduler.waiting_ai_calls == 0
+
+
+async def test_slow_ai_call_still_times_out(hass: HomeAssistant, ai_task) -> None:
+    """The deadline keeps running while the AI call itself is in progress."""
+    coordinator = await async_setup_aquarium(hass, analysis_deadline=1)
+    ai_task.delay = 1.5
+    
+    assert await coordinator.async_run_analysis(None) is None
+    
+    assert coordinator.timed_out_runs == 1
+    assert "timeout" in coordinator.data.timings